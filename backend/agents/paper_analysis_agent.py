@@ -7,6 +7,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 import time
 from .lm_studio_client import LMStudioClient
+from ..core.config import Config
+from ..core.passage_store import attach_section_passages
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,7 @@ Always respond in Korean and provide detailed, accurate analysis."""
             
             # 섹션별 분석
             sections = self._extract_sections(paper_content)
+            await attach_section_passages(sections, paper_content, paper_metadata.get('id'))
             
             # 구조화된 분석 수행
             analysis_tasks = [
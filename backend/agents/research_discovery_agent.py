@@ -2,12 +2,11 @@
 
 import logging
 import json
+import faiss
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import time
-from sentence_transformers import SentenceTransformer
-import faiss
 from .lm_studio_client import LMStudioClient
 from backend.core.database import Paper  # Paper 모델 임포트
 from backend.core.config import Config
@@ -15,6 +14,7 @@ from backend.core.llm_summarizer import LLMSummarizer as TextSummarizer # LLMSum
 from backend.core.recommendation_engine import ModernRecommendationEngine
 from backend.core.arxiv_client import ArxivClient # Modified import path
 from backend.core.paper_database import PaperDatabase
+from backend.core.vector_store import document_text, get_vector_store
 import asyncio
 
 logger = logging.getLogger(__name__)
@@ -41,52 +41,58 @@ class ResearchDiscoveryAgent:
     
     def __init__(self, llm_client: LMStudioClient):
         self.llm_client = llm_client
-        self.embedding_model = None
-        self.paper_index = None
+        self.collection = None  # 공유 벡터 스토어 컬렉션 (모델/인덱스를 다른 서비스와 공유)
+        self.paper_index = None  # 이 에이전트 논문만 담은 임시 인덱스 (공유 컬렉션에는 쓰지 않음)
         self.paper_metadata = {}
         self.system_prompt = """You are an expert research discovery assistant.
 Your task is to analyze research queries and recommend relevant papers.
 Always respond in Korean with detailed explanations."""
 
     async def initialize_embeddings(self):
-        """임베딩 모델 초기화"""
+        """임베딩 모델 초기화 (공유 벡터 스토어 컬렉션 연결)"""
         try:
-            logger.info("임베딩 모델 로딩 중...")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            logger.info("벡터 스토어 컬렉션 연결 중...")
+            self.collection = await asyncio.to_thread(get_vector_store().collection)
             logger.info("임베딩 모델 초기화 완료")
         except Exception as e:
             logger.error(f"임베딩 모델 초기화 실패: {e}", exc_info=True)
             raise
 
     async def build_paper_index(self, papers: List[Dict[str, Any]]):
-        """논문 인덱스 구축"""
+        """논문 인덱스 구축
+
+        호출자가 넘긴 논문(DB에 없을 수도 있음)은 공유 컬렉션에 넣지 않고 메모리 내 임시 인덱스로만 검색한다.
+        공유 컬렉션/DB에 이미 있는 논문은 저장된 벡터를 쓰고, 나머지만 공유 모델로 임베딩한다.
+        """
         try:
             logger.info(f"논문 인덱스 구축 시작: {len(papers)}개 논문")
             start_time = time.time()
             
-            if not self.embedding_model:
+            if not self.collection:
                 await self.initialize_embeddings()
             
-            # 텍스트 준비
-            texts = []
-            for paper in papers:
-                text = f"{paper.get('title', '')} {paper.get('abstract', '')} {' '.join(paper.get('keywords', []))}"
-                texts.append(text)
-                self.paper_metadata[paper['id']] = paper
-            
-            # 임베딩 생성
-            embeddings = self.embedding_model.encode(texts)
-            
-            # FAISS 인덱스 구축
-            dimension = embeddings.shape[1]
-            self.paper_index = faiss.IndexFlatIP(dimension)  # Inner Product for cosine similarity
-            
-            # 정규화 후 추가
-            faiss.normalize_L2(embeddings)
-            self.paper_index.add(embeddings.astype('float32'))
+            self.paper_metadata = {str(paper['id']): paper for paper in papers}
+            paper_ids = list(self.paper_metadata)
+            vectors = await asyncio.to_thread(self.collection.get_vectors, paper_ids)
+            
+            # 저장된 벡터가 없는 논문만 한 번에 임베딩
+            missing = [paper_id for paper_id in paper_ids if paper_id not in vectors]
+            if missing:
+                texts = [document_text(self.paper_metadata[paper_id].get('title'), self.paper_metadata[paper_id].get('abstract'))
+                         for paper_id in missing]
+                embeddings = await asyncio.to_thread(self.collection.embed_texts, texts)
+                vectors.update(zip(missing, embeddings))
+            
+            # 코사인 유사도용 내적 인덱스 (정규화 후 추가), 행 순서 = paper_metadata 순서
+            embeddings = np.ascontiguousarray([vectors[paper_id] for paper_id in paper_ids], dtype='float32')
+            self.paper_index = faiss.IndexFlatIP(self.collection.dimension)
+            if len(embeddings):
+                faiss.normalize_L2(embeddings)
+                self.paper_index.add(embeddings)
             
             build_time = time.time() - start_time
-            logger.info(f"논문 인덱스 구축 완료 - 시간: {build_time:.2f}s, 차원: {dimension}")
+            logger.info(f"논문 인덱스 구축 완료 - 시간: {build_time:.2f}s, 신규 임베딩: {len(missing)}개")
+            logger.info(f"임베딩 캐시: {self.collection.embedding_manager.cache_stats()}")
             
         except Exception as e:
             logger.error(f"논문 인덱스 구축 실패: {e}", exc_info=True)
@@ -98,28 +104,37 @@ Always respond in Korean with detailed explanations."""
             logger.info(f"연구 발견 시작: {query.query_text[:100]}...")
             start_time = time.time()
             
-            if not self.paper_index:
+            if self.paper_index is None or not self.paper_metadata:
                 logger.warning("논문 인덱스가 없음. 빈 결과 반환")
                 return []
             
-            # 쿼리 임베딩 생성
+            # 쿼리 임베딩 생성 (향상된 쿼리 + 관심사별 쿼리를 한 번에 인코딩)
             enhanced_query = await self._enhance_query(query)
-            query_embedding = self.embedding_model.encode([enhanced_query])
-            faiss.normalize_L2(query_embedding)
+            query_texts = [enhanced_query] + [interest for interest in (query.research_interests or []) if interest]
+            query_embeddings = np.ascontiguousarray(
+                await asyncio.to_thread(self.collection.embed_texts, query_texts), dtype='float32')
+            faiss.normalize_L2(query_embeddings)
             
-            # 유사 논문 검색
+            # 유사 논문 검색: (쿼리 수, d) 행렬로 한 번만
             similarities, indices = self.paper_index.search(
-                query_embedding.astype('float32'), 
+                query_embeddings,
                 min(query.max_results * 2, 50)  # 필터링을 위해 더 많이 검색
             )
             
+            # 쿼리별 결과를 논문별 최대 코사인 유사도로 통합
+            paper_ids = list(self.paper_metadata)
+            best = {}
+            for row_similarities, row_indices in zip(similarities, indices):
+                for similarity, idx in zip(row_similarities, row_indices):
+                    if idx == -1:  # 유효하지 않은 인덱스
+                        continue
+                    paper_id = paper_ids[idx]
+                    if paper_id not in best or similarity > best[paper_id]:
+                        best[paper_id] = float(similarity)
+            
             # 결과 처리
             recommendations = []
-            for i, (similarity, idx) in enumerate(zip(similarities[0], indices[0])):
-                if idx == -1:  # 유효하지 않은 인덱스
-                    continue
-                    
-                paper_id = list(self.paper_metadata.keys())[idx]
+            for paper_id, similarity in sorted(best.items(), key=lambda x: x[1], reverse=True):
                 paper = self.paper_metadata[paper_id]
                 
                 # 제외 논문 필터링
@@ -306,14 +321,16 @@ Always respond in Korean with detailed explanations."""
     def get_embedding_stats(self) -> Dict[str, Any]:
         """임베딩 통계 정보"""
         try:
-            if not self.paper_index:
+            if not self.collection:
                 return {'status': 'not_initialized'}
             
             return {
                 'status': 'ready',
-                'total_papers': self.paper_index.ntotal,
-                'embedding_dimension': self.paper_index.d,
-                'model_name': 'all-MiniLM-L6-v2'
+                'total_papers': len(self.paper_metadata),
+                'collection_papers': self.collection.ntotal,
+                'embedding_dimension': self.collection.dimension,
+                'model_name': self.collection.embedding_manager.model_name,
+                'embedding_cache': self.collection.embedding_manager.cache_stats()
             }
             
         except Exception as e:
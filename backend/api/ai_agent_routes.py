@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
+import asyncio
 import os
 import logging
 import sys
@@ -128,12 +129,13 @@ async def chat_with_paper(request: dict):
     paper_id = request.get('paper_id')
     message = request.get('message')
     session_id = request.get('session_id', 'default')
+    full_text = request.get('full_text')  # 선택: 논문 전문, 패시지 인덱스에 저장되어 이후 대화에서도 사용
     
     if not paper_id or not message:
         raise HTTPException(status_code=400, detail="paper_id and message required")
     
     try:
-        result = await ai_agent.chat_with_paper(paper_id, message, session_id)
+        result = await ai_agent.chat_with_paper(paper_id, message, session_id, full_text=full_text)
         result['timestamp'] = datetime.now().isoformat()
         
         return result
@@ -142,6 +144,23 @@ async def chat_with_paper(request: dict):
         logging.error(f"ERROR: Chat interaction failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/passages/index")
+async def index_paper_passages(request: dict):
+    """논문 전문을 패시지로 나눠 임베딩 후 저장 (채팅/분석이 관련 패시지만 사용)"""
+    paper_id = request.get('paper_id')
+    full_text = request.get('full_text')
+    
+    if not paper_id or not full_text:
+        raise HTTPException(status_code=400, detail="paper_id and full_text required")
+    
+    try:
+        chunks = await asyncio.to_thread(ai_agent.passages.index_paper, paper_id, full_text)
+        return {"paper_id": paper_id, "passages": chunks, "timestamp": datetime.now().isoformat()}
+        
+    except Exception as e:
+        logging.error(f"ERROR: Passage indexing failed for {paper_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/suggest/related")
 async def suggest_related_papers(request: dict):
     """관련 논문 추천"""
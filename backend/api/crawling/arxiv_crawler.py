@@ -8,17 +8,25 @@ import os
 
 # Add path for models
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from core.config import Config
 from core.models import Paper
 from core.embedding_manager import EmbeddingManager
+from core.model_registry import get_embedding_manager
+from core.vector_store import document_text
 
 class ArxivCrawler:
-    def __init__(self, delay=3.0):
+    def __init__(self, delay=3.0, embed_batch_size: int = Config.CRAWLER_EMBED_BATCH_SIZE):
         self.base_url = "http://export.arxiv.org/api/query"
         self.delay = delay
+        self.embed_batch_size = embed_batch_size
         self.last_request_time = 0
-        self.embedding_manager = EmbeddingManager()
-        print(f"DEBUG: ArxivCrawler initialized with {delay}s delay")
+        print(f"DEBUG: ArxivCrawler initialized with {delay}s delay, embed batch {embed_batch_size}")
     
+    @property
+    def embedding_manager(self) -> EmbeddingManager:
+        # 레지스트리의 공유 SPECTER2 (크롤러 생성 시 모델을 다시 로드하지 않음, 첫 임베딩 때 로드)
+        return get_embedding_manager()
+
     def _wait_for_rate_limit(self):
         elapsed = time.time() - self.last_request_time
         if elapsed < self.delay:
@@ -49,6 +57,7 @@ class ArxivCrawler:
         return response.text
     
     def _parse_entry(self, entry) -> Paper:
+        """XML entry -> Paper (임베딩은 _embed_papers에서 페이지 단위로 채움)"""
         ns = {'atom': 'http://www.w3.org/2005/Atom'}
         
         arxiv_id = entry.find('atom:id', ns).text.split('/')[-1]
@@ -79,10 +88,6 @@ class ArxivCrawler:
         raw_updated = entry.find('atom:updated', ns).text
         print(f"DEBUG_XML: {arxiv_id} - 원본 published='{raw_published}', updated='{raw_updated}'")
         
-        # Generate embedding
-        text_to_embed = f"{title}. {abstract}"
-        embedding = self.embedding_manager.get_embedding(text_to_embed)
-
         return Paper(
             paper_id=arxiv_id,
             platform='arxiv',
@@ -92,9 +97,18 @@ class ArxivCrawler:
             categories=categories,
             pdf_url=pdf_link,
             published_date=published,
-            updated_date=updated,
-            embedding=embedding.tolist() if embedding is not None else None
+            updated_date=updated
         )
+
+    def _embed_papers(self, papers: List[Paper]) -> List[Paper]:
+        """파싱된 논문을 embed_batch_size 단위 마이크로 배치로 임베딩 (논문당 forward pass 1회 대신 배치당 1회)"""
+        for i in range(0, len(papers), self.embed_batch_size):
+            batch = papers[i:i + self.embed_batch_size]
+            embeddings = self.embedding_manager.get_embeddings([document_text(p.title, p.abstract) for p in batch])
+            for paper, embedding in zip(batch, embeddings):
+                paper.embedding = embedding # ndarray 그대로 BLOB 저장
+        print(f"DEBUG: Embedded {len(papers)} papers in batches of {self.embed_batch_size}")
+        return papers
     
     def crawl_papers(self, categories: List[str], start_date: datetime, end_date: datetime, batch_size: int = None, limit: int = 50) -> Generator[Paper, None, None]:
         if categories == ['all'] or len(categories) > 50:
@@ -149,12 +163,13 @@ class ArxivCrawler:
                 print("DEBUG: No more entries found")
                 break
             
-            for entry in entries:
-                if papers_yielded >= limit:
-                    print(f"DEBUG: Reached limit ({limit}) papers")
-                    break
-                    
-                paper = self._parse_entry(entry)
+            # 파이프라인: 페이지 전체 파싱 -> 마이크로 배치 임베딩 -> yield
+            remaining = limit - papers_yielded
+            if len(entries) > remaining:
+                print(f"DEBUG: Reached limit ({limit}) papers")
+            page_papers = self._embed_papers([self._parse_entry(entry) for entry in entries[:remaining]])
+
+            for paper in page_papers:
                 total_found += 1
                 papers_yielded += 1
                 
@@ -7,52 +7,21 @@ import json
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin # For DOAJ urljoin
 
-from core.models import Paper
-from db.connection import SessionLocal
+from core.paper_database import PaperDatabase
 
 logger = logging.getLogger(__name__)
 
 ARXIV_API_URL = "http://export.arxiv.org/api/query"
 
-def save_papers_to_db(papers_data: list):
-    """Save fetched papers to the database."""
-    session = SessionLocal()
+def save_papers_to_db(papers_data: list) -> dict:
+    """Save fetched papers to the database (bulk insert, existing paper_ids are skipped)."""
     try:
-        saved_count = 0
-        skipped_count = 0
-        for data in papers_data:
-            existing_paper = session.query(Paper).filter_by(paper_id=data['paper_id']).first()
-            if existing_paper:
-                logger.info(f"Paper with ID {data['paper_id']} already exists. Skipping.")
-                skipped_count += 1
-                continue
-
-            # Ensure the platform_metadata key exists in the data dictionary
-            if "platform_metadata" not in data:
-                data["platform_metadata"] = None # Or an empty dict {}
-
-            new_paper = Paper(
-                paper_id=data['paper_id'],
-                external_id=data['external_id'],
-                platform=data['platform'],
-                title=data['title'],
-                abstract=data['abstract'],
-                authors=data['authors'],
-                categories=data['categories'],
-                pdf_url=data['pdf_url'],
-                embedding=data['embedding'],
-                published_date=data['published_date'],
-                updated_date=data['updated_date'],
-            )
-            session.add(new_paper)
-            saved_count += 1
-        session.commit()
-        logger.info(f"Successfully processed {len(papers_data)} papers. Saved {saved_count} new papers, Skipped {skipped_count} existing papers to the database.")
+        counts = PaperDatabase().save_papers(papers_data)
+        logger.info(f"Successfully processed {len(papers_data)} papers. Saved {counts['inserted']} new papers, Skipped {counts['skipped']} existing papers to the database.")
+        return counts
     except Exception as e:
-        session.rollback()
         logger.error(f"Error saving papers to database: {e}", exc_info=True)
-    finally:
-        session.close()
+        return {"inserted": 0, "updated": 0, "skipped": 0}
 
 def fetch_arxiv_papers(query: str, max_results: int = 2) -> list:
     """Fetch papers from arXiv API based on a query."""
@@ -8,6 +8,8 @@ import os
 # Add core path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from core.config import Config
+
 logger = logging.getLogger(__name__)
 
 class WorkingMultiPlatformCrawlerAPI:
@@ -215,6 +217,7 @@ class WorkingMultiPlatformCrawlerAPI:
             
             saved_count = 0
             papers_list = []  # 메모리얩 논문 리스트
+            pending = []  # DB 대량 저장 대기 (INGEST_CHUNK_SIZE마다 한 트랜잭션)
             
             # ArXiv는 특별 처리 (기존 방식 유지)
             if platform == 'arxiv':
@@ -257,18 +260,16 @@ class WorkingMultiPlatformCrawlerAPI:
                     }
                     papers_list.append(paper_dict)
                     
-                    # DB 저장 (백그라운드)
+                    # DB 저장 (청크 단위 대량 저장)
                     if self.db:
-                        saved_obj = self.db.save_paper(paper_data)
-                        if saved_obj is None:
-                            logger.warning(f"Paper not saved (returned None): {paper_data['paper_id']}")
-                        else:
-                            saved_count += 1
-                            logger.info(f"✓ Saved {platform} paper #{saved_count}: {paper_data['paper_id']}")
+                        pending.append(paper_data)
+                        if len(pending) >= Config.INGEST_CHUNK_SIZE:
+                            saved_count += self._save_pending(platform, pending)
+                            pending = []
                     else:
                         logger.warning(f"DB not available for saving paper: {paper_data['paper_id']}")
                     
-                    if saved_count >= limit:
+                    if len(papers_list) >= limit:
                         break
                         
                 except Exception as e:
@@ -277,6 +278,7 @@ class WorkingMultiPlatformCrawlerAPI:
                     traceback.print_exc()
                     continue
             
+            saved_count += self._save_pending(platform, pending)
             return saved_count, papers_list
             
         except Exception as e:
@@ -300,6 +302,7 @@ class WorkingMultiPlatformCrawlerAPI:
             
             saved_count = 0
             papers_list = []  # 메모리용 리스트
+            pending = []  # DB 대량 저장 대기
             
             for paper in arxiv_crawler.crawl_papers(
                 categories=categories,
@@ -335,21 +338,34 @@ class WorkingMultiPlatformCrawlerAPI:
                     }
                     papers_list.append(paper_dict)
                     
-                    saved_obj = self.db.save_paper(paper_data)
-                    if saved_obj:
-                        saved_count += 1
-                        logger.info(f"✓ Saved ArXiv paper #{saved_count}: {paper.paper_id}")
+                    pending.append(paper_data)
+                    if len(pending) >= Config.INGEST_CHUNK_SIZE:
+                        saved_count += self._save_pending('arxiv', pending)
+                        pending = []
                     
                 except Exception as e:
                     logger.error(f"Error saving ArXiv paper {paper.paper_id}: {e}")
                     continue
             
+            saved_count += self._save_pending('arxiv', pending)
             return saved_count, papers_list
             
         except Exception as e:
             logger.error(f"ArXiv crawling failed: {e}")
             return 0, []
     
+    def _save_pending(self, platform: str, pending: List[Dict[str, Any]]) -> int:
+        """대기 중인 논문을 한 번에 저장하고 새로 저장된 개수 반환 (이미 있는 논문은 건너뜀)"""
+        if not pending or not self.db:
+            return 0
+        try:
+            counts = self.db.save_papers(pending)
+            logger.info(f"✓ Saved {counts['inserted']} {platform} papers ({counts['skipped']} already stored)")
+            return counts['inserted']
+        except Exception as e:
+            logger.error(f"Error saving {platform} papers: {e}")
+            return 0
+    
     def GetCrawlingStatus(self) -> Dict[str, Any]:
         """크롤링 시스템 상태"""
         try:
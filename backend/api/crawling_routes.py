@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Response
+from typing import List, Optional
 from datetime import datetime, timedelta
 import logging
 
@@ -7,7 +7,9 @@ try:
     # from api.crawling.arxiv_crawler import ArxivCrawler # Removed
     # from api.crawling.rss_crawler import ArxivRSSCrawler # Removed
     from api.crawling.multi_platform_crawler import fetch_arxiv_papers, fetch_biorxiv_papers, fetch_pmc_papers, fetch_plos_papers, fetch_doaj_papers, save_papers_to_db # New import
-    from core.paper_database import PaperDatabase as DatabaseManager
+    from core.paper_database import DETAIL_COLUMNS, PaperDatabase as DatabaseManager
+    from core.config import Config
+    from api.models import PaperListItem
     from utils.categories import COMPUTER_CATEGORIES, MATH_CATEGORIES, PHYSICS_CATEGORIES, ALL_CATEGORIES
     from utils import DateCalculator
 except ImportError as e:
@@ -27,46 +29,40 @@ print("DEBUG: Crawling routes initialized with database component") # Updated me
 
 logger = logging.getLogger(__name__)
 
-def get_papers_by_domain_and_date(domain: str, days_back: int, limit: int, category: str = None):
-    """Get papers by domain and date range"""
-    papers = []
-    logger.debug(f"get_papers_by_domain_and_date called with domain={domain}, days_back={days_back}, limit={limit}, category={category}")
-
-    if days_back == 0:
-        # days_back이 0이면 날짜 필터링 없이 모든 논문 가져오기 (최신순)
-        papers = db.get_all_papers(limit * 5)
-        logger.debug(f"Retrieved {len(papers)} papers from DB for domain {domain} (all papers, limit={limit})")
-    else:
+def domain_filters(domain: str, days_back: int, category: str = None) -> Optional[dict]:
+    """domain/category/days_back -> PaperDatabase.get_papers 필터 (일치할 수 없는 도메인이면 None)"""
+    start_date = end_date = None
+    if days_back != 0:
+        # days_back이 0이면 날짜 필터링 없이 모든 논문 (최신순)
         start_date, end_date = DateCalculator.calculate_range(days_back)
-        # DB에서 날짜 범위에 맞는 논문 가져오기
-        papers = db.get_papers_by_date_range(start_date, end_date, limit * 5)
-        logger.debug(f"Retrieved {len(papers)} papers from DB for domain {domain}, date range {start_date.date()} to {end_date.date()}")
 
-    logger.debug(f"Raw papers from DB before domain/category filter: {len(papers)}")
-    if papers:
-        logger.debug(f"Sample paper dates: {[p.updated_date.isoformat() for p in papers[:3]]}") # published_date 대신 updated_date 사용
-    
-    # 플랫폼 또는 도메인 필터링
+    # 플랫폼 또는 도메인/카테고리 필터를 DB 쿼리 하나로 (paper_categories 인덱스, 정확한 LIMIT)
+    platform = None
+    categories = None
     if domain.lower() in ['arxiv', 'biorxiv', 'pmc', 'plos', 'doaj']:
-        papers = [p for p in papers if p.platform.lower() == domain.lower()]
-        logger.debug(f"Filtered by platform '{domain}'. Papers remaining: {len(papers)}")
+        platform = domain.lower()
     elif category:
-        papers = [p for p in papers if category in str(p.categories)]
-        logger.debug(f"Filtered by category '{category}'. Papers remaining: {len(papers)}")
+        categories = [category]
     elif domain.lower() != 'all':
         if domain.lower() == 'computer' or domain.lower() == 'cs':
-            filter_cats = COMPUTER_CATEGORIES
+            categories = COMPUTER_CATEGORIES
         elif domain.lower() == 'math':
-            filter_cats = MATH_CATEGORIES
+            categories = MATH_CATEGORIES
         elif domain.lower() == 'physics':
-            filter_cats = PHYSICS_CATEGORIES
+            categories = PHYSICS_CATEGORIES
         else:
-            filter_cats = []
-        
-        papers = [p for p in papers if any(cat in p.categories for cat in filter_cats)]
-        logger.debug(f"Filtered by domain '{domain}' (categories). Papers remaining: {len(papers)}")
-    
-    return papers[:limit]
+            return None
+    return {"platform": platform, "categories": categories, "start_date": start_date, "end_date": end_date}
+
+def get_papers_by_domain_and_date(domain: str, days_back: int, limit: int, category: str = None):
+    """Get papers by domain and date range"""
+    logger.debug(f"get_papers_by_domain_and_date called with domain={domain}, days_back={days_back}, limit={limit}, category={category}")
+    filters = domain_filters(domain, days_back, category)
+    if filters is None:
+        return []
+    papers = db.get_papers(limit=limit, **filters)
+    logger.debug(f"Retrieved {len(papers)} papers for domain {domain} ({filters})")
+    return papers
 
 # crawl_papers_by_rss 함수는 더 이상 사용되지 않으므로 삭제
 # def crawl_papers_by_rss(domain: str, category: str = None, limit: int = 50):
@@ -77,17 +73,31 @@ def crawl_papers_by_domain(domain: str, days_back: int, category: str = None, li
     raise NotImplementedError("crawl_papers_by_domain은 더 이상 사용되지 않습니다. /crawl 엔드포인트를 사용하세요.")
 
 
-@router.get("/papers")
+@router.get("/papers", response_model=List[PaperListItem])
 async def get_papers(
+    response: Response,
     domain: str = 'all',
     days_back: int = 7,
     limit: int = 50,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    abstract_chars: Optional[int] = None
 ):
-    """논문 목록 조회"""
+    """논문 목록 조회 (최신순 한 페이지, 다음 페이지 커서는 X-Next-Cursor 헤더로 전달)
+
+    abstract_chars를 주면 초록을 그 길이까지만 반환 (카드 미리보기용).
+    """
     try:
-        papers = get_papers_by_domain_and_date(domain, days_back, limit, category)
-        return [p.__dict__ for p in papers] # SQLAlchemy Paper 객체를 딕셔너리로 변환
+        limit = max(1, min(limit, Config.PAPERS_PAGE_MAX_LIMIT))
+        filters = domain_filters(domain, days_back, category)
+        if filters is None:
+            return []
+        # ORM 객체 대신 목록에 필요한 컬럼만 조회 (임베딩 BLOB은 읽지도 직렬화하지도 않음)
+        rows, next_cursor = db.get_paper_rows_page(limit, cursor=cursor, columns=DETAIL_COLUMNS,
+                                                   abstract_chars=abstract_chars and max(1, abstract_chars), **filters)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [row._asdict() for row in rows]
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -12,14 +12,18 @@ print(f"DEBUG: Loading env from: {env_path}")
 load_dotenv(env_path)
 print(f"DEBUG: EMAIL_TEST_MODE = {os.getenv('EMAIL_TEST_MODE')}")
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import List, Optional
 from api.routes import router
+from api.models import BatchSearchRequest
 from db.connection import create_tables
 try:
     from api.enhanced_routes import router as enhanced_router
@@ -43,7 +47,13 @@ except ImportError as e:
     category_routes_available = False
 
 from core.faiss_manager import FAISSManager
-from core.paper_database import PaperDatabase
+from core.vector_store import get_vector_store
+from core.hybrid_search import hybrid_search
+from core.model_registry import get_model_registry
+from core.query_cache import get_query_cache, warm_up
+from core.passage_store import get_passage_store
+from core.config import Config
+from core.paper_database import PaperDatabase, add_paper_listener
 from core.models import Paper
 from core.llm_reranker import LLMReranker
 
@@ -51,6 +61,7 @@ faiss_manager: Optional[FAISSManager] = None
 llm_reranker: Optional[LLMReranker] = None
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Enhanced arXiv Paper Analysis System")
 
@@ -68,8 +79,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 목록 API 페이지네이션 커서
 )
 
+@app.middleware("http")
+async def refresh_faiss_index(request: Request, call_next):
+    # 다른 프로세스가 새 인덱스 세대를 게시했으면 요청 처리 전에 참조만 교체 (진행 중인 검색은 이전 스냅샷으로 완료)
+    if faiss_manager is not None:
+        await run_in_threadpool(faiss_manager.refresh_if_stale)
+    return await call_next(request)
+
 # Include routers
 app.include_router(router, prefix="/api/v1")
 if enhanced_routes_available:
@@ -90,18 +109,28 @@ if category_routes_available:
 
 # FAISS 기반 논문 검색 API
 @app.get("/api/v1/search_papers_faiss")
-async def search_papers_faiss(query: str = Query(..., min_length=3), k: int = Query(10, ge=1, le=100)):
-    """FAISS를 사용하여 논문 검색"""
+async def search_papers_faiss(
+    query: str = Query(..., min_length=3),
+    k: int = Query(10, ge=1, le=100),
+    platform: Optional[List[str]] = Query(None, description="플랫폼 필터 (arxiv, biorxiv, ...)"),
+    category: Optional[List[str]] = Query(None, description="카테고리 필터 (cs.AI, ...)"),
+    start_date: Optional[datetime] = Query(None, description="updated_date 시작 (포함)"),
+    end_date: Optional[datetime] = Query(None, description="updated_date 끝 (포함)")
+):
+    """FAISS를 사용하여 논문 검색 (플랫폼/카테고리/날짜 필터는 인덱스 스캔 내에서 적용)"""
     global faiss_manager
     if faiss_manager is None:
         raise HTTPException(status_code=503, detail="FAISS manager not initialized.")
 
     try:
-        search_results = faiss_manager.search_papers(query, k)
-        paper_db = PaperDatabase()
+        # 쿼리 임베딩과 인덱스 검색은 동기 CPU 작업이므로 이벤트 루프 밖에서 실행
+        search_results = await run_in_threadpool(faiss_manager.search_papers, query, k, platform=platform,
+                                                 category=category, start_date=start_date, end_date=end_date)
+        # 결과 논문을 한 번의 IN 쿼리로 하이드레이션 (필요한 컬럼만, 임베딩 제외)
+        papers = PaperDatabase().get_paper_rows_by_ids(paper_id for paper_id, _ in search_results)
         results = []
         for paper_id, distance in search_results:
-            paper = paper_db.get_paper_by_id(paper_id)
+            paper = papers.get(paper_id)
             if paper:
                 results.append({
                     "title": paper.title,
@@ -122,12 +151,98 @@ async def search_papers_faiss(query: str = Query(..., min_length=3), k: int = Qu
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"FAISS search failed: {e}")
 
+# 하이브리드 검색 API (BM25 전문 검색 + FAISS, reciprocal-rank fusion)
+@app.get("/api/v1/search_papers_hybrid")
+async def search_papers_hybrid(
+    query: str = Query(..., min_length=2),
+    k: int = Query(10, ge=1, le=100),
+    lexical_weight: float = Query(Config.HYBRID_LEXICAL_WEIGHT, ge=0, description="BM25 순위 가중치 (0이면 생략)"),
+    semantic_weight: float = Query(Config.HYBRID_SEMANTIC_WEIGHT, ge=0, description="FAISS 순위 가중치 (0이면 생략)"),
+    candidates: int = Query(Config.HYBRID_CANDIDATES, ge=10, le=1000, description="단계별 융합 후보 수"),
+    platform: Optional[List[str]] = Query(None, description="플랫폼 필터 (arxiv, biorxiv, ...)"),
+    category: Optional[List[str]] = Query(None, description="카테고리 필터 (cs.AI, ...)"),
+    start_date: Optional[datetime] = Query(None, description="updated_date 시작 (포함)"),
+    end_date: Optional[datetime] = Query(None, description="updated_date 끝 (포함)")
+):
+    """BM25와 FAISS 검색을 동시에 실행하고 RRF로 융합 (약어/저자명 정확 일치 + 의미 검색)"""
+    global faiss_manager
+    if faiss_manager is None:
+        raise HTTPException(status_code=503, detail="FAISS manager not initialized.")
+    if lexical_weight == 0 and semantic_weight == 0:
+        raise HTTPException(status_code=400, detail="lexical_weight and semantic_weight cannot both be 0")
+
+    try:
+        search = await run_in_threadpool(
+            hybrid_search, query, faiss_manager, k=k, lexical_weight=lexical_weight, semantic_weight=semantic_weight,
+            candidates=candidates, platform=platform, category=category, start_date=start_date, end_date=end_date
+        )
+        hydrate_start = time.perf_counter()
+        papers = PaperDatabase().get_paper_rows_by_ids(hit["paper_id"] for hit in search["results"])
+        results = []
+        for hit in search["results"]:
+            paper = papers.get(hit["paper_id"])
+            if paper:
+                results.append({
+                    "title": paper.title,
+                    "paper_id": paper.paper_id,
+                    "platform": paper.platform,
+                    "authors": paper.authors,
+                    "categories": paper.categories,
+                    "pdf_url": paper.pdf_url,
+                    "abstract": paper.abstract,
+                    "published_date": paper.published_date.strftime('%Y-%m-%d') if paper.published_date else None,
+                    "updated_date": paper.updated_date.strftime('%Y-%m-%d') if paper.updated_date else None,
+                    "rrf_score": hit["score"],
+                    "lexical_rank": hit["lexical_rank"],
+                    "semantic_rank": hit["semantic_rank"]
+                })
+        timings = dict(search["timings_ms"], hydrate=round((time.perf_counter() - hydrate_start) * 1000, 2))
+        return {"status": "success", "results": results, "timings_ms": timings}
+    except Exception as e:
+        logger.error(f"Hybrid search error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Hybrid search failed: {e}")
+
+# 여러 쿼리/시드 논문 일괄 검색 API (임베딩 1회 + index.search 1회)
+@app.post("/api/v1/search_papers_faiss/batch")
+async def search_papers_faiss_batch(request: BatchSearchRequest):
+    """여러 쿼리 텍스트와 시드 논문 ID를 한 번에 검색하여 쿼리별 top-k와 선택적 통합 랭킹 반환"""
+    global faiss_manager
+    if faiss_manager is None:
+        raise HTTPException(status_code=503, detail="FAISS manager not initialized.")
+    if not request.queries and not request.paper_ids:
+        raise HTTPException(status_code=400, detail="queries or paper_ids required")
+    if request.k < 1 or request.k > 100:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 100")
+
+    try:
+        batch = await run_in_threadpool(faiss_manager.search_batch, request.queries, request.paper_ids, k=request.k,
+                                        platform=request.platform, category=request.category,
+                                        start_date=request.start_date, end_date=request.end_date,
+                                        fuse=request.fuse)
+        results = []
+        for label, rows in zip(batch["queries"], batch["results"]):
+            results.append({
+                "query": label,
+                "results": [{"paper_id": paper_id, "distance": float(distance)} for paper_id, distance in rows]
+            })
+        response = {"status": "success", "results": results}
+        if batch["fused"] is not None:
+            response["fused"] = [{"paper_id": paper_id, "rrf_score": score} for paper_id, score in batch["fused"]]
+        return response
+    except Exception as e:
+        logger.error(f"FAISS batch search error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"FAISS batch search failed: {e}")
+
 # 논문 추천 API (FAISS + LLM 재랭크)
 @app.get("/api/v1/recommend_papers")
 async def recommend_papers(
     user_interests: List[str] = Query(..., description="사용자 관심사 (키워드 목록)"),
     num_candidates: int = Query(500, ge=50, le=1000, description="FAISS에서 가져올 논문 후보 수"),
-    top_k_rerank: int = Query(50, ge=5, le=500, description="LLM 재랭크 후 반환할 최종 논문 수")
+    top_k_rerank: int = Query(50, ge=5, le=500, description="LLM 재랭크 후 반환할 최종 논문 수"),
+    platform: Optional[List[str]] = Query(None, description="플랫폼 필터 (arxiv, biorxiv, ...)"),
+    category: Optional[List[str]] = Query(None, description="카테고리 필터 (cs.AI, ...)"),
+    start_date: Optional[datetime] = Query(None, description="updated_date 시작 (포함)"),
+    end_date: Optional[datetime] = Query(None, description="updated_date 끝 (포함)")
 ):
     """FAISS와 LLM을 사용하여 논문 추천 및 설명 생성"""
     global faiss_manager, llm_reranker
@@ -137,19 +252,21 @@ async def recommend_papers(
         raise HTTPException(status_code=503, detail="LLM reranker not initialized. Check LM_STUDIO_BASE_URL environment variable.")
 
     try:
-        # 1. FAISS를 이용한 후보 생성 (사용자 관심사 텍스트로 검색)
-        # FAISS는 텍스트 쿼리를 임베딩하여 유사한 논문을 찾음
-        query_text = " ".join(user_interests) # 사용자 관심사 키워드를 하나의 쿼리 문자열로 결합
-        faiss_results = faiss_manager.search_papers(query_text, k=num_candidates)
+        # 1. FAISS를 이용한 후보 생성 (관심사별로 검색 후 RRF로 통합)
+        # 관심사 전체를 한 번에 임베딩하고 (Q, d) 행렬로 한 번만 검색
+        batch = await run_in_threadpool(faiss_manager.search_batch, user_interests, k=num_candidates,
+                                        platform=platform, category=category, start_date=start_date,
+                                        end_date=end_date, fuse=True)
+        faiss_results = batch["fused"]
 
         if not faiss_results:
             return {"status": "success", "message": "No paper candidates found with FAISS.", "results": []}
         
         # 2. 후보 논문 데이터베이스에서 세부 정보 가져오기
-        paper_db = PaperDatabase()
+        papers = PaperDatabase().get_paper_rows_by_ids(paper_id for paper_id, _ in faiss_results)
         candidate_papers_full_data = []
         for paper_id, _ in faiss_results:
-            paper = paper_db.get_paper_by_id(paper_id)
+            paper = papers.get(paper_id)
             if paper:
                 candidate_papers_full_data.append({
                     "paper_id": paper.paper_id,
@@ -201,8 +318,15 @@ async def startup_event():
     create_tables()
     print("DEBUG: Enhanced FastAPI server starting up...")
     try:
-        faiss_manager = FAISSManager()
+        vector_store = get_vector_store()
+        faiss_manager = vector_store.collection() # 추천 엔진/에이전트와 같은 컬렉션 공유
+        add_paper_listener(vector_store) # 논문 저장/삭제 시 열린 모든 컬렉션 증분 갱신
+        add_paper_listener(get_passage_store()) # 논문 삭제 시 본문 패시지도 함께 삭제
         print("DEBUG: FAISS Manager initialized.")
+        if Config.QUERY_CACHE_WARMUP_TOP:
+            # 지난 실행의 상위 빈도 쿼리를 백그라운드로 미리 임베딩 (대시보드 첫 폴링부터 캐시 히트)
+            frequent = get_query_cache().load_frequent()[:Config.QUERY_CACHE_WARMUP_TOP]
+            threading.Thread(target=warm_up, args=(faiss_manager, frequent), name="query-cache-warmup", daemon=True).start()
     except Exception as e:
         print(f"ERROR: Failed to initialize FAISS Manager: {e}")
         import traceback
@@ -228,6 +352,19 @@ async def startup_event():
         print("DEBUG: Running in legacy mode")
         print("DEBUG: To enable enhanced features, install additional dependencies")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # 다음 startup 워밍업용 상위 빈도 쿼리 저장
+    try:
+        get_query_cache().save_frequent()
+    except Exception as e:
+        print(f"WARNING: Failed to save frequent queries: {e}")
+    # 디바운스되어 아직 저장되지 않은 증분 인덱스 갱신 게시
+    try:
+        get_vector_store().flush()
+    except Exception as e:
+        print(f"WARNING: Failed to persist vector index updates: {e}")
+
 @app.get("/", response_class=HTMLResponse)
 async def main_page():
     """멀티플랫폼 크롤링 시스템 메인 페이지"""
@@ -265,6 +402,8 @@ async def health_check():
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "system_diagnostics": diagnostics,
+            "model_registry": get_model_registry().stats(),
+            "query_embedding_cache": get_query_cache().stats(),
             "api_status": "operational"
         }
         
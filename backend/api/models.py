@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 
 class PaperResponse(BaseModel):
@@ -16,6 +16,19 @@ class PaperResponse(BaseModel):
     created_at: Optional[datetime]
     crawled: Optional[str]
 
+class PaperListItem(BaseModel):
+    # 목록 응답 (PaperDatabase.get_paper_rows 컬럼, 임베딩 없음)
+    paper_id: str
+    external_id: Optional[str] = None
+    platform: Optional[str] = None
+    title: str
+    abstract: Optional[str] = None
+    authors: Union[List[str], str, None] = None  # 크롤러에 따라 목록 또는 문자열
+    categories: Union[List[str], str, None] = None
+    pdf_url: Optional[str] = None
+    published_date: Optional[datetime] = None
+    updated_date: Optional[datetime] = None
+
 class SearchRequest(BaseModel):
     query: str
     category: Optional[str] = None
@@ -26,3 +39,13 @@ class PaginatedResponse(BaseModel):
     total: int
     page: int
     pages: int
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = []
+    paper_ids: List[str] = []  # 시드 논문: 저장된 임베딩으로 검색, 결과에서는 제외
+    k: int = 10
+    platform: Optional[List[str]] = None
+    category: Optional[List[str]] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    fuse: bool = False  # 쿼리별 결과를 RRF로 합친 단일 랭킹도 반환
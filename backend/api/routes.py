@@ -895,7 +895,7 @@ async def get_recommendations(request: dict):
     try:
         rec_engine = get_recommendation_engine()
         
-        if rec_engine.paper_embeddings is None:
+        if not rec_engine.is_initialized:
             return {
                 'error': '추천 시스템이 초기화되지 않았습니다. 먼저 시스템을 초기화해주세요.',
                 'initialization_required': True
@@ -922,9 +922,11 @@ async def get_recommendation_status():
         rec_engine = get_recommendation_engine()
         
         status = {
-            'initialized': rec_engine.paper_embeddings is not None,
+            'initialized': rec_engine.is_initialized,
             'paper_count': len(rec_engine.paper_ids) if rec_engine.paper_ids else 0,
-            'faiss_index_ready': rec_engine.faiss_index is not None,
+            'faiss_index_ready': rec_engine.collection.ntotal > 0,
+            'generation': rec_engine.generation,
+            'rebuilding': rec_engine._build_lock.locked(),
             'timestamp': datetime.now().isoformat()
         }
         
@@ -946,7 +948,7 @@ async def get_similar_papers(paper_id: str, limit: int = 10):
     try:
         rec_engine = get_recommendation_engine()
         
-        if rec_engine.paper_embeddings is None:
+        if not rec_engine.is_initialized:
             return {'error': '추천 시스템이 초기화되지 않았습니다'}
         
         recommendations = rec_engine.get_content_based_recommendations(paper_id, limit)
@@ -983,12 +985,14 @@ async def rebuild_recommendation_index():
     
     try:
         rec_engine = get_recommendation_engine()
-        rec_engine.initialize_system(force_rebuild=True)
+        # 새 세대는 백그라운드에서 구축 후 교체되며, 그 동안 기존 인덱스로 추천 제공
+        started = rec_engine.rebuild_in_background()
         
         return {
             'success': True,
-            'message': '추천 인덱스 재구축 완료',
+            'message': '추천 인덱스 재구축 시작' if started else '추천 인덱스 재구축이 이미 진행 중',
             'paper_count': len(rec_engine.paper_ids),
+            'generation': rec_engine.generation,
             'timestamp': datetime.now().isoformat()
         }
         
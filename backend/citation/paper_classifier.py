@@ -2,13 +2,14 @@ from transformers import pipeline
 import logging
 from typing import Dict
 
+from backend.core.model_registry import get_model_registry
+
+ZERO_SHOT_MODEL = "facebook/bart-large-mnli"
+
 class PaperClassifier:
     def __init__(self):
+        self._load_failed = False  # 로드 실패는 한 번만 기록하고 이후 분류는 바로 'unknown' 반환
         try:
-            self.classifier = pipeline("zero-shot-classification", 
-                                     model="facebook/bart-large-mnli",
-                                     device=-1)  # CPU 사용
-            
             self.problem_domains = [
                 "optimization", "prediction", "classification", 
                 "generation", "analysis", "detection", "simulation",
@@ -25,11 +26,26 @@ class PaperClassifier:
             
         except Exception as e:
             logging.error(f"Classifier initialization error: {str(e)}", exc_info=True)
-            self.classifier = None
+
+    @property
+    def classifier(self):
+        """모델 레지스트리의 공유 BART-MNLI 파이프라인 (첫 분류 시 로드, 메모리 예산 초과 시 해제될 수 있어 매번 조회)"""
+        if self._load_failed:
+            return None
+        try:
+            return get_model_registry().get(
+                ("zero-shot-classification", ZERO_SHOT_MODEL),
+                lambda: pipeline("zero-shot-classification", model=ZERO_SHOT_MODEL, device=-1),  # CPU 사용
+            )
+        except Exception as e:
+            logging.error(f"Classifier initialization error: {str(e)}", exc_info=True)
+            self._load_failed = True
+            return None
             
     def classify_paper(self, title: str, abstract: str) -> Dict:
         """논문의 문제 도메인과 해결방법 분류"""
-        if not self.classifier:
+        classifier = self.classifier
+        if not classifier:
             return {
                 'problem_domain': 'unknown',
                 'solution_type': 'unknown',
@@ -40,12 +56,12 @@ class PaperClassifier:
             text = f"{title}. {abstract[:500]}"  # 길이 제한
             
             # 문제 도메인 분류
-            problem_result = self.classifier(text, candidate_labels=self.problem_domains)
+            problem_result = classifier(text, candidate_labels=self.problem_domains)
             problem_domain = problem_result['labels'][0]
             problem_confidence = problem_result['scores'][0]
             
             # 해결방법 유형 분류
-            solution_result = self.classifier(text, candidate_labels=self.solution_types)
+            solution_result = classifier(text, candidate_labels=self.solution_types)
             solution_type = solution_result['labels'][0]
             solution_confidence = solution_result['scores'][0]
             
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from core.config import Config
 from core.paper_database import PaperDatabase as DatabaseManager
+from core.passage_store import format_passages, get_passage_store
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,7 @@ class AIAgent:
     def __init__(self):
         self.base_url = Config.LM_STUDIO_BASE_URL
         self.db = DatabaseManager()
+        self.passages = get_passage_store()
         self.conversation_history = {}
         
     async def analyze_paper_comprehensive(self, paper_data: Dict) -> Dict:
@@ -169,8 +171,13 @@ JSON만 출력:"""
             logger.error(f"Quality assessment failed: {e}")
             return {"error": str(e)}
     
-    async def chat_with_paper(self, paper_id: str, user_message: str, session_id: str) -> Dict:
-        """논문과 대화형 상호작용"""
+    async def chat_with_paper(self, paper_id: str, user_message: str, session_id: str,
+                              full_text: Optional[str] = None) -> Dict:
+        """논문과 대화형 상호작용
+
+        전문(full_text)이 주어지거나 이미 패시지 인덱스에 있으면 질문과 가장 관련된
+        상위 패시지만 프롬프트에 넣는다. 없으면 초록으로 답변한다.
+        """
         try:
             # 논문 정보 조회
             paper = self.db.get_paper_by_id(paper_id)
@@ -190,13 +197,22 @@ JSON만 출력:"""
             
             history = self.conversation_history[session_id]
             
+            # 전문 패시지 검색 (임베딩은 CPU 작업이므로 이벤트 루프 밖에서)
+            passages = await asyncio.to_thread(self._relevant_passages, paper_id, user_message, full_text)
+            if passages:
+                paper_context = f"초록: {paper_data['abstract'][:300]}\n\n관련 본문 발췌:\n{format_passages(passages)}"
+            elif full_text:
+                paper_context = f"본문: {full_text[:Config.PASSAGE_MIN_TEXT_CHARS]}"
+            else:
+                paper_context = f"초록: {paper_data['abstract'][:1000]}"
+            
             # 컨텍스트 구성
             context_prompt = f"""다음 논문에 대한 질문에 답변하세요:
 
 논문 제목: {paper_data['title']}
 저자: {', '.join(paper_data['authors'][:3])}
 카테고리: {', '.join(paper_data['categories'])}
-초록: {paper_data['abstract'][:1000]}
+{paper_context}
 
 이전 대화:"""
             
@@ -221,6 +237,7 @@ JSON만 출력:"""
             
             result["paper_id"] = paper_id
             result["session_id"] = session_id
+            result["passages_used"] = [p["chunk_index"] + 1 for p in passages]
             
             return result
             
@@ -228,6 +245,16 @@ JSON만 출력:"""
             logger.error(f"Chat interaction failed: {e}")
             return {"error": str(e)}
     
+    def _relevant_passages(self, paper_id: str, question: str, full_text: Optional[str] = None) -> List[Dict]:
+        """질문과 가장 관련된 본문 패시지 (전문이 짧거나 인덱싱된 적 없으면 빈 리스트)"""
+        try:
+            if full_text and len(full_text) >= Config.PASSAGE_MIN_TEXT_CHARS:
+                self.passages.index_paper(paper_id, full_text)
+            return self.passages.top_passages(paper_id, question)
+        except Exception as e:
+            logger.error(f"Passage retrieval failed for {paper_id}: {e}")
+            return []
+    
     async def suggest_related_papers(self, paper_id: str, limit: int = 5) -> Dict:
         """관련 논문 추천"""
         try:
@@ -236,10 +263,8 @@ JSON만 출력:"""
             if not paper:
                 return {"error": "논문을 찾을 수 없습니다."}
             
-            # 같은 카테고리의 최근 논문들 조회 - search_papers 사용
-            # 카테고리 문자열로 검색
-            category_query = ' '.join(paper.categories) if isinstance(paper.categories, list) else str(paper.categories)
-            all_papers = self.db.search_papers(category_query, limit=limit*3)
+            # 제목 단어 중 하나라도 있는 논문을 전문 검색 (FTS5 BM25 관련도 순) - 후보 논문 조회
+            all_papers = self.db.search_papers(paper.title, limit=limit*3, prefix=False, any_token=True)
             
             # 현재 논문 제외
             related_papers = [p for p in all_papers if p.paper_id != paper_id]
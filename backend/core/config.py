@@ -22,10 +22,81 @@ class Config:
     LOG_LEVEL = "INFO"
     LOG_FILE = "app.log"
 
+    # 임베딩 캐시: (모델, 어댑터, 정규화 텍스트 해시) -> 벡터, 한 번 본 텍스트는 다시 인코딩하지 않음
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_PATH = os.path.join(MODEL_CACHE_DIR, 'embedding_cache.sqlite')
+
+    # 임베딩 배칭: "bucketed"는 토큰 길이로 정렬해 토큰 예산 내 버킷 단위로 추론 (패딩 최소화), "naive"는 입력 순서 고정 크기 배치
+    EMBEDDING_BATCHING = os.getenv("EMBEDDING_BATCHING", "bucketed")
+    EMBEDDING_TOKEN_BUDGET = 8192  # 버킷당 (배치 크기 x 최대 토큰 길이) 상한
+    EMBEDDING_MAX_BATCH_SIZE = 64
+    EMBEDDING_MAX_LENGTH = 512
+
+    # 임베딩 추론 백엔드 (CPU): "eager" PyTorch, "int8" 동적 양자화 PyTorch, "onnx" ONNX Runtime (onnxruntime 필요)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "eager")
+    EMBEDDING_ONNX_DIR = os.path.join(MODEL_CACHE_DIR, 'onnx')
+
+    # 임베딩 백필 작업 (python -m backend.core.embedding_backfill): 워커 프로세스 수, 배치 크기, 재개용 체크포인트
+    BACKFILL_WORKERS = 2
+    BACKFILL_BATCH_SIZE = 64
+    BACKFILL_CHECKPOINT_PATH = os.path.join(MODEL_CACHE_DIR, 'embedding_backfill.json')
+
+    # 모델 레지스트리: 프로세스 전체에서 모델 공유, 상주 메모리가 예산을 넘으면 가장 오래 안 쓴 모델부터 해제
+    MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "4096"))
+
+    # 크롤러 임베딩 마이크로 배치 크기 (페이지 파싱 후 배치 단위로 forward pass)
+    CRAWLER_EMBED_BATCH_SIZE = 16
+    # 대량 적재(PaperDatabase.save_papers): 청크당 한 트랜잭션으로 INSERT ... ON CONFLICT
+    INGEST_CHUNK_SIZE = 500
+    # 논문 목록 API 페이지 크기 상한 (다음 페이지는 커서로 요청)
+    PAPERS_PAGE_MAX_LIMIT = 200
+
+    # 본문 패시지 인덱스: 전문을 겹치는 청크로 나눠 paper_id별로 임베딩 저장, 채팅/분석 프롬프트에는 상위 N개 패시지만 포함
+    PASSAGE_CHUNK_WORDS = 200  # 청크당 단어 수 (SPECTER2 최대 512 토큰 이내)
+    PASSAGE_CHUNK_OVERLAP = 40  # 인접 청크와 겹치는 단어 수
+    PASSAGE_TOP_N = 4
+    PASSAGE_MIN_TEXT_CHARS = 3000  # 이보다 짧은 본문은 청크로 나누지 않고 그대로 프롬프트에 사용
+
     # 검색 및 추천 엔진 설정
     RECOMMENDATION_TOP_K = 10
     RESEARCH_DISCOVERY_TOP_K = 5
 
+    # 벡터 인덱스 설정 (None이면 코퍼스 크기와 목표 recall로 flat/hnsw/ivfpq 자동 선택)
+    VECTOR_INDEX_TYPE = None
+    VECTOR_INDEX_TARGET_RECALL = 0.95
+    # 축소 벡터 티어: PCA 차원(128~256 권장, None이면 끔)과 8비트 스칼라 양자화로 1차 검색 후 float32 원본으로 재정렬
+    VECTOR_INDEX_PCA_DIM = int(os.getenv("VECTOR_INDEX_PCA_DIM", "0")) or None
+    VECTOR_INDEX_SQ8 = os.getenv("VECTOR_INDEX_SQ8", "false").lower() == "true"
+    # 여러 uvicorn 워커가 인덱스/임베딩을 읽기 전용 mmap으로 공유 (페이지 캐시 1벌)
+    VECTOR_INDEX_MMAP = os.getenv("VECTOR_INDEX_MMAP", "false").lower() == "true"
+    # 증분 추가/삭제는 이 간격(초)마다 모아서 번들로 저장/게시 (0이면 매번 저장). 재구축은 즉시 게시
+    VECTOR_INDEX_PERSIST_INTERVAL = float(os.getenv("VECTOR_INDEX_PERSIST_INTERVAL", "30"))
+
+    # papers.embedding BLOB 저장 dtype ("float32" 또는 용량 절반인 "float16"); 바꾸면 migrate_embeddings로 재저장
+    EMBEDDING_STORAGE_DTYPE = os.getenv("EMBEDDING_STORAGE_DTYPE", "float32")
+
+    # 공유 벡터 스토어: 컬렉션 이름 -> 임베딩 모델/버전 (모델이나 버전이 바뀌면 별도 인덱스로 분리)
+    VECTOR_STORE_DIR = os.path.join(MODEL_CACHE_DIR, 'vector_store')
+    VECTOR_COLLECTIONS = {
+        "papers": {"model": "allenai/specter2", "base_model": "allenai/specter2_base", "version": 1},
+    }
+    DEFAULT_VECTOR_COLLECTION = "papers"
+    # 플랫폼별 샤드: 샤드 단위로 빌드/로드/재구축, 쿼리는 샤드에 팬아웃 후 top-k 병합
+    VECTOR_SHARD_BY_PLATFORM = os.getenv("VECTOR_SHARD_BY_PLATFORM", "true").lower() == "true"
+    VECTOR_SHARD_PLATFORMS = ("arxiv", "biorxiv", "pmc", "plos", "doaj", "core")
+    VECTOR_SHARD_PARALLEL = True  # faiss 검색은 GIL을 해제하므로 스레드 풀로 동시 검색
+
+    # 쿼리 임베딩 캐시 (LRU + TTL, 모델 버전별): 반복 쿼리는 forward pass 생략
+    QUERY_CACHE_SIZE = 2048
+    QUERY_CACHE_TTL = 3600  # 초
+    QUERY_CACHE_FREQUENT_PATH = os.path.join(MODEL_CACHE_DIR, 'frequent_queries.json')
+    QUERY_CACHE_WARMUP_TOP = 100  # startup 시 미리 임베딩할 상위 빈도 쿼리 수 (0이면 끔)
+
+    # 하이브리드 검색 (BM25 + FAISS, reciprocal-rank fusion)
+    HYBRID_LEXICAL_WEIGHT = 1.0
+    HYBRID_SEMANTIC_WEIGHT = 1.0
+    HYBRID_CANDIDATES = 100  # 단계별로 가져와 융합할 후보 수
+
     def __init__(self):
         os.makedirs(self.DATABASE_DIR, exist_ok=True)
         os.makedirs(self.MODEL_CACHE_DIR, exist_ok=True)
@@ -0,0 +1,172 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스마다 한 번만 로드되는 임베딩 모델
+_worker_manager = None
+
+
+def _init_worker(model_name: str, base_model_name: str, torch_threads: int):
+    global _worker_manager
+    import torch
+    from .embedding_manager import EmbeddingManager
+
+    # 워커끼리 코어를 나눠 쓰도록 intra-op 스레드 수 제한
+    torch.set_num_threads(torch_threads)
+    _worker_manager = EmbeddingManager(model_name=model_name, base_model_name=base_model_name)
+
+
+def _embed_batch(batch: List[Tuple[int, str, str]]) -> List[Tuple[str, bytes]]:
+    """(rowid, paper_id, text) 배치 -> (paper_id, 저장 dtype 바이트). 프로세스 간 전송량을 줄이려 바이트로 반환"""
+    embeddings = _worker_manager.get_embeddings([text for _, _, text in batch])
+    dtype = np.dtype(Config.EMBEDDING_STORAGE_DTYPE)
+    return [(paper_id, np.asarray(vector, dtype=dtype).tobytes()) for (_, paper_id, _), vector in zip(batch, embeddings)]
+
+
+class BackfillCheckpoint:
+    """처리 완료된 마지막 rowid를 JSON 파일에 기록 (중단 후 재실행 시 그 다음부터 재개)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {"last_rowid": 0, "embedded": 0}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state.update(json.load(f))
+
+    @property
+    def last_rowid(self) -> int:
+        return self.state["last_rowid"]
+
+    def advance(self, last_rowid: int, embedded: int):
+        self.state["last_rowid"] = last_rowid
+        self.state["embedded"] += embedded
+        self.state["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _candidate_batches(engine, dimension: int, after_rowid: int, batch_size: int,
+                       reembed_all: bool) -> Iterator[List[Tuple[int, str, str]]]:
+    """임베딩이 없거나(NULL) 현재 모델 차원과 맞지 않는(목업 [0.0]*10, 레거시 JSON 등) 논문을 rowid 순으로 배치 스트리밍"""
+    from .vector_store import document_text
+
+    expected_bytes = dimension * np.dtype(Config.EMBEDDING_STORAGE_DTYPE).itemsize
+    condition = "1=1" if reembed_all else \
+        "(embedding IS NULL OR typeof(embedding) != 'blob' OR length(embedding) != :expected_bytes)"
+    sql = text(f"""
+        SELECT rowid, paper_id, title, abstract FROM papers
+        WHERE rowid > :last AND {condition}
+        ORDER BY rowid LIMIT :n
+    """)
+    last = after_rowid
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(sql, {"last": last, "n": batch_size, "expected_bytes": expected_bytes}).fetchall()
+        if not rows:
+            return
+        yield [(rowid, paper_id, document_text(title, abstract)) for rowid, paper_id, title, abstract in rows]
+        last = rows[-1][0]
+
+
+def _write_results(engine, results: List[Tuple[str, bytes]]):
+    # 배치 하나를 한 트랜잭션으로 일괄 반영
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE papers SET embedding = :embedding WHERE paper_id = :paper_id"),
+                     [{"paper_id": paper_id, "embedding": blob} for paper_id, blob in results])
+
+
+def run_backfill(workers: int = Config.BACKFILL_WORKERS, batch_size: int = Config.BACKFILL_BATCH_SIZE,
+                 checkpoint_path: str = Config.BACKFILL_CHECKPOINT_PATH, reembed_all: bool = False,
+                 restart: bool = False, collection: str = Config.DEFAULT_VECTOR_COLLECTION,
+                 rebuild_index: bool = True) -> int:
+    """누락/오래된 임베딩을 프로세스 풀로 채우고 체크포인트를 남긴다. 새로 저장한 임베딩 수를 반환
+
+    결과는 제출 순서대로 반영하므로 체크포인트의 rowid 이전 논문은 모두 처리된 상태이다.
+    """
+    from transformers import AutoConfig
+    from backend.db.connection import engine
+
+    spec = Config.VECTOR_COLLECTIONS[collection]
+    dimension = AutoConfig.from_pretrained(spec['base_model']).hidden_size  # 설정만 읽음 (모델 로드 없음)
+
+    checkpoint = BackfillCheckpoint(checkpoint_path)
+    if restart:
+        checkpoint.clear()
+        checkpoint = BackfillCheckpoint(checkpoint_path)
+    if checkpoint.last_rowid:
+        logger.info(f"Resuming embedding backfill after rowid {checkpoint.last_rowid} "
+                    f"({checkpoint.state['embedded']} already embedded)")
+
+    workers = max(1, workers)
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    embedded = 0
+    started = time.time()
+    # torch/tokenizer 스레드 상태를 fork로 물려받지 않도록 spawn
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker,
+                             initargs=(spec['model'], spec['base_model'], torch_threads)) as executor:
+        in_flight = deque()
+
+        def drain_one():
+            nonlocal embedded
+            batch, future = in_flight.popleft()
+            results = future.result()
+            _write_results(engine, results)
+            embedded += len(results)
+            checkpoint.advance(batch[-1][0], len(results))
+            logger.info(f"Backfilled {embedded} embeddings ({embedded / max(time.time() - started, 1e-9):.1f}/s), "
+                        f"checkpoint rowid {batch[-1][0]}")
+
+        for batch in _candidate_batches(engine, dimension, checkpoint.last_rowid, batch_size, reembed_all):
+            in_flight.append((batch, executor.submit(_embed_batch, batch)))
+            # 워커당 2배치까지만 선행 제출 (메모리 상한), 완료는 제출 순서대로 반영
+            while len(in_flight) >= workers * 2:
+                drain_one()
+        while in_flight:
+            drain_one()
+
+    logger.info(f"Embedding backfill finished: {embedded} papers in {time.time() - started:.1f}s")
+    checkpoint.clear()
+    if embedded and rebuild_index:
+        # 임베딩 변경은 인덱스 체크섬(행 수/updated_date)에 잡히지 않으므로 새 세대를 직접 발행 -> 서버 워커가 hot reload
+        from .vector_store import get_vector_store
+        get_vector_store().collection(collection).rebuild_index()
+    return embedded
+
+
+if __name__ == "__main__":
+    # python -m backend.core.embedding_backfill [--workers 4] [--all] [--restart]
+    parser = argparse.ArgumentParser(description="누락/목업 임베딩을 멀티 프로세스로 채우는 백필 작업 (중단 시 재개 가능)")
+    parser.add_argument("--workers", type=int, default=Config.BACKFILL_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=Config.BACKFILL_BATCH_SIZE)
+    parser.add_argument("--checkpoint", default=Config.BACKFILL_CHECKPOINT_PATH)
+    parser.add_argument("--collection", default=Config.DEFAULT_VECTOR_COLLECTION)
+    parser.add_argument("--all", action="store_true", help="모든 논문 재임베딩 (모델 변경 시)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    parser.add_argument("--no-rebuild", action="store_true", help="완료 후 벡터 인덱스 재구축 생략")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    count = run_backfill(workers=args.workers, batch_size=args.batch_size, checkpoint_path=args.checkpoint,
+                         reembed_all=args.all, restart=args.restart, collection=args.collection,
+                         rebuild_index=not args.no_rebuild)
+    print(f"Backfilled {count} embeddings.")
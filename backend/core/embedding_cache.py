@@ -0,0 +1,94 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, whitespace runs collapsed, trimmed."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(model_id: str, adapter: Optional[str], text: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{adapter or ''}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Content-addressed embedding store in a local SQLite file.
+
+    Vectors are keyed by (model id, adapter, normalized text hash), so any caller
+    embedding the same title/abstract with the same model gets the stored vector
+    back instead of running the encoder again. Several processes may share the
+    file (WAL mode, first writer wins on a key).
+    """
+
+    def __init__(self, path: str = Config.EMBEDDING_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the keys that have one; counts a hit or miss per key."""
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(chunk))})", chunk)
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype='float32')
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                                   [(key, np.asarray(vector, dtype='float32').tobytes()) for key, vector in items.items()])
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "path": self.path,
+        }
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: str = Config.EMBEDDING_CACHE_PATH) -> EmbeddingCache:
+    """Process-wide cache per file, shared by every EmbeddingManager."""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = EmbeddingCache(path)
+        return _caches[path]
@@ -1,16 +1,57 @@
 from transformers import AutoTokenizer, AutoModel
 from adapters import AutoAdapterModel
+from typing import List, Optional, Sequence
 import logging
 import numpy as np
 
+from .config import Config
+from .embedding_cache import EmbeddingCache, cache_key, get_embedding_cache
+from .inference_backends import BACKENDS, create_backend
+
 logger = logging.getLogger(__name__)
 
+BATCHING_MODES = ("bucketed", "naive")
+
+
+def length_buckets(lengths: Sequence[int], token_budget: int, max_batch_size: int) -> List[List[int]]:
+    """Group input indices into batches of similar token length.
+
+    Indices are sorted longest first and packed greedily while
+    batch_size * longest_length (the padded size) stays within token_budget.
+    A single input longer than the budget gets a batch of its own.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    buckets: List[List[int]] = []
+    for i in order:
+        # Sorted descending, so the first index of a bucket is its padded length
+        if buckets and len(buckets[-1]) < max_batch_size and \
+                (len(buckets[-1]) + 1) * lengths[buckets[-1][0]] <= token_budget:
+            buckets[-1].append(i)
+        else:
+            buckets.append([i])
+    return buckets
+
+
 class EmbeddingManager:
-    def __init__(self, model_name: str = "allenai/specter2", base_model_name: str = "allenai/specter2_base"):
+    def __init__(self, model_name: str = "allenai/specter2", base_model_name: str = "allenai/specter2_base",
+                 cache: Optional[EmbeddingCache] = None, batching: str = Config.EMBEDDING_BATCHING,
+                 token_budget: int = Config.EMBEDDING_TOKEN_BUDGET, max_batch_size: int = Config.EMBEDDING_MAX_BATCH_SIZE,
+                 backend: str = Config.EMBEDDING_BACKEND):
+        if batching not in BATCHING_MODES:
+            raise ValueError(f"Unknown batching mode {batching!r}; expected one of {BATCHING_MODES}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {BACKENDS}")
         self.model_name = model_name
         self.base_model_name = base_model_name
+        self.batching = batching
+        self.token_budget = token_budget
+        self.max_batch_size = max_batch_size
+        self.backend_name = backend
+        self.backend = None
         self.tokenizer = None
         self.model = None
+        # Persistent content-addressed cache: only texts never seen with this model/adapter are encoded
+        self.cache = cache if cache is not None else (get_embedding_cache() if Config.EMBEDDING_CACHE_ENABLED else None)
         self._load_model()
 
     def _load_model(self):
@@ -21,35 +62,81 @@ class EmbeddingManager:
             logger.info(f"Loading AutoAdapterModel: {self.base_model_name} with adapter {self.model_name}")
             self.model = AutoAdapterModel.from_pretrained(self.base_model_name)
             self.model.load_adapter(self.model_name, source="hf", set_active=True)
-            
-            logger.info("Model and adapter loaded successfully.")
+
+            self.backend = create_backend(self.backend_name, self.model, self.base_model_name, self.model_name)
+            logger.info(f"Model and adapter loaded successfully ({self.backend_name} backend).")
         except Exception as e:
             logger.error(f"Error loading model {self.model_name}: {e}")
             raise
 
+    @property
+    def dimension(self) -> int:
+        return self.model.config.hidden_size
+
+    @property
+    def cache_model_id(self) -> str:
+        # int8/ONNX vectors differ slightly from eager ones, so each backend gets its own cache entries
+        return self.base_model_name if self.backend_name == "eager" else f"{self.base_model_name}@{self.backend_name}"
+
     def _get_model_output(self, texts: list[str]) -> np.ndarray:
         if not self.tokenizer or not self.model:
             raise RuntimeError("Model or tokenizer not loaded. Call _load_model first.")
         
         # Concatenate title and abstract for SPECTER2
         # Assuming texts are already processed as title + [SEP] + abstract
-        inputs = self.tokenizer(texts, padding=True, truncation=True, 
-                                return_tensors="pt", return_token_type_ids=False, max_length=512)
-        
-        # Ensure inputs are on the correct device if using GPU
-        # For simplicity, keeping it on CPU for now as FAISS is CPU-based
-        
-        output = self.model(**inputs)
-        # Take the first token (CLS token) in the batch as the embedding
-        embeddings = output.last_hidden_state[:, 0, :].detach().numpy()
+        if self.batching == "naive":
+            return self._encode_naive(texts)
+        return self._encode_bucketed(texts)
+
+    def _forward(self, inputs) -> np.ndarray:
+        # CPU only (FAISS is CPU-based); the backend returns the CLS token embedding per row
+        return self.backend.encode(inputs)
+
+    def _encode_bucketed(self, texts: list[str]) -> np.ndarray:
+        """Tokenize once, run length buckets under the token budget, write rows back in input order."""
+        encoded = self.tokenizer(texts, truncation=True, max_length=Config.EMBEDDING_MAX_LENGTH,
+                                 return_token_type_ids=False)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        embeddings = np.empty((len(texts), self.dimension), dtype='float32')
+        for bucket in length_buckets(lengths, self.token_budget, self.max_batch_size):
+            features = [{key: encoded[key][i] for key in encoded.keys()} for i in bucket]
+            inputs = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+            embeddings[bucket] = self._forward(inputs)
         return embeddings
 
-    def get_embedding(self, text: str) -> np.ndarray:
+    def _encode_naive(self, texts: list[str]) -> np.ndarray:
+        """Fixed-size batches in input order, each padded to its longest text (the pre-bucketing behaviour)."""
+        batches = []
+        for start in range(0, len(texts), self.max_batch_size):
+            inputs = self.tokenizer(texts[start:start + self.max_batch_size], padding=True, truncation=True,
+                                    return_tensors="pt", return_token_type_ids=False,
+                                    max_length=Config.EMBEDDING_MAX_LENGTH)
+            batches.append(self._forward(inputs))
+        return np.concatenate(batches)
+
+    def get_embedding(self, text: str, use_cache: bool = True) -> np.ndarray:
         if not text:
             return np.array([]) # Return empty numpy array for empty text
-        return self._get_model_output([text])[0] # Get the first embedding from the batch
+        return self.get_embeddings([text], use_cache=use_cache)[0] # Get the first embedding from the batch
 
-    def get_embeddings(self, texts: list[str]) -> np.ndarray:
+    def get_embeddings(self, texts: list[str], use_cache: bool = True) -> np.ndarray:
+        """use_cache=False bypasses the persistent cache: free-text queries would grow it without bound
+        (they are cached in memory by query_cache instead)."""
         if not texts:
             return np.array([]) # Return empty numpy array for empty text
-        return self._get_model_output(texts) 
\ No newline at end of file
+        if self.cache is None or not use_cache:
+            return self._get_model_output(texts)
+
+        keys = [cache_key(self.cache_model_id, self.model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+        # Encode each unseen text once, even if it repeats within the batch
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            encoded = self._get_model_output(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), encoded))
+            self.cache.put_many(new_vectors)
+            cached.update(new_vectors)
+        return np.stack([cached[key] for key in keys]).astype('float32', copy=False)
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {} 
\ No newline at end of file
@@ -2,90 +2,628 @@ import faiss
 import numpy as np
 import logging
 import os
-from typing import List, Tuple
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
 from .paper_database import PaperDatabase
 from .embedding_manager import EmbeddingManager
+from .model_registry import get_embedding_manager
+from .query_cache import get_query_cache, query_model_key
+from .index_bundle import IndexBundle
+from .index_factory import (INDEX_FLAT, RESCORE_FACTOR, apply_search_params, build_index, create_index, is_reduced,
+                            select_index_spec, supports_reconstruct, supports_remove)
+from .index_filters import PaperFacets, search_parameters
+from .rank_fusion import reciprocal_rank_fusion
+from .config import Config
 
 logger = logging.getLogger(__name__)
 
-class FAISSManager:
-    def __init__(self, db_path: str = "arxiv_papers.db", index_path: str = "arxiv_papers.faiss"):
+# Rebuild on startup once this share of an HNSW index is dead (removed or re-embedded) vectors
+MAX_TOMBSTONE_RATIO = 0.1
+# Tombstone over-fetch per search is capped at this multiple of k; short rows are retried with a larger k
+MAX_OVERFETCH = 8
+# Minimum seconds between checks for a newer published index generation
+RELOAD_CHECK_INTERVAL = 2.0
+
+def paper_id_to_faiss_id(paper_id: str) -> int:
+    """Stable non-negative int64 FAISS id derived from the paper_id."""
+    digest = hashlib.blake2b(paper_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') & 0x7FFFFFFFFFFFFFFF
+
+def versioned_faiss_id(paper_id: str, version: int) -> int:
+    """FAISS id for a paper re-added to an index that keeps dead vectors (HNSW); version 0 is the stable id."""
+    return paper_id_to_faiss_id(paper_id if version == 0 else f"{paper_id}\x00{version}")
+
+def shard_key(platform: Optional[str]) -> str:
+    """Platform shard a paper belongs to; NULL platform follows the Paper.platform default."""
+    return (platform or "arxiv").lower()
+
+def _paper_field(paper: Any, name: str):
+    # Ingest paths hand us either ORM Paper objects or the crawler dicts
+    if isinstance(paper, dict):
+        return paper.get(name)
+    return getattr(paper, name, None)
+
+class ReadWriteLock:
+    """Shared read / exclusive write lock. Not reentrant; waiting writers block new readers.
+
+    faiss searches are const and run in parallel, while add/remove mutate the
+    index and need it to themselves.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+class IndexSnapshot:
+    """One generation of the index and its id map / facets.
+
+    Searches take a reference to the current snapshot and finish on it even if a
+    rebuild or reload publishes a new one meanwhile. Searches share the snapshot's
+    read lock; incremental adds/removes mutate it under the write lock.
+    """
+
+    def __init__(self, index: Optional[faiss.Index] = None, index_spec: Optional[dict] = None,
+                 paper_ids: Optional[Dict[int, str]] = None, facets: Optional[PaperFacets] = None,
+                 tombstones: int = 0, generation: int = 0):
+        self.index = index
+        self.index_spec = index_spec or {"type": INDEX_FLAT}
+        self.paper_ids = paper_ids if paper_ids is not None else {} # To map FAISS ids to paper IDs
+        self.faiss_ids = {paper_id: faiss_id for faiss_id, paper_id in self.paper_ids.items()} # live id per paper
+        self.facets = facets or PaperFacets() # platform/category/date id sets for filtered search
+        self.tombstones = tombstones # dead vectors left in indexes that cannot remove_ids (HNSW)
+        self.generation = generation # published bundle generation this snapshot matches
+        self.lock = ReadWriteLock()
+
+class VectorSearchMixin:
+    """Text / batch search on top of search_vectors, shared by FAISSManager and ShardedFAISSManager.
+
+    Needs embedding_manager, dimension, ntotal, embed_texts, get_vectors and search_vectors.
+    """
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """(Q, d) query vectors; repeated queries come from the query embedding cache, the rest in one forward pass."""
+        cache = get_query_cache()
+        model_key = query_model_key(self.embedding_manager)
+        found = cache.get_many(model_key, queries)
+        missing = [q for q in dict.fromkeys(queries) if q not in found]
+        if missing:
+            embeddings = self.embed_texts(missing, use_cache=False)
+            if embeddings.ndim != 2 or embeddings.shape != (len(missing), self.dimension):
+                return np.empty((0, self.dimension), dtype='float32')
+            new_vectors = dict(zip(missing, embeddings))
+            cache.put_many(model_key, new_vectors)
+            found.update(new_vectors)
+        return np.stack([found[q] for q in queries]).astype('float32', copy=False)
+
+    def search_papers(self, query_text: str, k: int = 10, platform=None, category=None,
+                      start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Tuple[str, float]]:
+        """Top-k papers for query_text, optionally restricted by platform / category / updated_date window.
+
+        Filters are applied inside the FAISS scan via an IDSelector built from the precomputed facet id sets.
+        """
+        if self.ntotal == 0:
+            logger.warning("FAISS index not available. Cannot perform search.")
+            return []
+
+        query_embedding = self.embed_queries([query_text]) if query_text else np.empty((0, self.dimension))
+        if query_embedding.shape[0] == 0:
+            logger.warning("Failed to generate embedding for query text.")
+            return []
+
+        return self.search_vectors(query_embedding, k, platform=platform, category=category,
+                                   start_date=start_date, end_date=end_date)[0]
+
+    def search_batch(self, queries: Optional[List[str]] = None, paper_ids: Optional[List[str]] = None, k: int = 10,
+                     platform=None, category=None, start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None, fuse: bool = False) -> Dict[str, Any]:
+        """Top-k papers for many query texts and/or seed paper ids with a single index.search.
+
+        Query texts are embedded in one forward pass, seed papers use their stored
+        embeddings, and the (Q, d) matrix is searched at once. Seed papers are left out
+        of the results. Returns {"queries": [...], "results": [[(paper_id, distance), ...] per query],
+        "fused": [(paper_id, rrf_score), ...] or None}; unknown seeds get an empty result list.
+        """
+        queries = [q for q in (queries or []) if q]
+        paper_ids = list(paper_ids or [])
+        labels = queries + paper_ids
+        empty = {"queries": labels, "results": [[] for _ in labels], "fused": [] if fuse else None}
+        if self.ntotal == 0 or not labels:
+            if self.ntotal == 0:
+                logger.warning("FAISS index not available. Cannot perform search.")
+            return empty
+
+        vectors = np.zeros((len(labels), self.dimension), dtype='float32')
+        valid = np.zeros(len(labels), dtype=bool)
+        if queries:
+            embeddings = self.embed_queries(queries)
+            if embeddings.ndim == 2 and embeddings.shape == (len(queries), self.dimension):
+                vectors[:len(queries)] = embeddings
+                valid[:len(queries)] = True
+            else:
+                logger.warning("Failed to generate embeddings for batch query texts.")
+        seed_vectors = self.get_vectors(paper_ids)
+        for offset, paper_id in enumerate(paper_ids, start=len(queries)):
+            if paper_id in seed_vectors:
+                vectors[offset] = seed_vectors[paper_id]
+                valid[offset] = True
+        if not valid.any():
+            return empty
+
+        exclude = set(paper_ids)
+        rows = self.search_vectors(vectors[valid], k + len(exclude), platform=platform, category=category,
+                                   start_date=start_date, end_date=end_date)
+        results = [[] for _ in labels]
+        for i, row in zip(np.flatnonzero(valid), rows):
+            results[i] = [(pid, distance) for pid, distance in row if pid not in exclude][:k]
+
+        fused = None
+        if fuse:
+            fused = reciprocal_rank_fusion([[pid for pid, _ in row] for row in results], limit=k)
+        return {"queries": labels, "results": results, "fused": fused}
+
+class FAISSManager(VectorSearchMixin):
+    def __init__(self, db_path: str = "arxiv_papers.db", index_path: str = "arxiv_papers.faiss",
+                 index_type: str = Config.VECTOR_INDEX_TYPE, target_recall: float = Config.VECTOR_INDEX_TARGET_RECALL,
+                 read_only: bool = Config.VECTOR_INDEX_MMAP, embedding_manager: Optional[EmbeddingManager] = None,
+                 platform: Optional[str] = None, pca_dim: Optional[int] = Config.VECTOR_INDEX_PCA_DIM,
+                 sq8: bool = Config.VECTOR_INDEX_SQ8, persist_interval: float = Config.VECTOR_INDEX_PERSIST_INTERVAL):
         self.db_path = db_path
         self.index_path = index_path
+        self.index_type = index_type
+        self.target_recall = target_recall
+        self.pca_dim = pca_dim # reduced first-stage tier; results are re-scored with exact vectors
+        self.sq8 = sq8
+        self.read_only = read_only # mmap the saved bundle; incremental updates are left to a writer process
+        self.platform = shard_key(platform) if platform else None # set when this index is one platform shard
         self.paper_db = PaperDatabase()
-        self.embedding_manager = EmbeddingManager()
-        self.index = None
-        self.paper_ids = [] # To map FAISS index to paper IDs
+        self.embedding_manager = embedding_manager or get_embedding_manager(pin=True) # one model per process via the registry
+        self.dimension = self.embedding_manager.dimension
+        self.snapshot = IndexSnapshot()
+        self.bundle = IndexBundle(index_path)
+        self._lock = threading.RLock() # serializes writers (incremental updates, snapshot swaps)
+        self._build_lock = threading.Lock() # one rebuild at a time
+        self._build_journal: Optional[List[Tuple[str, list]]] = None # updates made while a rebuild runs
+        self._next_reload_check = 0.0
+        # Incremental updates mark the snapshot dirty; a timer publishes them at most once per persist_interval
+        self.persist_interval = persist_interval
+        self._dirty = False
+        self._persist_timer: Optional[threading.Timer] = None
         self._load_or_build_index()
 
+    # Read access to the live snapshot; grab self.snapshot once when several fields must agree
+    @property
+    def index(self) -> Optional[faiss.Index]:
+        return self.snapshot.index
+
+    @property
+    def paper_ids(self) -> Dict[int, str]:
+        return self.snapshot.paper_ids
+
+    @property
+    def generation(self) -> int:
+        return self.snapshot.generation
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.snapshot.paper_ids)
+
     def _load_or_build_index(self):
-        if os.path.exists(self.index_path):
-            logger.info(f"Loading FAISS index from {self.index_path}")
-            self.index = faiss.read_index(self.index_path)
-            # Load paper_ids alongside index (assuming it's saved separately)
-            # For simplicity, let's just rebuild for now if no separate paper_ids file.
-            # In a real scenario, paper_ids should be persisted with the index.
-            logger.warning("FAISS index loaded, but paper_ids are NOT loaded. Rebuilding index to ensure consistency.")
-            self._build_index()
+        checksum = self.paper_db.get_index_checksum(self.platform)
+        if self.bundle.matches(checksum):
+            try:
+                self._swap(self._load_bundle())
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load FAISS index bundle from {self.index_path}, rebuilding: {e}")
+        elif self.bundle.exists() and self.read_only:
+            # Read-only workers never rebuild a shared bundle; serve it until a writer publishes a fresh one
+            logger.warning(f"FAISS index bundle at {self.index_path} is stale (DB checksum {checksum}); serving it read-only.")
+            self._swap(self._load_bundle())
+            return
+        elif self.bundle.exists():
+            logger.info(f"FAISS index bundle at {self.index_path} is stale (DB checksum {checksum}). Rebuilding.")
         else:
             logger.info(f"FAISS index not found. Building new index at {self.index_path}")
-            self._build_index()
+        self._rebuild_and_publish(checksum)
+
+    def _load_bundle(self) -> IndexSnapshot:
+        index, id_map, facets, manifest = self.bundle.load(mmap=self.read_only)
+        tombstones = manifest.get('tombstones', 0)
+        if tombstones > MAX_TOMBSTONE_RATIO * max(index.ntotal, 1) and not self.read_only:
+            raise ValueError(f"{tombstones} tombstoned vectors out of {index.ntotal}")
+        index_spec = manifest.get('index_spec', {"type": INDEX_FLAT})
+        apply_search_params(index, index_spec)
+        snapshot = IndexSnapshot(index, index_spec, {faiss_id: paper_id for paper_id, faiss_id in id_map.items()},
+                                 PaperFacets(facets), tombstones, manifest['generation'])
+        logger.info(f"Loaded FAISS index generation {snapshot.generation} from {self.index_path} "
+                    f"({len(snapshot.paper_ids)} papers, built {manifest.get('created_at')}, mmap={self.read_only})")
+        return snapshot
+
+    def _swap(self, snapshot: IndexSnapshot):
+        # A plain reference assignment: in-flight searches keep the snapshot they already hold
+        with self._lock:
+            self.snapshot = snapshot
 
-    def _build_index(self):
-        papers = self.paper_db.get_papers_by_date_range(datetime.min, datetime.max, limit=None) # Get all papers
-        embeddings = []
-        self.paper_ids = []
+    def refresh_if_stale(self) -> bool:
+        """Swap in a newer generation published by another process. Cheap enough to call per request."""
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return False
+        self._next_reload_check = now + RELOAD_CHECK_INTERVAL
 
+        published = self.bundle.current_generation()
+        if published is None or published <= self.snapshot.generation:
+            return False
+        try:
+            snapshot = self._load_bundle()
+        except Exception as e:
+            logger.warning(f"Failed to load FAISS index generation {published}, keeping generation {self.snapshot.generation}: {e}")
+            return False
+        with self._lock:
+            if snapshot.generation <= self.snapshot.generation:
+                return False
+            self.snapshot = snapshot
+        logger.info(f"FAISS index hot-reloaded to generation {snapshot.generation}")
+        return True
+
+    def _collect_vectors(self, papers: Iterable[Any]) -> Tuple[List[Any], List[str], np.ndarray]:
+        kept = []
+        paper_ids = []
+        vectors = []
         for paper in papers:
-            if paper.embedding is not None:
-                embeddings.append(paper.embedding)
-                self.paper_ids.append(paper.paper_id)
-        
-        if not embeddings:
+            embedding = _paper_field(paper, 'embedding')
+            if embedding is None or len(embedding) != self.dimension:
+                continue
+            kept.append(paper)
+            paper_ids.append(_paper_field(paper, 'paper_id'))
+            vectors.append(embedding)
+        if not vectors:
+            return [], [], np.empty((0, self.dimension), dtype='float32')
+        return kept, paper_ids, np.asarray(vectors, dtype='float32')
+
+    def _add_facets(self, snapshot: IndexSnapshot, papers: List[Any], faiss_ids: np.ndarray):
+        for paper, faiss_id in zip(papers, faiss_ids.tolist()):
+            snapshot.facets.add(faiss_id, _paper_field(paper, 'platform'), _paper_field(paper, 'categories'),
+                                _paper_field(paper, 'updated_date'))
+
+    def _build_snapshot(self) -> IndexSnapshot:
+        """Build a complete snapshot from the DB without touching the live one."""
+        # Embedding BLOBs come back as one matrix; no ORM objects are built for the corpus
+        papers, embeddings = self.paper_db.load_embedding_matrix(self.dimension, platform=self.platform)
+        paper_ids = [paper['paper_id'] for paper in papers]
+        if not paper_ids:
             logger.warning("No embeddings found in the database to build FAISS index.")
-            self.index = None
-            return
+            return IndexSnapshot()
 
-        embeddings = np.array(embeddings).astype('float32')
-        dimension = embeddings.shape[1]
+        faiss_ids = np.array([paper_id_to_faiss_id(pid) for pid in paper_ids], dtype='int64')
+        index, index_spec = build_index(embeddings, faiss_ids, metric="l2",
+                                        target_recall=self.target_recall, index_type=self.index_type,
+                                        pca_dim=self.pca_dim, sq8=self.sq8)
+        snapshot = IndexSnapshot(index, index_spec, dict(zip(faiss_ids.tolist(), paper_ids)))
+        self._add_facets(snapshot, papers, faiss_ids)
+        return snapshot
 
-        self.index = faiss.IndexFlatL2(dimension) # Using IndexFlatL2 for simplicity (exact search)
-        # For IVF-PQ (approximate search), more setup is needed:
-        # nlist = 100 # Number of clusters
-        # m = 8 # Number of bytes per vector
-        # self.index = faiss.IndexIVFPQ(index_factory_method(dimension, nlist, m), dimension, nlist, m)
-        # self.index.train(embeddings)
+    def _rebuild_and_publish(self, checksum: dict = None):
+        with self._build_lock:
+            # Take the checksum before reading so papers saved mid-build make the bundle stale, not wrong.
+            if checksum is None:
+                checksum = self.paper_db.get_index_checksum(self.platform)
+            with self._lock:
+                self._build_journal = []
+            try:
+                snapshot = self._build_snapshot()
+            except Exception:
+                with self._lock:
+                    self._build_journal = None
+                raise
 
-        self.index.add(embeddings)
-        faiss.write_index(self.index, self.index_path)
-        logger.info(f"FAISS index built and saved to {self.index_path} with {len(self.paper_ids)} papers.")
+            with self._lock:
+                # Replay updates that reached the old snapshot while we were building
+                journal, self._build_journal = self._build_journal, None
+                for op, args in journal:
+                    if op == "add":
+                        self._apply_add(snapshot, *args)
+                    else:
+                        self._apply_remove(snapshot, args)
+                if snapshot.index is None:
+                    snapshot.generation = self.snapshot.generation # nothing published; don't hot-reload the old bundle
+                else:
+                    self._save_bundle(snapshot, None if journal else checksum)
+                    self._dirty = False # the full bundle includes every update made so far
+                    if self.read_only:
+                        # Serve the shared mmap of what we just wrote instead of the private in-memory copy
+                        try:
+                            snapshot = self._load_bundle()
+                        except Exception as e:
+                            logger.warning(f"Failed to mmap FAISS index generation {snapshot.generation}, "
+                                           f"serving the in-memory copy: {e}")
+                self.snapshot = snapshot
+        logger.info(f"FAISS index built and published as generation {snapshot.generation} with {len(snapshot.paper_ids)} papers.")
 
-    def search_papers(self, query_text: str, k: int = 10) -> List[Tuple[str, float]]:
-        if self.index is None:
-            logger.warning("FAISS index not available. Cannot perform search.")
-            return []
+    def _save_bundle(self, snapshot: IndexSnapshot, checksum: dict = None):
+        if checksum is None:
+            checksum = self.paper_db.get_index_checksum(self.platform)
+        id_map = {paper_id: faiss_id for faiss_id, paper_id in snapshot.paper_ids.items()}
+        manifest = self.bundle.save(snapshot.index, id_map, snapshot.facets.to_dict(), checksum,
+                                    index_spec=snapshot.index_spec, tombstones=snapshot.tombstones)
+        snapshot.generation = manifest['generation']
 
-        query_embedding = self.embedding_manager.get_embedding(query_text)
-        if query_embedding is None or query_embedding.size == 0:
-            logger.warning("Failed to generate embedding for query text.")
-            return []
+    def add_papers(self, papers: Iterable[Any], persist: bool = True) -> int:
+        """Add or re-embed papers in the live index. Cost is proportional to len(papers).
+
+        With persist=True the change is published with the next debounced bundle write (see flush).
+        """
+        if self.read_only:
+            logger.debug("FAISS index is read-only (mmap); skipping incremental add.")
+            return 0
+        if self.platform:
+            papers = [paper for paper in papers if shard_key(_paper_field(paper, 'platform')) == self.platform]
+        papers, paper_ids, embeddings = self._collect_vectors(papers)
+        if not paper_ids:
+            return 0
+
+        with self._lock:
+            snapshot = self.snapshot
+            stale = self._apply_add(snapshot, papers, paper_ids, embeddings)
+            if self._build_journal is not None:
+                self._build_journal.append(("add", (papers, paper_ids, embeddings)))
+            if persist:
+                self._schedule_persist()
+        logger.info(f"FAISS index updated incrementally: {len(paper_ids)} papers added ({stale} replaced).")
+        return len(paper_ids)
+
+    def _apply_add(self, snapshot: IndexSnapshot, papers: List[Any], paper_ids: List[str],
+                   embeddings: np.ndarray) -> int:
+        with snapshot.lock.write():
+            if snapshot.index is None:
+                # An empty corpus always starts flat; the next rebuild picks the tier for the real size
+                snapshot.index_spec = select_index_spec(0, self.dimension, self.target_recall)
+                snapshot.tombstones = 0
+                snapshot.index = create_index(snapshot.index_spec, self.dimension)
+            # Drop stale vectors first so re-embedded papers don't end up indexed twice
+            stale = [snapshot.faiss_ids[pid] for pid in dict.fromkeys(paper_ids) if pid in snapshot.faiss_ids]
+            if stale:
+                self._drop_ids(snapshot, stale)
+            # Dead HNSW vectors keep their id in the graph, so once there are any, new vectors get an id
+            # salted with the tombstone count (it grows with every dead vector, so the id was never used)
+            version = 0 if supports_remove(snapshot.index_spec) else snapshot.tombstones
+            faiss_ids = np.array([versioned_faiss_id(pid, version) for pid in paper_ids], dtype='int64')
+            snapshot.index.add_with_ids(embeddings, faiss_ids)
+            snapshot.paper_ids.update(zip(faiss_ids.tolist(), paper_ids))
+            snapshot.faiss_ids.update(zip(paper_ids, faiss_ids.tolist()))
+            self._add_facets(snapshot, papers, faiss_ids)
+        return len(stale)
+
+    def remove_papers(self, paper_ids: Iterable[str], persist: bool = True) -> int:
+        """Remove papers from the live index by paper_id."""
+        if self.read_only:
+            logger.debug("FAISS index is read-only (mmap); skipping incremental remove.")
+            return 0
+        paper_ids = list(paper_ids)
+        with self._lock:
+            snapshot = self.snapshot
+            if self._build_journal is not None:
+                self._build_journal.append(("remove", paper_ids))
+            removed = self._apply_remove(snapshot, paper_ids)
+            if removed and persist:
+                self._schedule_persist()
+        if removed:
+            logger.info(f"FAISS index updated incrementally: {removed} papers removed.")
+        return removed
 
-        query_embedding = np.array([query_embedding]).astype('float32')
+    def _apply_remove(self, snapshot: IndexSnapshot, paper_ids: List[str]) -> int:
+        with snapshot.lock.write():
+            faiss_ids = [snapshot.faiss_ids[pid] for pid in dict.fromkeys(paper_ids) if pid in snapshot.faiss_ids]
+            if not faiss_ids or snapshot.index is None:
+                return 0
+            return self._drop_ids(snapshot, faiss_ids)
 
-        distances, indices = self.index.search(query_embedding, k)
-        
+    def _drop_ids(self, snapshot: IndexSnapshot, faiss_ids: List[int]) -> int:
+        removed = self._remove_ids(snapshot, faiss_ids)
+        snapshot.facets.remove(faiss_ids)
+        for fid in faiss_ids:
+            snapshot.faiss_ids.pop(snapshot.paper_ids.pop(fid), None)
+        return removed
+
+    def _remove_ids(self, snapshot: IndexSnapshot, faiss_ids: List[int]) -> int:
+        if supports_remove(snapshot.index_spec):
+            return snapshot.index.remove_ids(np.array(faiss_ids, dtype='int64'))
+        # HNSW: leave the vector in the graph; search drops ids missing from paper_ids and duplicates
+        snapshot.tombstones += len(faiss_ids)
+        return len(faiss_ids)
+
+    def _schedule_persist(self):
+        # Writing the bundle costs O(corpus) and makes every worker reload it, so ingest batches share one write
+        with self._lock:
+            self._dirty = True
+            if self.persist_interval <= 0:
+                self.flush()
+            elif self._persist_timer is None:
+                self._persist_timer = threading.Timer(self.persist_interval, self._flush_in_background)
+                self._persist_timer.daemon = True
+                self._persist_timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to persist FAISS index updates: {e}", exc_info=True)
+
+    def flush(self) -> bool:
+        """Publish pending incremental updates as a new generation now. Returns False if there were none."""
+        with self._lock:
+            timer, self._persist_timer = self._persist_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._dirty or self.snapshot.index is None:
+                return False
+            self._dirty = False
+            self._save_bundle(self.snapshot)
+        return True
+
+    # PaperDatabase listener hooks (see paper_database.add_paper_listener)
+    def on_papers_saved(self, papers: List[Any]):
+        self.add_papers(papers)
+
+    def on_papers_deleted(self, paper_ids: List[str]):
+        self.remove_papers(paper_ids)
+
+    def contains(self, paper_id: str) -> bool:
+        return paper_id in self.snapshot.faiss_ids
+
+    def embed_texts(self, texts: List[str], use_cache: bool = True) -> np.ndarray:
+        """Embed texts with this collection's model in one forward pass, shape (len(texts), dimension)."""
+        if not texts:
+            return np.empty((0, self.dimension), dtype='float32')
+        return np.asarray(self.embedding_manager.get_embeddings(texts, use_cache=use_cache), dtype='float32')
+
+    def get_vectors(self, paper_ids: Iterable[str], fallback_db: bool = True) -> Dict[str, np.ndarray]:
+        """Stored vectors by paper_id, read back from the index where it keeps them exactly, else from the DB."""
+        paper_ids = list(paper_ids)
+        snapshot = self.snapshot
+        vectors = {}
+        if snapshot.index is not None and supports_reconstruct(snapshot.index_spec):
+            with snapshot.lock.read():
+                for paper_id in paper_ids:
+                    faiss_id = snapshot.faiss_ids.get(paper_id)
+                    if faiss_id is not None:
+                        vectors[paper_id] = snapshot.index.reconstruct(faiss_id)
+        missing = [paper_id for paper_id in paper_ids if paper_id not in vectors] if fallback_db else []
+        if missing:
+            vectors.update(self.paper_db.get_embeddings(missing, self.dimension))
+        return vectors
+
+    def search_vectors(self, vectors: np.ndarray, k: int = 10, within: Optional[Iterable[str]] = None,
+                       **filters) -> List[List[Tuple[str, float]]]:
+        """Per-row top-k (paper_id, distance) for precomputed query vectors, optionally only among paper_ids in within."""
+        snapshot = self.snapshot
+        if snapshot.index is None:
+            return [[] for _ in range(len(vectors))]
+        return self._search_vectors(snapshot, np.ascontiguousarray(vectors, dtype='float32'), k, within=within, **filters)
+
+    def _search_vectors(self, snapshot: IndexSnapshot, vectors: np.ndarray, k: int, platform=None, category=None,
+                        start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        within: Optional[Iterable[str]] = None) -> List[List[Tuple[str, float]]]:
+        """One index.search over all rows of vectors; per-row top-k (paper_id, distance)."""
+        reduced = is_reduced(snapshot.index_spec)
+        limit = k * RESCORE_FACTOR if reduced else k # reduced tier: over-fetch, then exact re-score
+        with snapshot.lock.read(): # concurrent searches share the snapshot; only add/remove exclude them
+            allowed_ids = snapshot.facets.select(platform, category, start_date, end_date)
+            if within is not None:
+                scope = np.array([snapshot.faiss_ids[pid] for pid in within if pid in snapshot.faiss_ids], dtype='int64')
+                allowed_ids = scope if allowed_ids is None else np.intersect1d(allowed_ids, scope)
+            if allowed_ids is not None and allowed_ids.size == 0:
+                return [[] for _ in range(len(vectors))]
+            params = None if allowed_ids is None else search_parameters(snapshot.index_spec, allowed_ids,
+                                                                        snapshot.index.ntotal)
+            # Enough candidates for any row even if every dead vector ranks first, but only fetched on demand:
+            # the first pass over-fetches at most MAX_OVERFETCH * limit
+            candidates = snapshot.index.ntotal if allowed_ids is None else allowed_ids.size
+            k_needed = min(limit + snapshot.tombstones, max(candidates, limit))
+            k_search = min(k_needed, limit * MAX_OVERFETCH)
+            rows = [None] * len(vectors)
+            pending = list(range(len(vectors)))
+            while pending:
+                distances, ids = snapshot.index.search(vectors[pending], k_search, params=params)
+                short = []
+                # Resolve ids before releasing the lock: a re-embed may retire an id the search just returned
+                for i, row_ids, row_distances in zip(pending, ids, distances):
+                    rows[i] = self._resolve_row(snapshot.paper_ids, row_ids, row_distances, limit)
+                    if len(rows[i]) < limit and row_ids[-1] != -1:
+                        short.append(i) # dead vectors crowded out live ones; the index has more
+                if k_search >= k_needed:
+                    break
+                pending = short
+                k_search = min(k_search * MAX_OVERFETCH, k_needed)
+        return self._rescore(vectors, rows, k) if reduced else rows
+
+    @staticmethod
+    def _resolve_row(paper_ids: Dict[int, str], row_ids: np.ndarray, row_distances: np.ndarray,
+                     limit: int) -> List[Tuple[str, float]]:
         results = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.paper_ids):
-                results.append((self.paper_ids[idx], distances[0][i]))
-            else:
-                logger.warning(f"Invalid index {idx} found in FAISS search results. Skipping.")
+        seen = set()
+        for faiss_id, distance in zip(row_ids, row_distances):
+            if faiss_id == -1:
+                continue # fewer than k vectors in the index
+            paper_id = paper_ids.get(int(faiss_id))
+            if paper_id is None or paper_id in seen:
+                continue # tombstoned or superseded vector
+            seen.add(paper_id)
+            results.append((paper_id, distance))
+            if len(results) >= limit:
+                break
         return results
 
-    def rebuild_index(self):
+    def _rescore(self, vectors: np.ndarray, rows: List[List[Tuple[str, float]]], k: int) -> List[List[Tuple[str, float]]]:
+        """Re-rank first-stage candidates by exact L2 distance to the full-precision stored vectors."""
+        exact = self.paper_db.get_embeddings(list({pid for row in rows for pid, _ in row}), self.dimension)
+        rescored = []
+        for query, row in zip(vectors, rows):
+            candidates = [pid for pid, _ in row if pid in exact]
+            if not candidates:
+                rescored.append(row[:k])
+                continue
+            matrix = np.stack([exact[pid] for pid in candidates])
+            distances = ((matrix - query) ** 2).sum(axis=1)
+            order = np.argsort(distances)[:k]
+            rescored.append([(candidates[i], distances[i]) for i in order])
+        return rescored
+
+    def rebuild_index(self, background: bool = False) -> bool:
+        """Build a new generation and swap it in; searches keep using the old one until then.
+
+        With background=True the build runs in a daemon thread and this returns immediately.
+        Returns False if a rebuild is already running.
+        """
+        if self._build_lock.locked():
+            logger.info("FAISS index rebuild already in progress.")
+            return False
         logger.info("Rebuilding FAISS index...")
-        self._build_index()
+        if not background:
+            self._rebuild_and_publish()
+            return True
+
+        def run():
+            try:
+                self._rebuild_and_publish()
+            except Exception as e:
+                logger.error(f"Background FAISS index rebuild failed: {e}", exc_info=True)
 
-from datetime import datetime 
\ No newline at end of file
+        threading.Thread(target=run, name="faiss-rebuild", daemon=True).start()
+        return True
@@ -0,0 +1,69 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .config import Config
+from .faiss_manager import FAISSManager
+from .paper_database import PaperDatabase
+from .rank_fusion import RRF_K, reciprocal_rank_fusion
+
+logger = logging.getLogger(__name__)
+
+# Lexical and semantic stages run side by side; both mostly wait on SQLite / FAISS / torch with the GIL released
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def hybrid_search(query: str, faiss_manager: FAISSManager, paper_db: Optional[PaperDatabase] = None, k: int = 10,
+                  lexical_weight: float = Config.HYBRID_LEXICAL_WEIGHT, semantic_weight: float = Config.HYBRID_SEMANTIC_WEIGHT,
+                  candidates: int = Config.HYBRID_CANDIDATES, rrf_k: int = RRF_K, platform=None, category=None,
+                  start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict[str, Any]:
+    """BM25 full-text and FAISS retrieval run concurrently, fused with weighted reciprocal-rank fusion.
+
+    Returns {"results": [{"paper_id", "score", "lexical_rank", "semantic_rank"}, ...],
+    "timings_ms": {"lexical", "semantic", "fusion", "total"}}. A rank is None when the
+    paper was not among that stage's candidates; a weight of 0 skips the stage.
+    """
+    paper_db = paper_db or faiss_manager.paper_db
+    filters = dict(platform=platform, category=category, start_date=start_date, end_date=end_date)
+    start = time.perf_counter()
+
+    lexical_future = semantic_future = None
+    if lexical_weight > 0:
+        lexical_future = _executor.submit(_timed, paper_db.search_papers_bm25, query, limit=candidates, **filters)
+    if semantic_weight > 0:
+        semantic_future = _executor.submit(_timed, faiss_manager.search_papers, query, k=candidates, **filters)
+
+    lexical, lexical_ms = lexical_future.result() if lexical_future else ([], 0.0)
+    semantic, semantic_ms = semantic_future.result() if semantic_future else ([], 0.0)
+
+    fusion_start = time.perf_counter()
+    lexical_ids = [paper_id for paper_id, _ in lexical]
+    semantic_ids = [paper_id for paper_id, _ in semantic]
+    fused = reciprocal_rank_fusion([lexical_ids, semantic_ids], weights=[lexical_weight, semantic_weight],
+                                   k=rrf_k, limit=k)
+    lexical_rank = {paper_id: rank for rank, paper_id in enumerate(lexical_ids, start=1)}
+    semantic_rank = {paper_id: rank for rank, paper_id in enumerate(semantic_ids, start=1)}
+    results = [{
+        "paper_id": paper_id,
+        "score": score,
+        "lexical_rank": lexical_rank.get(paper_id),
+        "semantic_rank": semantic_rank.get(paper_id),
+    } for paper_id, score in fused]
+    fusion_ms = (time.perf_counter() - fusion_start) * 1000
+
+    timings = {
+        "lexical": round(lexical_ms, 2),
+        "semantic": round(semantic_ms, 2),
+        "fusion": round(fusion_ms, 2),
+        "total": round((time.perf_counter() - start) * 1000, 2),
+    }
+    logger.debug(f"Hybrid search '{query[:50]}': {len(lexical)} lexical + {len(semantic)} semantic candidates, {timings}")
+    return {"results": results, "timings_ms": timings}
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import faiss
+
+from .index_factory import INDEX_FLAT, INDEX_IVFPQ
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout of the bundle changes; older bundles are rebuilt.
+BUNDLE_FORMAT_VERSION = 4
+
+# Read-only memory-mapped load: index data stays in the OS page cache and is
+# shared by every process (uvicorn worker) that maps the same file.
+# IO_FLAG_MMAP maps IVF inverted lists; IO_FLAG_MMAP_IFC maps flat/HNSW storage.
+# The two cannot be combined: read_index then fails on IVF indexes.
+IVF_MMAP_READ_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+MMAP_READ_FLAGS = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+
+def mmap_read_flags(index_spec: dict) -> int:
+    """faiss.read_index io_flags for a read-only mmap load of an index built from index_spec."""
+    return IVF_MMAP_READ_FLAGS if index_spec.get("type", INDEX_FLAT) == INDEX_IVFPQ else MMAP_READ_FLAGS
+
+# Older generations kept on disk so readers still mapping them are not cut off
+KEEP_GENERATIONS = 3
+
+
+class GenerationStore:
+    """Generation-numbered snapshot directories under root_dir with an atomically published pointer.
+
+    ``root_dir/CURRENT`` holds the number of the published ``gen-NNNNNN`` directory.
+    A snapshot is written to a temporary directory, renamed into place and only then
+    published by replacing CURRENT, so readers never see a partially written snapshot.
+    """
+
+    def __init__(self, root_dir: str, keep: int = KEEP_GENERATIONS):
+        self.root_dir = root_dir
+        self.keep = keep
+        self.current_path = os.path.join(root_dir, "CURRENT")
+
+    def path(self, generation: int) -> str:
+        return os.path.join(self.root_dir, f"gen-{generation:06d}")
+
+    def current_generation(self) -> Optional[int]:
+        try:
+            with open(self.current_path, 'r', encoding='utf-8') as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, write_files: Callable[[str], None]) -> int:
+        """Call write_files(tmp_dir), then publish tmp_dir as the next generation. Returns its number."""
+        os.makedirs(self.root_dir, exist_ok=True)
+        tmp_dir = os.path.join(self.root_dir, f"tmp-{os.getpid()}-{threading.get_ident()}-{datetime.now().strftime('%H%M%S%f')}")
+        os.makedirs(tmp_dir)
+        try:
+            write_files(tmp_dir)
+            # Claim the next free generation; rename fails if another writer took it first
+            generation = max(self.current_generation() or 0, self._latest_on_disk()) + 1
+            while True:
+                try:
+                    os.rename(tmp_dir, self.path(generation))
+                    break
+                except OSError:
+                    if not os.path.exists(self.path(generation)):
+                        raise
+                    generation += 1
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        tmp_pointer = f"{self.current_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_pointer, 'w', encoding='utf-8') as f:
+            f.write(str(generation))
+        os.replace(tmp_pointer, self.current_path)
+        self._prune(generation)
+        return generation
+
+    def _latest_on_disk(self) -> int:
+        generations = [int(name[4:]) for name in os.listdir(self.root_dir)
+                       if name.startswith("gen-") and name[4:].isdigit()]
+        return max(generations, default=0)
+
+    def _prune(self, current: int):
+        for name in os.listdir(self.root_dir):
+            if name.startswith("gen-") and name[4:].isdigit() and int(name[4:]) <= current - self.keep:
+                # Readers may still map an old generation; on Windows the delete just fails until they let go
+                shutil.rmtree(os.path.join(self.root_dir, name), ignore_errors=True)
+
+
+class IndexBundle:
+    """FAISS index snapshots stored as generations of a GenerationStore.
+
+    For ``index_path="arxiv_papers.faiss"`` the layout is::
+
+        arxiv_papers_index/
+            CURRENT                 # generation number of the published snapshot
+            gen-000007/
+                index.faiss         # faiss.write_index output
+                ids.json            # {paper_id: stable int64 faiss id}
+                facets.json         # {facet: {value: [faiss ids]}} for filtered search
+                manifest.json       # format version, DB checksum, dimension
+    """
+
+    INDEX_FILE = "index.faiss"
+    ID_MAP_FILE = "ids.json"
+    FACETS_FILE = "facets.json"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.store = GenerationStore(f"{os.path.splitext(index_path)[0]}_index")
+
+    def current_generation(self) -> Optional[int]:
+        return self.store.current_generation()
+
+    def exists(self) -> bool:
+        generation = self.current_generation()
+        if generation is None:
+            return False
+        gen_dir = self.store.path(generation)
+        return all(os.path.exists(os.path.join(gen_dir, name))
+                   for name in (self.INDEX_FILE, self.ID_MAP_FILE, self.FACETS_FILE, self.MANIFEST_FILE))
+
+    def read_manifest(self, generation: Optional[int] = None) -> Optional[dict]:
+        generation = generation if generation is not None else self.current_generation()
+        if generation is None:
+            return None
+        manifest_path = os.path.join(self.store.path(generation), self.MANIFEST_FILE)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable index manifest {manifest_path}: {e}")
+            return None
+        manifest['generation'] = generation
+        return manifest
+
+    def matches(self, checksum: Dict) -> bool:
+        """Return True if the published snapshot was built from a DB with the given checksum."""
+        if not self.exists():
+            return False
+        manifest = self.read_manifest()
+        if not manifest or manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+            return False
+        return manifest.get('checksum') == checksum
+
+    def load(self, mmap: bool = False) -> Tuple[faiss.Index, Dict[str, int], Dict, dict]:
+        """Load the published snapshot. The manifest carries its 'generation'."""
+        generation = self.current_generation()
+        gen_dir = self.store.path(generation)
+        manifest = self.read_manifest(generation)
+        index_file = os.path.join(gen_dir, self.INDEX_FILE)
+        if mmap:
+            index = faiss.read_index(index_file, mmap_read_flags(manifest.get('index_spec', {})))
+        else:
+            index = faiss.read_index(index_file)
+        with open(os.path.join(gen_dir, self.ID_MAP_FILE), 'r', encoding='utf-8') as f:
+            id_map = json.load(f)
+        if len(id_map) != manifest.get('vector_count'):
+            raise ValueError(f"id map has {len(id_map)} entries, manifest expects {manifest.get('vector_count')}")
+        with open(os.path.join(gen_dir, self.FACETS_FILE), 'r', encoding='utf-8') as f:
+            facets = json.load(f)
+        return index, id_map, facets, manifest
+
+    def save(self, index: faiss.Index, id_map: Dict[str, int], facets: Dict, checksum: Dict, **extra) -> dict:
+        """Write and publish a new generation. Returns its manifest."""
+        manifest = {
+            'format_version': BUNDLE_FORMAT_VERSION,
+            'checksum': checksum,
+            'vector_count': len(id_map),
+            'dimension': index.d,
+            'created_at': datetime.now().isoformat(),
+        }
+        manifest.update(extra)
+
+        def write_files(gen_dir: str):
+            faiss.write_index(index, os.path.join(gen_dir, self.INDEX_FILE))
+            _dump_json(id_map, os.path.join(gen_dir, self.ID_MAP_FILE))
+            _dump_json(facets, os.path.join(gen_dir, self.FACETS_FILE))
+            _dump_json(manifest, os.path.join(gen_dir, self.MANIFEST_FILE))
+
+        manifest['generation'] = self.store.publish(write_files)
+        logger.info(f"Published FAISS index generation {manifest['generation']} at {self.store.root_dir}")
+        return manifest
+
+
+def _dump_json(obj, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f)
@@ -0,0 +1,174 @@
+import logging
+import math
+from typing import Optional, Tuple
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FLAT = "flat"
+INDEX_HNSW = "hnsw"
+INDEX_IVFPQ = "ivfpq"
+INDEX_TYPES = (INDEX_FLAT, INDEX_HNSW, INDEX_IVFPQ)
+
+# Corpus size thresholds for automatic selection. Below FLAT_MAX_VECTORS exact
+# search is fast enough; HNSW keeps full vectors so it is capped by memory.
+FLAT_MAX_VECTORS = 20_000
+HNSW_MAX_VECTORS = 500_000
+# PQ code size caps recall regardless of nprobe; above this target stay on HNSW
+IVFPQ_MAX_TARGET_RECALL = 0.99
+
+HNSW_M = 32
+# (target recall, efSearch / nprobe fraction) pairs, first match wins
+HNSW_EF_SEARCH = ((0.90, 64), (0.95, 128), (0.99, 256))
+IVF_NPROBE_FRACTION = ((0.90, 0.02), (0.95, 0.05), (0.99, 0.12))
+# Dimensions per PQ sub-quantizer (8 bits each): fewer dims = bigger codes = higher recall
+PQ_DIMS_PER_SUBQUANTIZER = ((0.90, 4), (0.95, 2))
+
+TRAIN_SAMPLE_SIZE = 100_000
+
+# Reduced tier: first-stage search over PCA-projected and/or 8-bit scalar-quantized
+# vectors, candidates re-scored against the exact float32 vectors.
+# RESCORE_FACTOR * k candidates are fetched per query for the re-score.
+RESCORE_FACTOR = 4
+
+
+def _pick(table, target_recall: float):
+    for recall, value in table:
+        if target_recall <= recall:
+            return value
+    return table[-1][1]
+
+
+def _pq_subquantizers(dimension: int, target_recall: float) -> int:
+    # Largest divisor of d that leaves at least the wanted dims per sub-quantizer
+    dims_per_subquantizer = _pick(PQ_DIMS_PER_SUBQUANTIZER, target_recall)
+    for m in range(max(dimension // dims_per_subquantizer, 1), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def select_index_spec(n_vectors: int, dimension: int, target_recall: float = 0.95,
+                      index_type: Optional[str] = None, pca_dim: Optional[int] = None, sq8: bool = False) -> dict:
+    """Choose an index tier and its parameters for a corpus of n_vectors.
+
+    pca_dim / sq8 request the reduced representation; an empty corpus always
+    gets the full one since a PCA or quantizer cannot be trained on nothing.
+    """
+    if index_type is None:
+        if n_vectors < FLAT_MAX_VECTORS or target_recall >= 0.999:
+            index_type = INDEX_FLAT
+        elif n_vectors < HNSW_MAX_VECTORS or target_recall >= IVFPQ_MAX_TARGET_RECALL:
+            index_type = INDEX_HNSW
+        else:
+            index_type = INDEX_IVFPQ
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+
+    spec = {"type": index_type, "target_recall": target_recall}
+    if index_type == INDEX_HNSW:
+        spec.update(M=HNSW_M, ef_construction=2 * HNSW_M, ef_search=_pick(HNSW_EF_SEARCH, target_recall))
+    elif index_type == INDEX_IVFPQ:
+        nlist = max(1, min(int(4 * math.sqrt(max(n_vectors, 1))), max(n_vectors // 39, 1)))
+        spec.update(nlist=nlist, m=_pq_subquantizers(dimension, target_recall), nbits=8,
+                    nprobe=max(1, int(nlist * _pick(IVF_NPROBE_FRACTION, target_recall))))
+
+    if n_vectors > 0:
+        if pca_dim and pca_dim < dimension and n_vectors > pca_dim:
+            spec["pca_dim"] = int(pca_dim)
+            if index_type == INDEX_IVFPQ:
+                spec["m"] = _pq_subquantizers(spec["pca_dim"], target_recall)
+        if sq8 and index_type != INDEX_IVFPQ:  # PQ codes are already compressed
+            spec["sq8"] = True
+    return spec
+
+
+def is_reduced(spec: dict) -> bool:
+    """True when the index holds PCA-projected or 8-bit vectors, so its distances are approximate."""
+    return bool(spec.get("pca_dim") or spec.get("sq8"))
+
+
+def supports_remove(spec: dict) -> bool:
+    """HNSW graphs cannot delete vectors; callers must tombstone and rebuild."""
+    return spec.get("type", INDEX_FLAT) != INDEX_HNSW
+
+
+def supports_reconstruct(spec: dict) -> bool:
+    """Flat and HNSW keep full vectors; PQ codes and the reduced tier only give an approximation back."""
+    return spec.get("type", INDEX_FLAT) != INDEX_IVFPQ and not is_reduced(spec)
+
+
+def create_index(spec: dict, dimension: int, metric: str = "l2", with_ids: bool = True) -> faiss.Index:
+    """Create an empty (untrained) index for spec.
+
+    with_ids=True returns an index that accepts add_with_ids/remove_ids with
+    caller-chosen int64 ids (IVF stores ids natively, the rest go through IndexIDMap2).
+    """
+    metric_type = faiss.METRIC_INNER_PRODUCT if metric == "ip" else faiss.METRIC_L2
+    index_type = spec["type"]
+    stored_dim = spec.get("pca_dim") or dimension
+
+    if index_type == INDEX_IVFPQ:
+        quantizer = faiss.IndexFlatIP(stored_dim) if metric == "ip" else faiss.IndexFlatL2(stored_dim)
+        index = faiss.IndexIVFPQ(quantizer, stored_dim, spec["nlist"], spec["m"], spec["nbits"], metric_type)
+    elif index_type == INDEX_HNSW:
+        if spec.get("sq8"):
+            index = faiss.IndexHNSWSQ(stored_dim, faiss.ScalarQuantizer.QT_8bit, spec["M"], metric_type)
+        else:
+            index = faiss.IndexHNSWFlat(stored_dim, spec["M"], metric_type)
+        index.hnsw.efConstruction = spec["ef_construction"]
+    elif spec.get("sq8"):
+        index = faiss.IndexScalarQuantizer(stored_dim, faiss.ScalarQuantizer.QT_8bit, metric_type)
+    else:
+        index = faiss.IndexFlatIP(stored_dim) if metric == "ip" else faiss.IndexFlatL2(stored_dim)
+
+    apply_search_params(index, spec)
+    if spec.get("pca_dim"):
+        # Projection is trained with the index; search/add take full-dimension vectors as before
+        index = faiss.IndexPreTransform(faiss.PCAMatrix(dimension, stored_dim), index)
+    if with_ids and index_type != INDEX_IVFPQ:
+        index = faiss.IndexIDMap2(index)
+    return index
+
+
+def apply_search_params(index: faiss.Index, spec: dict):
+    """Re-apply query-time knobs (nprobe / efSearch), e.g. after faiss.read_index."""
+    base = faiss.downcast_index(index.index) if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) else index
+    if isinstance(base, faiss.IndexPreTransform):
+        base = faiss.downcast_index(base.index)
+    if spec.get("type") == INDEX_HNSW and hasattr(base, "hnsw"):
+        base.hnsw.efSearch = spec["ef_search"]
+    elif spec.get("type") == INDEX_IVFPQ and hasattr(base, "nprobe"):
+        base.nprobe = spec["nprobe"]
+
+
+def train_index(index: faiss.Index, embeddings: np.ndarray, sample_size: int = TRAIN_SAMPLE_SIZE, seed: int = 42):
+    """Train on a random sample of the corpus (no-op for indexes that need no training)."""
+    if index.is_trained:
+        return
+    if len(embeddings) > sample_size:
+        rng = np.random.default_rng(seed)
+        sample = embeddings[rng.choice(len(embeddings), sample_size, replace=False)]
+    else:
+        sample = embeddings
+    logger.info(f"Training FAISS index on {len(sample)} of {len(embeddings)} vectors")
+    index.train(np.ascontiguousarray(sample, dtype='float32'))
+
+
+def build_index(embeddings: np.ndarray, ids: Optional[np.ndarray] = None, metric: str = "l2",
+                target_recall: float = 0.95, index_type: Optional[str] = None,
+                pca_dim: Optional[int] = None, sq8: bool = False) -> Tuple[faiss.Index, dict]:
+    """Select, train and fill an index. Returns (index, spec); store spec in the index manifest."""
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    n_vectors, dimension = embeddings.shape
+    spec = select_index_spec(n_vectors, dimension, target_recall, index_type, pca_dim=pca_dim, sq8=sq8)
+    index = create_index(spec, dimension, metric, with_ids=ids is not None)
+    train_index(index, embeddings)
+    if ids is not None:
+        index.add_with_ids(embeddings, np.asarray(ids, dtype='int64'))
+    else:
+        index.add(embeddings)
+    logger.info(f"Built {spec['type']} FAISS index over {n_vectors} vectors (spec={spec})")
+    return index, spec
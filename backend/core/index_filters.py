@@ -0,0 +1,141 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import faiss
+import numpy as np
+
+from .index_factory import INDEX_HNSW, INDEX_IVFPQ
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("platform", "category", "month", "day")
+
+
+def _as_list(value: Union[None, str, Iterable[str]]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class PaperFacets:
+    """Precomputed FAISS id sets per platform, category, month and day.
+
+    Search filters are resolved to an id array from these sets, then passed to
+    FAISS as an IDSelector so filtering happens inside the index scan instead
+    of over-fetching and dropping hydrated papers.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, List[int]]]] = None):
+        self.sets: Dict[str, Dict[str, Set[int]]] = {facet: {} for facet in FACETS}
+        if data:
+            for facet, values in data.items():
+                self.sets[facet] = {key: set(ids) for key, ids in values.items()}
+        self._arrays: Dict[tuple, np.ndarray] = {}
+
+    def add(self, faiss_id: int, platform: Optional[str], categories, updated_date):
+        keys = []
+        if platform:
+            keys.append(("platform", platform.lower()))
+        if isinstance(categories, str):
+            categories = [categories]
+        for category in categories or []:
+            keys.append(("category", category))
+        day = _as_date(updated_date)
+        if day is not None:
+            keys.append(("month", day.strftime("%Y-%m")))
+            keys.append(("day", day.isoformat()))
+        for facet, key in keys:
+            self.sets[facet].setdefault(key, set()).add(faiss_id)
+            self._arrays.pop((facet, key), None)
+
+    def remove(self, faiss_ids: Iterable[int]):
+        faiss_ids = set(faiss_ids)
+        for facet, values in self.sets.items():
+            for key, ids in values.items():
+                if ids & faiss_ids:
+                    ids -= faiss_ids
+                    self._arrays.pop((facet, key), None)
+
+    def to_dict(self) -> Dict[str, Dict[str, List[int]]]:
+        return {facet: {key: list(ids) for key, ids in values.items() if ids} for facet, values in self.sets.items()}
+
+    def _array(self, facet: str, key: str) -> np.ndarray:
+        cached = self._arrays.get((facet, key))
+        if cached is None:
+            cached = np.fromiter(self.sets[facet].get(key, ()), dtype='int64')
+            self._arrays[(facet, key)] = cached
+        return cached
+
+    def _union(self, facet: str, keys: Iterable[str]) -> np.ndarray:
+        arrays = [self._array(facet, key) for key in keys]
+        if not arrays:
+            return np.empty(0, dtype='int64')
+        return np.unique(np.concatenate(arrays)) if len(arrays) > 1 else arrays[0]
+
+    def _date_window(self, start: Optional[date], end: Optional[date]) -> np.ndarray:
+        days = sorted(self.sets["day"])
+        if not days:
+            return np.empty(0, dtype='int64')
+        start = start or date.fromisoformat(days[0])
+        end = end or date.fromisoformat(days[-1])
+
+        # Whole months inside the window come from month sets, partial edge months from day sets
+        months, edge_days = [], []
+        cursor = start.replace(day=1)
+        while cursor <= end:
+            next_month = (cursor + timedelta(days=32)).replace(day=1)
+            month_key = cursor.strftime("%Y-%m")
+            if cursor >= start and next_month - timedelta(days=1) <= end:
+                months.append(month_key)
+            else:
+                edge_days.extend(d for d in days if d.startswith(month_key) and start.isoformat() <= d <= end.isoformat())
+            cursor = next_month
+        parts = [self._union("month", months), self._union("day", edge_days)]
+        return np.unique(np.concatenate(parts))
+
+    def select(self, platform=None, category=None, start_date=None, end_date=None) -> Optional[np.ndarray]:
+        """Allowed FAISS ids for the filters, or None when no filter is given.
+
+        Values within a facet are OR-ed (platform=["arxiv", "pmc"]); facets are AND-ed.
+        """
+        platforms, categories = _as_list(platform), _as_list(category)
+        start, end = _as_date(start_date), _as_date(end_date)
+        allowed = None
+        if platforms:
+            allowed = self._union("platform", [p.lower() for p in platforms])
+        if categories:
+            ids = self._union("category", categories)
+            allowed = ids if allowed is None else np.intersect1d(allowed, ids, assume_unique=True)
+        if start or end:
+            ids = self._date_window(start, end)
+            allowed = ids if allowed is None else np.intersect1d(allowed, ids, assume_unique=True)
+        return allowed
+
+
+def search_parameters(spec: dict, allowed_ids: np.ndarray, ntotal: int) -> faiss.SearchParameters:
+    """SearchParameters restricting a search to allowed_ids, typed for the index tier."""
+    selector = faiss.IDSelectorBatch(allowed_ids)
+    if spec.get("type") == INDEX_IVFPQ:
+        # Probe proportionally more lists for selective filters so ~k candidates still survive
+        selectivity = max(len(allowed_ids), 1) / max(ntotal, 1)
+        nprobe = min(spec["nlist"], int(np.ceil(spec["nprobe"] / selectivity)))
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+    elif spec.get("type") == INDEX_HNSW:
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=spec["ef_search"])
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    params.sel_ref = selector # SearchParameters does not own the selector
+    return params
@@ -0,0 +1,102 @@
+import logging
+import os
+import re
+from typing import Dict
+
+import numpy as np
+import torch
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("eager", "int8", "onnx")
+
+
+class EagerBackend:
+    """PyTorch eager forward pass; CLS token of the last hidden state."""
+
+    name = "eager"
+
+    def __init__(self, model):
+        self.model = model.eval()
+
+    def encode(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        with torch.inference_mode():
+            output = self.model(input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask'])
+            return output.last_hidden_state[:, 0, :].float().numpy()
+
+
+class Int8Backend(EagerBackend):
+    """Eager model with every nn.Linear dynamically quantized to int8 (weights int8, activations quantized per batch)."""
+
+    name = "int8"
+
+    def __init__(self, model):
+        # In place: no second float copy of the weights is kept around
+        super().__init__(torch.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8,
+                                                             inplace=True))
+
+
+class _ClsEncoder(torch.nn.Module):
+    # Export wrapper: plain tensors in, CLS embedding out (the adapter model returns a ModelOutput)
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state[:, 0, :]
+
+
+class OnnxBackend:
+    """ONNX Runtime CPU session over a graph exported once per (base model, adapter) and reused from disk."""
+
+    name = "onnx"
+
+    def __init__(self, model, onnx_path: str):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("EMBEDDING_BACKEND=onnx requires onnxruntime (pip install onnxruntime)") from e
+
+        if not os.path.exists(onnx_path):
+            export_onnx(model, onnx_path)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.onnx_path = onnx_path
+
+    def encode(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        feeds = {name: inputs[name].numpy().astype('int64') for name in ('input_ids', 'attention_mask')}
+        return self.session.run(None, feeds)[0].astype('float32', copy=False)
+
+
+def export_onnx(model, onnx_path: str):
+    """Export the active-adapter model to ONNX with dynamic batch and sequence axes."""
+    os.makedirs(os.path.dirname(onnx_path), exist_ok=True)
+    tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+    dummy = torch.ones((2, 16), dtype=torch.long)
+    dynamic = {0: "batch", 1: "sequence"}
+    logger.info(f"Exporting embedding model to ONNX: {onnx_path}")
+    torch.onnx.export(
+        _ClsEncoder(model.eval()), (dummy, dummy), tmp_path,
+        input_names=["input_ids", "attention_mask"], output_names=["embedding"],
+        dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic, "embedding": {0: "batch"}},
+        opset_version=17,
+    )
+    os.replace(tmp_path, onnx_path)  # concurrent workers never load a half-written graph
+
+
+def onnx_path_for(base_model_name: str, model_name: str) -> str:
+    safe = lambda name: re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    return os.path.join(Config.EMBEDDING_ONNX_DIR, f"{safe(base_model_name)}__{safe(model_name)}.onnx")
+
+
+def create_backend(kind: str, model, base_model_name: str, model_name: str):
+    if kind == "eager":
+        return EagerBackend(model)
+    if kind == "int8":
+        return Int8Backend(model)
+    if kind == "onnx":
+        return OnnxBackend(model, onnx_path_for(base_model_name, model_name))
+    raise ValueError(f"Unknown embedding backend {kind!r}; expected one of {BACKENDS}")
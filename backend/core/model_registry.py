@@ -0,0 +1,160 @@
+import gc
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_model_bytes(obj: Any) -> int:
+    """Parameter + buffer bytes of the torch module(s) behind obj (EmbeddingManager, HF pipeline, nn.Module)."""
+    module = obj if hasattr(obj, 'parameters') else getattr(obj, 'model', None)
+    if module is None or not hasattr(module, 'parameters'):
+        return 0
+    tensors = list(module.parameters()) + list(module.buffers() if hasattr(module, 'buffers') else [])
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class _Entry:
+    def __init__(self, model: Any, size_bytes: int, load_seconds: float):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.load_seconds = load_seconds
+        self.hits = 0
+        self.last_used = time.time()
+        self.pinned = False
+
+
+class ModelRegistry:
+    """Process-wide cache of heavy models, loaded on first use and shared by every caller.
+
+    Entries are kept in LRU order with their resident size (tensor bytes). When a
+    load pushes the total over memory_budget_mb, least recently used models are
+    dropped from the registry. A caller that still holds a reference keeps that
+    model alive, so code that uses a model only now and then should fetch it
+    through the registry each time instead of storing it. Long-lived holders
+    (vector collections) pin their model instead, which exempts it from eviction
+    so the next caller gets the same instance rather than a second load.
+    """
+
+    def __init__(self, memory_budget_mb: int = Config.MODEL_MEMORY_BUDGET_MB):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any], pin: bool = False) -> Any:
+        """The model registered under key, calling loader() to load it the first time."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._touch(key, entry, pin)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Per-key lock: concurrent first users wait for one load; other models stay available meanwhile
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return self._touch(key, entry, pin)
+            start = time.perf_counter()
+            model = loader()
+            entry = _Entry(model, estimate_model_bytes(model), time.perf_counter() - start)
+            entry.pinned = pin
+            with self._lock:
+                self._entries[key] = entry
+                self._evict_over_budget(keep=key)
+            logger.info(f"Model registry loaded {key} ({entry.size_bytes / 2**20:.0f} MB, {entry.load_seconds:.1f}s); "
+                        f"resident {self.resident_bytes / 2**20:.0f}/{self.memory_budget / 2**20:.0f} MB")
+            return model
+
+    def _touch(self, key: Hashable, entry: _Entry, pin: bool) -> Any:
+        self._entries.move_to_end(key)
+        entry.pinned = entry.pinned or pin
+        entry.hits += 1
+        entry.last_used = time.time()
+        return entry.model
+
+    def _evict_over_budget(self, keep: Hashable):
+        evicted = False
+        while self.resident_bytes > self.memory_budget:
+            victim = next((key for key, entry in self._entries.items() if key != keep and not entry.pinned), None)
+            if victim is None:
+                break
+            entry = self._entries.pop(victim)
+            self.evictions += 1
+            evicted = True
+            logger.info(f"Model registry evicted {victim} ({entry.size_bytes / 2**20:.0f} MB, least recently used)")
+        if evicted:
+            gc.collect()
+
+    def evict(self, key: Hashable) -> bool:
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+        if removed:
+            gc.collect()
+        return removed
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models: List[Dict[str, Any]] = [
+                {"key": repr(key), "size_mb": round(entry.size_bytes / 2**20, 1), "hits": entry.hits, "pinned": entry.pinned,
+                 "load_seconds": round(entry.load_seconds, 2), "last_used": entry.last_used}
+                for key, entry in self._entries.items()
+            ]
+            return {
+                "resident_mb": round(self.resident_bytes / 2**20, 1),
+                "budget_mb": round(self.memory_budget / 2**20, 1),
+                "evictions": self.evictions,
+                "models": models,  # least recently used first
+            }
+
+
+# Modules under backend/ are importable both as core.X (backend/ on sys.path) and backend.core.X, which gives
+# two module objects with separate globals. Process-wide singletons live in this one table instead: whichever
+# copy of this module is imported second adopts the first copy's table.
+_twin = sys.modules.get('backend.core.model_registry' if __name__ == 'core.model_registry' else 'core.model_registry')
+_singletons: Dict[str, Any] = getattr(_twin, '_singletons', {})
+_singleton_locks: Dict[str, threading.Lock] = getattr(_twin, '_singleton_locks', {})
+_singletons_lock = getattr(_twin, '_singletons_lock', None) or threading.Lock()
+del _twin
+
+
+def process_singleton(name: str, factory: Callable[[], Any]) -> Any:
+    """The process-wide instance registered under name, created by factory on first use."""
+    instance = _singletons.get(name)
+    if instance is not None:
+        return instance
+    with _singletons_lock:
+        lock = _singleton_locks.setdefault(name, threading.Lock())
+    with lock:  # per name, so a slow factory does not block other singletons
+        if name not in _singletons:
+            _singletons[name] = factory()
+        return _singletons[name]
+
+
+def get_model_registry() -> ModelRegistry:
+    """Shared ModelRegistry singleton."""
+    return process_singleton('model_registry', ModelRegistry)
+
+
+def get_embedding_manager(model_name: str = "allenai/specter2", base_model_name: str = "allenai/specter2_base",
+                          pin: bool = False):
+    """Shared EmbeddingManager for a model/adapter pair (one SPECTER2 load per process)."""
+    from .embedding_manager import EmbeddingManager
+
+    return get_model_registry().get(
+        ("embedding", model_name, base_model_name, Config.EMBEDDING_BACKEND),
+        lambda: EmbeddingManager(model_name=model_name, base_model_name=base_model_name),
+        pin=pin,
+    )
@@ -1,14 +1,49 @@
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, LargeBinary, Integer, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from typing import List, Optional
+import json
 import logging
+import numpy as np
 from pydantic import Field
 
+from .config import Config
+
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+class VectorBlob(TypeDecorator):
+    """임베딩을 JSON 리스트 대신 float32(또는 float16) 바이트 BLOB으로 저장
+
+    list/ndarray를 받아 저장하고 float32 ndarray로 읽는다.
+    마이그레이션 전 JSON 텍스트로 남아 있는 행도 그대로 읽힌다 (backend.db.embedding_storage 참고).
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dtype: str = Config.EMBEDDING_STORAGE_DTYPE, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dtype = np.dtype(dtype)
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, (bytes, bytearray, memoryview)):
+            return value
+        return np.asarray(value, dtype=self.dtype).tobytes()
+
+    def process_result_value(self, value, dialect):
+        return decode_embedding(value, self.dtype)
+
+def decode_embedding(value, dtype=Config.EMBEDDING_STORAGE_DTYPE) -> Optional[np.ndarray]:
+    """BLOB(또는 레거시 JSON 텍스트) 임베딩을 float32 ndarray로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        parsed = json.loads(value)
+        return np.asarray(parsed, dtype='float32') if parsed is not None else None
+    return np.frombuffer(value, dtype=dtype).astype('float32', copy=False)
+
 class Paper(Base):
     __tablename__ = 'papers'
 
@@ -20,9 +55,34 @@ class Paper(Base):
     authors = Column(JSON, nullable=True)  # List of author names
     categories = Column(JSON, nullable=True) # List of category tags
     pdf_url = Column(String, nullable=True)
-    embedding = Column(JSON, nullable=True) # 임베딩 필드 추가
+    embedding = Column(VectorBlob(), nullable=True) # float32/float16 바이트 임베딩
     published_date = Column(DateTime, nullable=True)
     updated_date = Column(DateTime, nullable=True) # For tracking updates to papers
     
     def __repr__(self):
         return f"<Paper(paper_id='{self.paper_id}', title='{self.title[:50]}...')>"
+
+class PaperCategory(Base):
+    """논문-카테고리 정규화 테이블 (papers.categories JSON에서 트리거로 동기화, backend.db.categories 참고)"""
+    __tablename__ = 'paper_categories'
+    __table_args__ = (Index('ix_paper_categories_category', 'category', 'paper_id'),)
+
+    paper_id = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+
+    def __repr__(self):
+        return f"<PaperCategory(paper_id='{self.paper_id}', category='{self.category}')>"
+
+class PaperChunk(Base):
+    """논문 전문을 나눈 패시지(청크)와 임베딩, paper_id로 논문에 연결 (backend.core.passage_store 참고)"""
+    __tablename__ = 'paper_chunks'
+
+    chunk_id = Column(String, primary_key=True)  # "{paper_id}#{chunk_index}"
+    paper_id = Column(String, index=True, nullable=False)
+    chunk_index = Column(Integer, nullable=False)  # 본문 내 순서
+    text = Column(Text, nullable=False)
+    source_hash = Column(String, nullable=False)  # 임베딩 모델 + 원문 해시, 바뀌면 다시 청크/임베딩
+    embedding = Column(VectorBlob(), nullable=True)
+
+    def __repr__(self):
+        return f"<PaperChunk(chunk_id='{self.chunk_id}')>"
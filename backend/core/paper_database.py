@@ -1,14 +1,136 @@
-from datetime import datetime
-from typing import List, Optional
+import base64
+import json
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import LargeBinary, bindparam, func, or_, select, text, tuple_, type_coerce
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from .models import Paper
+from .config import Config
+from .models import Paper, PaperCategory, decode_embedding
 from backend.db.connection import engine, create_tables # SQLAlchemy engine과 create_tables 함수 임포트
+from backend.db.categories import CATEGORY_TABLE, create_category_index
+from backend.db.fulltext import (BM25_WEIGHTS, FTS_ROWID_TABLE, FTS_TABLE, SNIPPET_MARKERS, SNIPPET_TOKENS,
+                                  create_fulltext_index, to_match_query)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 논문 저장/삭제 이벤트 리스너 (예: FAISSManager 증분 인덱스 갱신)
+_paper_listeners = []
+
+def add_paper_listener(listener):
+    """on_papers_saved(papers) / on_papers_deleted(paper_ids) 를 구현한 리스너 등록"""
+    if listener not in _paper_listeners:
+        _paper_listeners.append(listener)
+
+def remove_paper_listener(listener):
+    if listener in _paper_listeners:
+        _paper_listeners.remove(listener)
+
+def notify_papers_saved(papers: list):
+    """커밋된 논문(Paper 객체 또는 dict)을 리스너에 전달"""
+    if not papers:
+        return
+    for listener in list(_paper_listeners):
+        try:
+            listener.on_papers_saved(papers)
+        except Exception as e:
+            logger.error(f"Paper listener {listener!r} failed on save: {e}", exc_info=True)
+
+def notify_papers_deleted(paper_ids: list):
+    if not paper_ids:
+        return
+    for listener in list(_paper_listeners):
+        try:
+            listener.on_papers_deleted(paper_ids)
+        except Exception as e:
+            logger.error(f"Paper listener {listener!r} failed on delete: {e}", exc_info=True)
+
+def _platform_key():
+    # 플랫폼별 샤드 키: Paper.platform 기본값(arxiv)과 같은 규칙으로 NULL 처리, 대소문자 무시
+    return func.lower(func.coalesce(Paper.platform, 'arxiv'))
+
+_fulltext_ready = False
+
+def _ensure_fulltext_index():
+    # 서버 startup의 create_tables()를 거치지 않은 스크립트/워커에서도 전문 검색이 동작하도록
+    global _fulltext_ready
+    if not _fulltext_ready:
+        create_fulltext_index(engine)
+        _fulltext_ready = True
+
+_category_ready = False
+
+def _ensure_category_index():
+    global _category_ready
+    if not _category_ready:
+        create_category_index(engine)
+        _category_ready = True
+
+def _as_list(value) -> list:
+    return [value] if isinstance(value, str) else list(value or [])
+
+def _day_start(value) -> datetime:
+    # FAISS 패싯(index_filters)과 같은 일 단위 경계: 날짜/시각/ISO 문자열 -> 그날 00:00 (naive, 저장값과 같은 기준)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        value = value.date()
+    return datetime.combine(value, time.min)
+
+def encode_cursor(paper: Any) -> str:
+    """목록의 마지막 논문 위치 (updated_date, paper_id) -> 불투명 커서 토큰"""
+    updated_date = paper.updated_date.isoformat() if paper.updated_date else None
+    raw = json.dumps([updated_date, paper.paper_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """encode_cursor 토큰 -> (updated_date, paper_id). 잘못된 토큰은 ValueError"""
+    try:
+        updated_date, paper_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return (datetime.fromisoformat(updated_date) if updated_date else None), str(paper_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+def _category_filter(categories):
+    # paper_categories 인덱스 조회: 카테고리 자체 또는 하위 카테고리 (예: "cs" -> cs.AI, cs.LG ...)
+    _ensure_category_index()
+    matches = [PaperCategory.category.in_(categories)] + [PaperCategory.category.op('GLOB')(f"{c}.*") for c in categories]
+    return Paper.paper_id.in_(select(PaperCategory.paper_id).where(or_(*matches)))
+
+_PAPER_COLUMNS = tuple(column.name for column in Paper.__table__.columns)
+
+# 목록/하이드레이션 기본 컬럼 (임베딩 제외, 목록은 초록도 제외)
+LIST_COLUMNS = ('paper_id', 'external_id', 'platform', 'title', 'authors', 'categories', 'pdf_url',
+                'published_date', 'updated_date')
+DETAIL_COLUMNS = LIST_COLUMNS + ('abstract',)
+
+def _projection(columns: Sequence[str], abstract_chars: Optional[int] = None) -> list:
+    # 컬럼 이름 -> query 엔티티, 초록은 필요하면 SQL에서 잘라서 전송량/파싱 비용 절감
+    unknown = [name for name in columns if name not in _PAPER_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown paper columns {unknown}; expected any of {list(_PAPER_COLUMNS)}")
+    return [func.substr(Paper.abstract, 1, abstract_chars).label('abstract') if name == 'abstract' and abstract_chars
+            else getattr(Paper, name) for name in dict.fromkeys(columns)]
+
+def _page(items: list, limit: int) -> Tuple[list, Optional[str]]:
+    # limit + 1개를 조회한 결과 -> (한 페이지, 다음 페이지 커서)
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(items[-1])
+
+def _paper_row(paper: Any) -> dict:
+    # 크롤러 dict(여분 키 포함) 또는 Paper 객체 -> papers 테이블 컬럼 dict
+    if isinstance(paper, dict):
+        return {name: paper[name] for name in _PAPER_COLUMNS if name in paper}
+    values = {name: getattr(paper, name, None) for name in _PAPER_COLUMNS}
+    return {name: value for name, value in values.items() if value is not None}
+
 class PaperDatabase:
     def __init__(self):
         # 데이터베이스 파일 경로 설정은 database.py의 Config에서 관리되므로 여기서는 제거
@@ -28,6 +150,7 @@ class PaperDatabase:
             session.commit()
             session.refresh(paper)
             logger.info(f"Saved paper: {paper.paper_id}")
+            notify_papers_saved([paper])
             return True
         except IntegrityError:
             session.rollback()
@@ -40,6 +163,151 @@ class PaperDatabase:
         finally:
             session.close()
     
+    def save_papers(self, papers: Iterable[Any], on_conflict: str = "ignore",
+                    chunk_size: int = Config.INGEST_CHUNK_SIZE) -> Dict[str, int]:
+        """논문(dict 또는 Paper) 대량 저장: 청크마다 한 트랜잭션의 INSERT ... ON CONFLICT
+
+        on_conflict="ignore"는 이미 있는 paper_id를 건너뛰고, "update"는 넘겨받은 값으로 갱신한다
+        (값이 None인 컬럼은 기존 값 유지). Paper 컬럼이 아닌 키는 무시한다.
+        반환: {"inserted", "updated", "skipped"} 개수
+        """
+        if on_conflict not in ("ignore", "update"):
+            raise ValueError(f"on_conflict must be 'ignore' or 'update', got {on_conflict!r}")
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        chunk = []
+        for paper in papers:
+            chunk.append(paper)
+            if len(chunk) >= chunk_size:
+                self._save_chunk(chunk, on_conflict, counts)
+                chunk = []
+        if chunk:
+            self._save_chunk(chunk, on_conflict, counts)
+        logger.info(f"Bulk saved papers: {counts['inserted']} inserted, {counts['updated']} updated, "
+                    f"{counts['skipped']} skipped")
+        return counts
+
+    def _save_chunk(self, papers: List[Any], on_conflict: str, counts: Dict[str, int]):
+        table = Paper.__table__
+        rows = {}
+        for paper in papers:
+            row = _paper_row(paper)
+            if not row.get('paper_id'):
+                counts["skipped"] += 1
+                continue
+            if row['paper_id'] in rows:
+                counts["skipped"] += 1  # 같은 청크 안의 중복은 마지막 것만 저장
+            rows[row['paper_id']] = row
+        if not rows:
+            return
+
+        with engine.begin() as connection:
+            # 리스너용 기존 값: 일부 컬럼만 갱신된 행도 저장된 플랫폼/카테고리로 샤드/패싯에 반영
+            existing = {row['paper_id']: dict(row) for row in connection.execute(
+                select(table.c.paper_id, table.c.platform, table.c.categories, table.c.updated_date)
+                .where(table.c.paper_id.in_(list(rows)))).mappings()}
+
+            # executemany는 모든 행의 키가 같아야 하므로 (갱신 여부, 키 구성)별로 나눠 실행: 빠진 컬럼은 INSERT 시
+            # 컬럼 기본값, UPDATE 시 기존 값 유지 (기본값으로 채우면 coalesce가 저장된 platform 등을 덮어씀)
+            groups: Dict[tuple, List[dict]] = {}
+            for paper_id, row in rows.items():
+                if paper_id in existing and on_conflict == "ignore":
+                    continue
+                keys = tuple(column.name for column in table.columns if column.name in row)
+                groups.setdefault((paper_id in existing, keys), []).append(row)
+
+            for (update, keys), group in groups.items():
+                values = [key for key in keys if key != 'paper_id']
+                if update:
+                    # 기존 행은 UPDATE로: INSERT ... ON CONFLICT는 충돌 처리 전에 NOT NULL(title 등)을 검사해
+                    # title 없는 부분 갱신이 실패함
+                    if not values:
+                        continue
+                    statement = table.update().where(table.c.paper_id == bindparam('target_id')).values(
+                        {key: func.coalesce(bindparam(f'new_{key}', type_=table.c[key].type), table.c[key])
+                         for key in values})
+                    connection.execute(statement, [dict({f'new_{key}': row[key] for key in values},
+                                                        target_id=row['paper_id']) for row in group])
+                    continue
+                # 조회와 쓰기 사이에 다른 프로세스가 넣은 행도 on_conflict 규칙대로 처리
+                statement = sqlite_insert(table)
+                if on_conflict == "update":
+                    statement = statement.on_conflict_do_update(
+                        index_elements=[table.c.paper_id],
+                        set_={key: func.coalesce(statement.excluded[key], table.c[key]) for key in values},
+                    )
+                else:
+                    statement = statement.on_conflict_do_nothing(index_elements=[table.c.paper_id])
+                connection.execute(statement, group)
+
+        new = [row for paper_id, row in rows.items() if paper_id not in existing]
+        counts["inserted"] += len(new)
+        if on_conflict == "update":
+            counts["updated"] += len(existing)
+            notify_papers_saved([
+                {**existing.get(paper_id, {}), **{key: value for key, value in row.items() if value is not None}}
+                for paper_id, row in rows.items()])
+        else:
+            counts["skipped"] += len(existing)
+            notify_papers_saved(new)
+
+    def update_embedding(self, paper_id: str, embedding: list) -> bool:
+        """논문 임베딩 교체 (재임베딩), 리스너에 변경 알림"""
+        session = self.get_session()
+        try:
+            paper = session.query(Paper).filter_by(paper_id=paper_id).first()
+            if paper is None:
+                return False
+            paper.embedding = embedding
+            session.commit()
+            session.refresh(paper)
+            notify_papers_saved([paper])
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating embedding for {paper_id}: {e}")
+            return False
+        finally:
+            session.close()
+
+    def update_embeddings(self, embeddings: Dict[str, Any], chunk_size: int = Config.INGEST_CHUNK_SIZE) -> int:
+        """여러 논문 임베딩을 청크당 한 번의 UPDATE로 교체 (없는 paper_id는 무시), 반환: 갱신 수
+
+        리스너에는 플랫폼/카테고리/날짜를 함께 넘겨 벡터 인덱스가 올바른 샤드/패싯에 반영하도록 한다.
+        """
+        table = Paper.__table__
+        paper_ids = list(embeddings)
+        updated = 0
+        for start in range(0, len(paper_ids), chunk_size):
+            chunk = paper_ids[start:start + chunk_size]
+            with engine.begin() as connection:
+                rows = connection.execute(
+                    select(table.c.paper_id, table.c.platform, table.c.categories, table.c.updated_date)
+                    .where(table.c.paper_id.in_(chunk))).mappings().all()
+                if rows:
+                    connection.execute(
+                        table.update().where(table.c.paper_id == bindparam('target_id'))
+                        .values(embedding=bindparam('embedding')),
+                        [{'target_id': row['paper_id'], 'embedding': embeddings[row['paper_id']]} for row in rows])
+            updated += len(rows)
+            notify_papers_saved([dict(row, embedding=embeddings[row['paper_id']]) for row in rows])
+        return updated
+
+    def delete_paper(self, paper_id: str) -> bool:
+        """논문 삭제, 리스너에 삭제 알림"""
+        session = self.get_session()
+        try:
+            deleted = session.query(Paper).filter_by(paper_id=paper_id).delete()
+            session.commit()
+            if deleted:
+                notify_papers_deleted([paper_id])
+            return bool(deleted)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error deleting paper {paper_id}: {e}")
+            return False
+        finally:
+            session.close()
+
     def get_paper_by_id(self, paper_id: str) -> Optional[Paper]:
         """ID로 논문 조회"""
         session = self.get_session()
@@ -48,63 +316,246 @@ class PaperDatabase:
         finally:
             session.close()
     
-    def get_papers_by_date_range(self, start_date: datetime, end_date: datetime, limit: Optional[int] = None) -> List[Paper]:
-        """날짜 범위로 논문 조회"""
+    def get_papers_by_date_range(self, start_date: datetime, end_date: datetime, limit: Optional[int] = None,
+                                 platform: Optional[str] = None, cursor: Optional[str] = None) -> List[Paper]:
+        """날짜 범위로 논문 조회 (platform 지정 시 해당 플랫폼만, cursor로 다음 페이지)"""
+        papers = self.get_papers(platform=platform, start_date=start_date, end_date=end_date, limit=limit, cursor=cursor)
+        logger.info(f"DB returned {len(papers)} papers for date range {start_date} to {end_date}")
+        return papers
+    
+    def load_embedding_matrix(self, dimension: int, platform: Optional[str] = None) -> Tuple[List[dict], np.ndarray]:
+        """dimension 차원 임베딩을 가진 논문 전체를 (메타데이터 dict 목록, (N, dimension) float32 행렬)로 로드
+
+        BLOB을 ORM 객체로 만들지 않고 이어 붙여 np.frombuffer 한 번으로 행렬을 만든다.
+        마이그레이션 전 JSON 텍스트 행은 개별 변환한다.
+        """
+        dtype = np.dtype(Config.EMBEDDING_STORAGE_DTYPE)
         session = self.get_session()
         try:
-            query = session.query(Paper)
-            query = query.filter(Paper.updated_date.between(start_date, end_date))
-            query = query.order_by(Paper.updated_date.desc())
-            if limit is not None:
-                query = query.limit(limit)
-
-            papers = query.all()
-            logger.info(f"DB returned {len(papers)} papers for date range {start_date} to {end_date}")
-        
-            # 전체 논문 수도 확인 (디버깅 목적)
-            total_count = session.query(Paper).count()
-            logger.info(f"Total papers in DB: {total_count}")
-        
-            # 최근 3개 논문의 날짜 확인 (디버깅 목적)
-            recent_papers = session.query(Paper).order_by(Paper.updated_date.desc()).limit(3).all()
-            logger.info(f"Recent papers (top 3): {[p.paper_id for p in recent_papers]}")
+            query = session.query(Paper.paper_id, Paper.platform, Paper.categories, Paper.updated_date,
+                                  type_coerce(Paper.embedding, LargeBinary)).filter(Paper.embedding.isnot(None))
+            if platform:
+                query = query.filter(_platform_key() == platform.lower())
+            rows, blobs, legacy = [], [], 0
+            for paper_id, paper_platform, categories, updated_date, raw in query:
+                if isinstance(raw, str):
+                    vector = decode_embedding(raw)
+                    if vector is None or len(vector) != dimension:
+                        continue
+                    legacy += 1
+                    raw = vector.astype(dtype).tobytes()
+                elif len(raw) != dimension * dtype.itemsize:
+                    continue  # 다른 모델/목업 차원
+                rows.append({"paper_id": paper_id, "platform": paper_platform,
+                             "categories": categories, "updated_date": updated_date})
+                blobs.append(raw)
+        finally:
+            session.close()
+        if legacy:
+            logger.warning(f"{legacy} papers still store JSON embeddings; run python -m backend.db.embedding_storage")
+        matrix = np.frombuffer(b"".join(blobs), dtype=dtype).reshape(len(rows), dimension).astype('float32', copy=False)
+        return rows, matrix
 
-            return papers
+    def get_embeddings(self, paper_ids: List[str], dimension: int) -> dict:
+        """paper_id -> float32 임베딩 (dimension 차원인 것만), 한 번의 IN 쿼리로 조회 (재정렬/폴백용)"""
+        if not paper_ids:
+            return {}
+        session = self.get_session()
+        try:
+            rows = session.query(Paper.paper_id, Paper.embedding).filter(Paper.paper_id.in_(list(paper_ids))).all()
         finally:
             session.close()
-    
-    def get_all_papers(self, limit: Optional[int] = None) -> List[Paper]:
-        """모든 논문을 최신 업데이트 날짜 기준으로 조회"""
+        return {paper_id: embedding for paper_id, embedding in rows
+                if embedding is not None and len(embedding) == dimension}
+
+    def get_papers(self, platform=None, categories=None, start_date: Optional[datetime] = None,
+                   end_date: Optional[datetime] = None, limit: Optional[int] = None,
+                   cursor: Optional[str] = None) -> List[Paper]:
+        """플랫폼/카테고리/기간 필터를 한 번의 인덱스 쿼리로 처리, 최신 업데이트 순으로 정확히 limit개 반환
+
+        platform, categories는 값 하나 또는 목록. 카테고리는 하위 카테고리까지 포함한다 ("cs" -> cs.AI ...).
+        cursor(encode_cursor 토큰)를 주면 그 논문 다음부터 반환한다 (키셋 페이지네이션, OFFSET 없음).
+        """
+        return self._select_papers([Paper], platform, categories, start_date, end_date, limit, cursor)
+
+    def get_papers_page(self, limit: int, cursor: Optional[str] = None, **filters) -> Tuple[List[Paper], Optional[str]]:
+        """get_papers 한 페이지와 다음 페이지 커서 (마지막 페이지면 None). 페이지 비용은 깊이와 무관"""
+        return _page(self.get_papers(limit=limit + 1, cursor=cursor, **filters), limit)
+
+    def get_paper_rows(self, columns: Sequence[str] = LIST_COLUMNS, abstract_chars: Optional[int] = None,
+                       platform=None, categories=None, start_date: Optional[datetime] = None,
+                       end_date: Optional[datetime] = None, limit: Optional[int] = None,
+                       cursor: Optional[str] = None) -> List[Row]:
+        """get_papers와 같은 필터/순서/커서로 요청한 컬럼만 조회 (ORM 객체 대신 가벼운 Row 튜플, 속성 접근 가능)
+
+        abstract_chars를 주면 초록을 SQL에서 그 길이로 잘라 가져온다.
+        """
+        return self._select_papers(_projection(columns, abstract_chars), platform, categories, start_date, end_date,
+                                   limit, cursor)
+
+    def get_paper_rows_page(self, limit: int, cursor: Optional[str] = None, columns: Sequence[str] = LIST_COLUMNS,
+                            **kwargs) -> Tuple[List[Row], Optional[str]]:
+        """get_paper_rows 한 페이지와 다음 페이지 커서 (커서용 paper_id/updated_date는 항상 포함)"""
+        columns = list(columns) + [name for name in ('paper_id', 'updated_date') if name not in columns]
+        return _page(self.get_paper_rows(columns, limit=limit + 1, cursor=cursor, **kwargs), limit)
+
+    def get_paper_rows_by_ids(self, paper_ids: Iterable[str], columns: Sequence[str] = DETAIL_COLUMNS,
+                              abstract_chars: Optional[int] = None) -> Dict[str, Row]:
+        """paper_id -> 요청한 컬럼 Row, 한 번의 IN 쿼리 (검색 결과 하이드레이션용, 임베딩은 읽지 않음)"""
+        paper_ids = list(dict.fromkeys(paper_ids))
+        if not paper_ids:
+            return {}
+        entities = _projection(list(columns) + ([] if 'paper_id' in columns else ['paper_id']), abstract_chars)
         session = self.get_session()
         try:
-            query = session.query(Paper)
-            query = query.order_by(Paper.updated_date.desc())
-            if limit is not None:
-                query = query.limit(limit)
-            papers = query.all()
-            logger.info(f"DB returned {len(papers)} all papers (limit={limit})")
+            rows = session.query(*entities).filter(Paper.paper_id.in_(paper_ids)).all()
+        finally:
+            session.close()
+        return {row.paper_id: row for row in rows}
+
+    def _select_papers(self, entities: list, platform=None, categories=None, start_date: Optional[datetime] = None,
+                       end_date: Optional[datetime] = None, limit: Optional[int] = None,
+                       cursor: Optional[str] = None) -> list:
+        session = self.get_session()
+        try:
+            query = session.query(*entities)
+            platforms = [p.lower() for p in _as_list(platform)]
+            if platforms:
+                query = query.filter(_platform_key().in_(platforms))
+            categories = _as_list(categories)
+            if categories:
+                query = query.filter(_category_filter(categories))
+            if start_date:
+                query = query.filter(Paper.updated_date >= start_date)
+            if end_date:
+                query = query.filter(Paper.updated_date <= end_date)
+            after_date, after_id = decode_cursor(cursor) if cursor else (None, None)
+
+            papers = []
+            if after_id is None or after_date is not None:
+                # (updated_date, paper_id) 행 값 비교는 인덱스 범위 검색이 되어 페이지 깊이와 무관하게 limit개만 읽음.
+                # paper_id로 동점 정렬을 고정해야 커서 경계에서 누락/중복이 없음
+                dated = query.filter(Paper.updated_date.isnot(None))
+                if after_id is not None:
+                    dated = dated.filter(tuple_(Paper.updated_date, Paper.paper_id) < (after_date, after_id))
+                papers = dated.order_by(Paper.updated_date.desc(), Paper.paper_id.desc()).limit(limit).all()
+            if limit is None or len(papers) < limit:
+                # updated_date가 없는 논문은 날짜 있는 논문 뒤에 paper_id 역순으로
+                undated = query.filter(Paper.updated_date.is_(None))
+                if after_id is not None and after_date is None:
+                    undated = undated.filter(Paper.paper_id < after_id)
+                remaining = None if limit is None else limit - len(papers)
+                papers += undated.order_by(Paper.paper_id.desc()).limit(remaining).all()
             return papers
         finally:
             session.close()
+
+    def get_all_papers(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> List[Paper]:
+        """모든 논문을 최신 업데이트 날짜 기준으로 조회 (cursor로 다음 페이지)"""
+        papers = self.get_papers(limit=limit, cursor=cursor)
+        logger.info(f"DB returned {len(papers)} all papers (limit={limit})")
+        return papers
     
-    def search_papers(self, query: str, category: str = None, limit: int = 100) -> List[Paper]:
-        """제목/초록으로 논문 검색"""
+    def search_papers(self, query: str, category: str = None, limit: int = 100, prefix: bool = True,
+                      any_token: bool = False) -> List[Paper]:
+        """제목/초록/저자 전문 검색 (FTS5, BM25 관련도 순)
+
+        기본은 모든 검색어가 들어 있는 논문만 반환하고, any_token=True면 검색어 중 하나만 있어도 후보가 된다.
+        prefix=True면 각 검색어를 접두어로 일치시킨다 (예: "learn" -> learning).
+        반환된 Paper에는 일치 부분을 강조한 발췌(search_snippet)와 점수(search_score)가 붙는다.
+        """
+        hits = self.search_fulltext(query, limit=limit, category=category, prefix=prefix, any_token=any_token)
+        if not hits:
+            return []
         session = self.get_session()
         try:
-            search_query = f"%{query}%"
-            query_obj = session.query(Paper).filter(
-                (Paper.title.like(search_query)) | (Paper.abstract.like(search_query))
-            )
-
-            if category:
-                category_search = f"%\"%s\"%" % category # JSONB like for array
-                query_obj = query_obj.filter(Paper.categories.like(category_search))
-            
-            query_obj = query_obj.order_by(Paper.updated_date.desc()).limit(limit)
-            return query_obj.all()
+            papers = {paper.paper_id: paper for paper in
+                      session.query(Paper).filter(Paper.paper_id.in_([hit["paper_id"] for hit in hits]))}
         finally:
             session.close()
-    
+        results = []
+        for hit in hits:
+            paper = papers.get(hit["paper_id"])
+            if paper is not None:
+                paper.search_score = hit["score"]
+                paper.search_snippet = hit["snippet"]
+                results.append(paper)
+        return results
+
+    def search_fulltext(self, query: str, limit: int = 100, platform=None, category=None,
+                        start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        prefix: bool = False, any_token: bool = False) -> List[dict]:
+        """FTS5 BM25 전문 검색: {"paper_id", "score", "snippet"} 목록 (관련도 순, 일치 토큰은 SNIPPET_MARKERS로 강조)"""
+        rows = self._fulltext_query(query, limit, platform, category, start_date, end_date, prefix,
+                                    any_token=any_token, snippet=True)
+        return [{"paper_id": paper_id, "score": score, "snippet": snippet} for paper_id, score, snippet in rows]
+
+    def search_papers_bm25(self, query: str, limit: int = 100, platform=None, category=None,
+                           start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Tuple[str, float]]:
+        """FTS5 BM25 전문 검색: (paper_id, score) 목록, score가 클수록 관련도 높음
+
+        하이브리드 검색의 후보 단계라 검색어 중 하나만 있어도 일치(OR)시키고 순위는 BM25와 벡터 점수에 맡긴다.
+        """
+        return [(paper_id, score) for paper_id, score in
+                self._fulltext_query(query, limit, platform, category, start_date, end_date, any_token=True)]
+
+    def _fulltext_query(self, query: str, limit: int, platform=None, category=None,
+                        start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        prefix: bool = False, any_token: bool = False, snippet: bool = False) -> List[tuple]:
+        match = to_match_query(query, prefix=prefix, any_token=any_token)
+        if not match:
+            return []
+        _ensure_fulltext_index()
+
+        conditions = [f"{FTS_TABLE} MATCH :match"]
+        params = {"match": match, "limit": limit}
+        platforms = _as_list(platform)
+        if platforms:
+            names = [f":platform{i}" for i in range(len(platforms))]
+            # _platform_key와 같은 규칙: NULL 플랫폼은 arxiv로 취급
+            conditions.append(f"lower(coalesce(p.platform, 'arxiv')) IN ({', '.join(names)})")
+            params.update({f"platform{i}": value.lower() for i, value in enumerate(platforms)})
+        categories = _as_list(category)
+        if categories:
+            _ensure_category_index()
+            names = [f":category{i}" for i in range(len(categories))]
+            matches = [f"category IN ({', '.join(names)})"] + [f"category GLOB {name} || '.*'" for name in names]
+            conditions.append(f"p.paper_id IN (SELECT paper_id FROM {CATEGORY_TABLE} WHERE {' OR '.join(matches)})")
+            params.update({f"category{i}": value for i, value in enumerate(categories)})
+        # 하이브리드 검색의 FAISS 단계와 같은 결과가 되도록 날짜 단위 포함 구간 [start일 00:00, end 다음날 00:00)으로,
+        # 문자열 비교가 아닌 DateTime 타입 바인딩(저장 형식과 동일)으로 비교
+        date_binds = []
+        if start_date:
+            conditions.append("p.updated_date >= :start_date")
+            params["start_date"] = _day_start(start_date)
+            date_binds.append(bindparam("start_date", type_=Paper.updated_date.type))
+        if end_date:
+            conditions.append("p.updated_date < :end_before")
+            params["end_before"] = _day_start(end_date) + timedelta(days=1)
+            date_binds.append(bindparam("end_before", type_=Paper.updated_date.type))
+
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        columns = f"p.paper_id, bm25({FTS_TABLE}, {weights}) AS score"
+        if snippet:
+            columns += f", snippet({FTS_TABLE}, -1, :mark_open, :mark_close, '…', {SNIPPET_TOKENS})"
+            params["mark_open"], params["mark_close"] = SNIPPET_MARKERS
+        # bm25 순위와 LIMIT은 FTS 인덱스 안에서 처리되어 코퍼스가 커져도 일치 문서 수에만 비례
+        sql = text(f"""
+            SELECT {columns}
+            FROM {FTS_TABLE}
+            JOIN {FTS_ROWID_TABLE} r ON r.fts_rowid = {FTS_TABLE}.rowid
+            JOIN papers p ON p.paper_id = r.paper_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score
+            LIMIT :limit
+        """).bindparams(*date_binds)
+        session = self.get_session()
+        try:
+            # SQLite bm25()는 작을수록 관련도가 높으므로 부호를 뒤집어 반환
+            return [(row[0], -row[1]) + tuple(row[2:]) for row in session.execute(sql, params)]
+        finally:
+            session.close()
+
     def get_total_count(self) -> int:
         """총 논문 수"""
         session = self.get_session()
@@ -112,3 +563,26 @@ class PaperDatabase:
             return session.query(Paper).count()
         finally:
             session.close()
+
+    def get_platforms(self) -> List[str]:
+        """DB에 존재하는 플랫폼 목록 (소문자, 플랫폼 미지정은 기본값 arxiv)"""
+        session = self.get_session()
+        try:
+            return sorted(row[0] for row in session.query(_platform_key()).distinct())
+        finally:
+            session.close()
+
+    def get_index_checksum(self, platform: Optional[str] = None) -> dict:
+        """벡터 인덱스 최신 여부 판단용 체크섬 (행 수 + 최대 updated_date), platform 지정 시 샤드 단위"""
+        session = self.get_session()
+        try:
+            query = session.query(func.count(Paper.paper_id), func.max(Paper.updated_date))
+            if platform:
+                query = query.filter(_platform_key() == platform.lower())
+            row_count, max_updated = query.one()
+            return {
+                "row_count": row_count,
+                "max_updated_date": max_updated.isoformat() if max_updated else None,
+            }
+        finally:
+            session.close()
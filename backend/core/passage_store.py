@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .config import Config
+from .model_registry import get_embedding_manager, process_singleton
+from .models import PaperChunk
+from .query_cache import query_model_key
+from backend.db.connection import engine
+
+logger = logging.getLogger(__name__)
+
+# Retrieval queries that stand in for a section the analysis agents could not find by heading
+SECTION_QUERIES = {
+    'methodology': "proposed method approach model architecture algorithm training procedure experimental setup dataset",
+    'results': "experimental results evaluation performance accuracy improvement compared with baselines ablation",
+    'conclusion': "conclusion limitations drawbacks failure cases future work open problems",
+}
+
+
+def split_passages(text: str, chunk_words: int = Config.PASSAGE_CHUNK_WORDS,
+                   overlap_words: int = Config.PASSAGE_CHUNK_OVERLAP) -> List[str]:
+    """Overlapping word windows over text; each window starts overlap_words before the previous one ended."""
+    words = re.sub(r"\s+", " ", text or "").strip().split(" ")
+    if words == [""]:
+        return []
+    step = max(1, chunk_words - overlap_words)
+    passages = []
+    for start in range(0, len(words), step):
+        passages.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return passages
+
+
+def format_passages(passages: List[dict]) -> str:
+    """Prompt block of retrieved passages, in document order and numbered so the LLM can cite them."""
+    ordered = sorted(passages, key=lambda p: p['chunk_index'])
+    return "\n\n".join(f"[{p['chunk_index'] + 1}] {p['text']}" for p in ordered)
+
+
+class PassageStore:
+    """Chunk-level vector collection over paper full text, linked to paper_id.
+
+    Full text is split into overlapping passages, embedded in batches with the
+    shared embedding model and stored in the paper_chunks table. Chat and
+    analysis prompts then carry only the top-N passages for the question at hand
+    instead of the whole text. Retrieval is always within one paper, so a
+    paper's passage vectors are loaded in one query and scored exactly.
+    """
+
+    def __init__(self, embedding_manager=None):
+        self._embedding_manager = embedding_manager
+        self._table_ready = False
+
+    @property
+    def embedding_manager(self):
+        # Resolved through the model registry so the passage store shares the collections' SPECTER2 instance
+        return self._embedding_manager or get_embedding_manager(pin=True)
+
+    def _session(self) -> Session:
+        if not self._table_ready:
+            # Scripts and workers that never ran create_tables() still get the table
+            PaperChunk.__table__.create(engine, checkfirst=True)
+            self._table_ready = True
+        return Session(bind=engine)
+
+    def _source_hash(self, text: str) -> str:
+        model_id, adapter = query_model_key(self.embedding_manager)
+        return hashlib.sha256(f"{model_id}\x00{adapter}\x00{text}".encode('utf-8')).hexdigest()
+
+    def index_paper(self, paper_id: str, text: str) -> int:
+        """Chunk and embed text as paper_id's passages; a no-op when the same text and model are already indexed."""
+        source_hash = self._source_hash(text)
+        session = self._session()
+        try:
+            existing = session.query(PaperChunk.source_hash).filter(PaperChunk.paper_id == paper_id).first()
+            if existing is not None and existing[0] == source_hash:
+                return session.query(PaperChunk).filter(PaperChunk.paper_id == paper_id).count()
+
+            passages = split_passages(text)
+            # get_embeddings runs length-bucketed batches and skips passages already in the embedding cache
+            embeddings = self.embedding_manager.get_embeddings(passages) if passages else []
+            session.query(PaperChunk).filter(PaperChunk.paper_id == paper_id).delete(synchronize_session=False)
+            session.add_all([
+                PaperChunk(chunk_id=f"{paper_id}#{i}", paper_id=paper_id, chunk_index=i, text=passage,
+                           source_hash=source_hash, embedding=embedding)
+                for i, (passage, embedding) in enumerate(zip(passages, embeddings))
+            ])
+            session.commit()
+            logger.info(f"Indexed {len(passages)} passages for {paper_id}")
+            return len(passages)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def has_passages(self, paper_id: str) -> bool:
+        session = self._session()
+        try:
+            return session.query(PaperChunk.chunk_id).filter(PaperChunk.paper_id == paper_id).first() is not None
+        finally:
+            session.close()
+
+    def top_passages(self, paper_id: str, query: str, n: int = Config.PASSAGE_TOP_N) -> List[dict]:
+        """paper_id's n passages most similar (cosine) to query, best first; [] if the paper has none indexed."""
+        session = self._session()
+        try:
+            rows = (session.query(PaperChunk.chunk_index, PaperChunk.text, PaperChunk.embedding)
+                    .filter(PaperChunk.paper_id == paper_id, PaperChunk.embedding.isnot(None))
+                    .order_by(PaperChunk.chunk_index).all())
+        finally:
+            session.close()
+        if not rows or not query:
+            return []
+
+        matrix = np.stack([embedding for _, _, embedding in rows])
+        query_vector = np.asarray(self.embedding_manager.get_embedding(query, use_cache=False), dtype='float32')
+        if query_vector.shape[-1] != matrix.shape[1]:
+            logger.warning(f"Passages of {paper_id} were embedded with another model; re-index them")
+            return []
+        norms = np.linalg.norm(matrix, axis=1) * max(np.linalg.norm(query_vector), 1e-12)
+        scores = matrix @ query_vector / np.maximum(norms, 1e-12)
+        best = np.argsort(-scores)[:n]
+        return [{"chunk_index": rows[i][0], "text": rows[i][1], "score": float(scores[i])} for i in best]
+
+    def section_passages(self, paper_id: str, text: str, n: int = Config.PASSAGE_TOP_N) -> Dict[str, str]:
+        """Index text under paper_id and return {section: passages prompt block} for SECTION_QUERIES."""
+        self.index_paper(paper_id, text)
+        return {section: format_passages(self.top_passages(paper_id, query, n))
+                for section, query in SECTION_QUERIES.items()}
+
+    def delete_papers(self, paper_ids: Iterable[str]) -> int:
+        paper_ids = list(paper_ids)
+        if not paper_ids:
+            return 0
+        session = self._session()
+        try:
+            deleted = (session.query(PaperChunk).filter(PaperChunk.paper_id.in_(paper_ids))
+                       .delete(synchronize_session=False))
+            session.commit()
+            return deleted
+        finally:
+            session.close()
+
+    # PaperDatabase listener hooks (see paper_database.add_paper_listener)
+    def on_papers_saved(self, papers):
+        pass  # passages come from full text, which ingest does not carry
+
+    def on_papers_deleted(self, paper_ids):
+        self.delete_papers(paper_ids)
+
+
+async def attach_section_passages(sections: Dict[str, str], content: str, paper_id: Optional[str]):
+    """Fill sections the heading parser missed with their top passages from content, indexing the full text.
+
+    Filled sections go into the analysis prompt instead of head/tail truncation of the full text.
+    Failures are logged and leave sections as they were.
+    """
+    if not paper_id or len(content) < Config.PASSAGE_MIN_TEXT_CHARS:
+        return
+    try:
+        # Chunk embedding is CPU-bound; keep it off the event loop
+        passages = await asyncio.to_thread(get_passage_store().section_passages, paper_id, content)
+        for section, text in passages.items():
+            if not sections.get(section):
+                sections[section] = text
+        logger.info(f"Sections filled from passages: {[s for s, t in passages.items() if t]}")
+    except Exception as e:
+        logger.error(f"Passage retrieval failed for {paper_id}: {e}", exc_info=True)
+
+
+def get_passage_store() -> PassageStore:
+    """Shared PassageStore singleton."""
+    return process_singleton('passage_store', PassageStore)
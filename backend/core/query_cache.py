@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import Config
+from .embedding_cache import normalize_text
+from .model_registry import process_singleton
+
+logger = logging.getLogger(__name__)
+
+
+def query_model_key(embedding_manager) -> Tuple[str, str]:
+    """Model version a query vector belongs to: base model (plus inference backend) and adapter."""
+    model_id = getattr(embedding_manager, 'cache_model_id', None) or getattr(embedding_manager, 'base_model_name', '')
+    return model_id, getattr(embedding_manager, 'model_name', '')
+
+
+class QueryEmbeddingCache:
+    """Bounded in-memory LRU + TTL cache of query text -> embedding, keyed by model version.
+
+    Dashboards poll the same interests over and over; a hit skips the transformer
+    forward pass entirely. Query frequencies are counted so the most common
+    queries can be persisted and embedded ahead of time at the next startup.
+    """
+
+    def __init__(self, max_entries: int = Config.QUERY_CACHE_SIZE, ttl_seconds: float = Config.QUERY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[np.ndarray, float]]" = OrderedDict()
+        self._frequency: Counter = Counter()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get_many(self, model_key: Hashable, queries: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the queries that have a live entry; counts a hit or miss per query."""
+        now = time.monotonic()
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for query in queries:
+                text = normalize_text(query)
+                self._frequency[text] += 1
+                key = (model_key, text)
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] < now:
+                    del self._entries[key]
+                    self.expired += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found[query] = entry[0]
+            self._trim_frequency()
+        return found
+
+    def put_many(self, model_key: Hashable, vectors: Dict[str, np.ndarray]):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for query, vector in vectors.items():
+                key = (model_key, normalize_text(query))
+                self._entries[key] = (np.asarray(vector, dtype='float32'), expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _trim_frequency(self):
+        # Keep the counter bounded: drop the long tail once it grows well past the cache size
+        if len(self._frequency) > 10 * self.max_entries:
+            self._frequency = Counter(dict(self._frequency.most_common(self.max_entries)))
+
+    def most_frequent(self, n: int) -> List[str]:
+        with self._lock:
+            return [text for text, _ in self._frequency.most_common(n)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def save_frequent(self, path: str = Config.QUERY_CACHE_FREQUENT_PATH, n: int = Config.QUERY_CACHE_WARMUP_TOP):
+        """Persist the top-n query texts (with counts) for warm-up after a restart."""
+        with self._lock:
+            top = self._frequency.most_common(n)
+        if not top:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(top, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load_frequent(self, path: str = Config.QUERY_CACHE_FREQUENT_PATH) -> List[str]:
+        """Query texts saved by save_frequent, most frequent first; their counts seed the frequency table."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                top = json.load(f)
+        except (OSError, ValueError):
+            return []
+        with self._lock:
+            for text, count in top:
+                self._frequency[text] += count
+        return [text for text, _ in top]
+
+
+def warm_up(collection, queries: Iterable[str], cache: Optional[QueryEmbeddingCache] = None) -> int:
+    """Embed the given queries for collection in one batch so their first request is a cache hit."""
+    cache = cache or get_query_cache()
+    queries = [q for q in dict.fromkeys(queries) if q]
+    if not queries:
+        return 0
+    model_key = query_model_key(collection.embedding_manager)
+    vectors = collection.embed_texts(queries, use_cache=False)
+    cache.put_many(model_key, dict(zip(queries, vectors)))
+    logger.info(f"Query embedding cache warmed with {len(queries)} queries")
+    return len(queries)
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    """Shared QueryEmbeddingCache singleton."""
+    return process_singleton('query_cache', QueryEmbeddingCache)
@@ -0,0 +1,21 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Standard RRF constant; damps the advantage of the very top ranks
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], weights: Optional[Sequence[float]] = None,
+                           k: int = RRF_K, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+    """Fuse several ranked id lists into one: score(id) = sum_i weight_i / (k + rank_i(id)).
+
+    Only ranks are used, so lists scored with different metrics (L2 distance,
+    inner product, BM25) can be fused directly. Returns (id, score) best first.
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+    fused = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    return fused[:limit] if limit is not None else fused
@@ -1,49 +1,49 @@
 import os
+import copy
 import json
+import threading
 import sqlite3
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional, Tuple
-from sentence_transformers import SentenceTransformer
-import faiss
 from datetime import datetime, timedelta
 from sklearn.preprocessing import normalize
 from sklearn.cluster import KMeans
 import logging
+from .config import Config
+from .index_bundle import GenerationStore
+from .index_factory import RESCORE_FACTOR
+from .paper_database import PaperDatabase
+from .vector_store import document_text, get_vector_store
 
 logger = logging.getLogger(__name__)
 
+# 인덱스 세대 교체 시 한 번에 바뀌는 상태 필드
+SNAPSHOT_FIELDS = ('paper_ids', 'papers_df', 'paper_clusters', 'cluster_model', 'cluster_popularity', 'generation')
+
 class ModernRecommendationEngine:
     def __init__(self, db_path: str = None, model_cache_dir: str = None):
-        self.db_path = db_path or "papers.db"
+        # 공유 벡터 컬렉션과 같은 DB를 읽어야 within=self.paper_ids 검색에 모든 논문이 잡힘
+        self.db_path = db_path or Config.DATABASE_PATH
         self.model_cache_dir = model_cache_dir or "models"
         
         os.makedirs(self.model_cache_dir, exist_ok=True)
         
-        logger.info("SPECTER2 모델 로딩 중...")
-        try:
-            # SPECTER2: 논문 특화 임베딩 모델
-            self.specter_model = SentenceTransformer('allenai/specter2')
-            logger.info("✅ SPECTER2 모델 로드 성공")
-        except Exception as e:
-            logger.error(f"SPECTER2 로드 실패: {e}")
-            # SciBERT로 폴백
-            try:
-                self.specter_model = SentenceTransformer('allenai/scibert_scivocab_uncased')
-                logger.info("✅ SciBERT 모델 로드 성공 (폴백)")
-            except Exception as e2:
-                logger.error(f"SciBERT도 실패: {e2}")
-                # all-MiniLM으로 최종 폴백
-                self.specter_model = SentenceTransformer('all-MiniLM-L6-v2')
-                logger.info("✅ MiniLM 모델 로드 성공 (최종 폴백)")
+        # 임베딩 모델, 벡터, Faiss 인덱스는 공유 벡터 스토어의 SPECTER2 컬렉션을 사용 (프로세스당 1벌)
+        self.collection = get_vector_store().collection()
         
         # 데이터 저장소
-        self.paper_embeddings = None
         self.paper_ids = []
         self.papers_df = None
-        self.faiss_index = None
         self.paper_clusters = None
         self.cluster_model = None
+        self.cluster_popularity = {}
+        
+        # 세대별 캐시 스냅샷: models/recommendation_index/gen-NNNNNN, CURRENT 포인터로 원자적 게시
+        self.cache_store = GenerationStore(os.path.join(self.model_cache_dir, 'recommendation_index'))
+        self.generation = 0
+        self._snapshot = None  # 요청이 시작 시점에 잡는 읽기 전용 엔진 사본
+        self._build_lock = threading.Lock()
         
         # 사용자 프로필 시뮬레이션을 위한 데이터
         self.user_preferences = {}
@@ -57,7 +57,7 @@ class ModernRecommendationEngine:
             conn = sqlite3.connect(self.db_path)
             
             query = """
-            SELECT paper_id, title, abstract, authors, categories, 
+            SELECT paper_id, platform, title, abstract, authors, categories, 
                    published_date, updated_date
             FROM papers 
             WHERE abstract IS NOT NULL AND title IS NOT NULL
@@ -77,51 +77,39 @@ class ModernRecommendationEngine:
             logger.error(f"논문 데이터 로드 실패: {e}")
             raise
 
+    @property
+    def is_initialized(self) -> bool:
+        return bool(self.paper_ids)
+
     def generate_paper_embeddings(self, papers_df: pd.DataFrame) -> np.ndarray:
-        """SPECTER2로 고품질 논문 임베딩 생성"""
-        logger.info("🧠 SPECTER2 임베딩 생성 시작...")
-        
-        # 논문 텍스트 준비 (제목 + 초록)
-        paper_texts = []
-        for _, row in papers_df.iterrows():
-            # SPECTER2에 최적화된 형식
-            text = f"Title: {row['title']}\nAbstract: {row['abstract']}"
-            paper_texts.append(text)
-        
-        # SPECTER2 임베딩 생성
-        embeddings = self.specter_model.encode(
-            paper_texts,
-            batch_size=8,  # 메모리 최적화
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            normalize_embeddings=True  # 코사인 유사도 최적화
-        )
-        
-        self.paper_embeddings = embeddings
-        self.paper_ids = papers_df['paper_id'].tolist()
-        
-        logger.info(f"✅ 임베딩 생성 완료: {embeddings.shape}")
-        return embeddings
+        """벡터 스토어에서 논문 임베딩 조회, 없는 논문만 한 번에 임베딩하여 DB에 저장
 
-    def build_faiss_index(self, embeddings: np.ndarray):
-        """Faiss로 고성능 벡터 검색 인덱스 구축"""
-        logger.info("⚡ Faiss 인덱스 구축 중...")
-        
-        # Inner Product 인덱스 (정규화된 벡터에서 코사인 유사도와 동일)
-        index = faiss.IndexFlatIP(embeddings.shape[1])
-        
-        # GPU 사용 가능하면 GPU 인덱스 사용
-        try:
-            if faiss.get_num_gpus() > 0:
-                index = faiss.index_cpu_to_gpu(faiss.StandardGpuResources(), 0, index)
-                logger.info("🚀 GPU 가속 인덱스 사용")
-        except:
-            logger.info("💻 CPU 인덱스 사용")
-        
-        index.add(embeddings.astype('float32'))
-        
-        self.faiss_index = index
-        logger.info(f"✅ Faiss 인덱스 구축 완료: {index.ntotal}개 벡터")
+        저장은 PaperDatabase를 거치므로 리스너(벡터 스토어)가 플랫폼 샤드로 라우팅하고, 재시작 후에도 다시 임베딩하지 않는다.
+
+        반환값은 클러스터링용 정규화 사본이며 보관하지 않는다.
+        """
+        paper_ids = papers_df['paper_id'].tolist()
+        vectors = self.collection.get_vectors(paper_ids)
+        
+        missing = papers_df[~papers_df['paper_id'].isin(list(vectors))]
+        if not missing.empty:
+            logger.info(f"🧠 SPECTER2 임베딩 생성: 스토어에 없는 논문 {len(missing)}개")
+            texts = [document_text(row['title'], row['abstract']) for _, row in missing.iterrows()]
+            embeddings = self.collection.embed_texts(texts)
+            new_vectors = dict(zip(missing['paper_id'], embeddings))
+            vectors.update(new_vectors)
+            saved = PaperDatabase().update_embeddings(new_vectors)
+            if saved < len(new_vectors):
+                # 공유 DB에 없는 논문은 벡터 인덱스에 들어가지 못해 콘텐츠 기반 추천이 조용히 비게 됨
+                raise ValueError(f"{len(new_vectors) - saved}개 논문이 공유 DB({Config.DATABASE_PATH})에 없음: "
+                                 f"추천 엔진 DB({self.db_path})는 벡터 인덱스와 같은 DB여야 함")
+            logger.info(f"임베딩 캐시: {self.collection.embedding_manager.cache_stats()}")
+        
+        embeddings = normalize(np.stack([vectors[pid] for pid in paper_ids]).astype('float32'))  # 코사인 유사도 기준
+        self.paper_ids = paper_ids
+        
+        logger.info(f"✅ 임베딩 준비 완료: {embeddings.shape}")
+        return embeddings
 
     def create_paper_clusters(self, embeddings: np.ndarray, n_clusters: int = 50):
         """논문을 주제별로 클러스터링"""
@@ -169,39 +157,50 @@ class ModernRecommendationEngine:
 
     def get_content_based_recommendations(self, paper_id: str, n_recommendations: int = 10) -> List[Dict]:
         """SPECTER2 기반 의미적 유사성 추천"""
+        if paper_id not in self.paper_ids:
+            logger.warning(f"❌ 논문 ID {paper_id}를 찾을 수 없음")
+            return []
+        return self.get_content_based_recommendations_batch([paper_id], n_recommendations).get(paper_id, [])
+
+    def get_content_based_recommendations_batch(self, paper_ids: List[str], n_recommendations: int = 10) -> Dict[str, List[Dict]]:
+        """여러 시드 논문의 의미적 유사성 추천을 한 번의 Faiss 검색으로 생성 (시드별 결과 dict)"""
         try:
-            if paper_id not in self.paper_ids:
-                logger.warning(f"❌ 논문 ID {paper_id}를 찾을 수 없음")
-                return []
-            
-            paper_idx = self.paper_ids.index(paper_id)
-            query_embedding = self.paper_embeddings[paper_idx:paper_idx+1]
-            
-            # Faiss로 유사 논문 검색
-            scores, indices = self.faiss_index.search(
-                query_embedding.astype('float32'),
-                n_recommendations + 1  # 자기 자신 제외
-            )
-            
-            recommendations = []
-            for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-                if idx != paper_idx:  # 자기 자신 제외
-                    recommendations.append({
-                        'paper_id': self.paper_ids[idx],
-                        'similarity_score': float(score),
-                        'rank': len(recommendations) + 1,
-                        'method': 'semantic_similarity'
-                    })
-                
-                if len(recommendations) >= n_recommendations:
-                    break
-            
-            logger.info(f"🎯 의미적 유사성 추천 {len(recommendations)}개 생성")
-            return recommendations
+            known = set(self.paper_ids)
+            seed_vectors = self.collection.get_vectors([pid for pid in dict.fromkeys(paper_ids) if pid in known])
+            if not seed_vectors:
+                return {}
+            seeds = list(seed_vectors)
+            query_embeddings = np.stack([seed_vectors[pid] for pid in seeds])
+            
+            # (시드 수, d) 행렬로 한 번에 검색, 이 엔진이 로드한 논문으로 범위 한정
+            # 공유 컬렉션은 L2 거리이므로 후보를 넉넉히 가져와 코사인 유사도로 다시 정렬
+            rows = self.collection.search_vectors(query_embeddings, (n_recommendations + 1) * RESCORE_FACTOR,
+                                                  within=self.paper_ids)
+            result_vectors = self.collection.get_vectors({pid for row in rows for pid, _ in row})
+            
+            results = {}
+            for pid, query_embedding, row in zip(seeds, query_embeddings, rows):
+                candidates = [rec_id for rec_id, _ in row if rec_id != pid and rec_id in result_vectors]  # 자기 자신 제외
+                if not candidates:
+                    results[pid] = []
+                    continue
+                matrix = np.stack([result_vectors[rec_id] for rec_id in candidates])
+                scores = matrix @ query_embedding / np.maximum(
+                    np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_embedding), 1e-12)
+                order = np.argsort(-scores)[:n_recommendations]
+                results[pid] = [{
+                    'paper_id': candidates[i],
+                    'similarity_score': float(scores[i]),
+                    'rank': rank,
+                    'method': 'semantic_similarity'
+                } for rank, i in enumerate(order, start=1)]
+            
+            logger.info(f"🎯 의미적 유사성 추천 생성: 시드 {len(seeds)}개")
+            return results
             
         except Exception as e:
             logger.error(f"콘텐츠 기반 추천 실패: {e}")
-            return []
+            return {}
 
     def get_cluster_based_recommendations(self, paper_id: str, n_recommendations: int = 10) -> List[Dict]:
         """클러스터 기반 추천 (주제별 협업 필터링)"""
@@ -358,106 +357,146 @@ class ModernRecommendationEngine:
             return []
 
     def initialize_system(self, force_rebuild: bool = False):
-        """추천 시스템 초기화"""
-        logger.info("🚀 현대적 추천 시스템 초기화 시작...")
-        
-        # 캐시 파일 경로
-        embeddings_cache = os.path.join(self.model_cache_dir, 'specter2_embeddings.npy')
-        index_cache = os.path.join(self.model_cache_dir, 'faiss_index.bin')
-        clusters_cache = os.path.join(self.model_cache_dir, 'paper_clusters.npy')
-        metadata_cache = os.path.join(self.model_cache_dir, 'metadata.json')
-        
-        if not force_rebuild and os.path.exists(embeddings_cache) and os.path.exists(metadata_cache):
-            logger.info("💾 캐시에서 모델 로드 중...")
-            try:
-                # 임베딩 로드
-                self.paper_embeddings = np.load(embeddings_cache)
-                
-                # 메타데이터 로드
-                with open(metadata_cache, 'r') as f:
-                    metadata = json.load(f)
-                    self.paper_ids = metadata['paper_ids']
-                
-                # Faiss 인덱스 로드
-                if os.path.exists(index_cache):
-                    self.faiss_index = faiss.read_index(index_cache)
-                else:
-                    self.build_faiss_index(self.paper_embeddings)
-                
-                # 클러스터 로드
-                if os.path.exists(clusters_cache):
-                    self.paper_clusters = np.load(clusters_cache)
-                    self._calculate_cluster_popularity()
-                
-                # papers_df 로드
-                self.papers_df = self.load_papers_from_db()
-                
-                logger.info("✅ 캐시에서 모델 로드 완료")
+        """추천 시스템 초기화
+
+        새 상태는 별도 사본에 구축한 뒤 한 번에 교체하므로, 재구축 중에도 기존 스냅샷으로 추천이 계속 제공된다.
+        """
+        with self._build_lock:
+            logger.info("🚀 현대적 추천 시스템 초기화 시작...")
+            
+            generation = self.cache_store.current_generation()
+            if not force_rebuild and generation is not None:
+                logger.info("💾 캐시에서 모델 로드 중...")
+                try:
+                    self._swap_snapshot(self._load_generation(generation))
+                    logger.info(f"✅ 캐시에서 모델 로드 완료 (세대 {generation})")
+                    return
+                except Exception as e:
+                    logger.warning(f"⚠️ 캐시 로드 실패, 새로 구축: {e}")
+            
+            staging = self._new_staging()
+            
+            # 새로 구축
+            papers_df = staging.load_papers_from_db(limit=3000)  # 성능과 품질의 균형
+            
+            if papers_df.empty:
+                logger.error("❌ 논문 데이터가 없습니다")
                 return
-                
+            
+            staging.papers_df = papers_df
+            
+            # SPECTER2 임베딩 (벡터 스토어에서 조회, 없는 것만 생성)
+            embeddings = staging.generate_paper_embeddings(papers_df)
+            
+            # 클러스터링 수행
+            staging.create_paper_clusters(embeddings)
+            
+            # 캐시 저장 (새 세대 디렉토리에 쓴 뒤 CURRENT 교체로 게시)
+            try:
+                staging.generation = self.cache_store.publish(staging._write_cache_files)
+                logger.info(f"💾 모델 캐시 저장 완료 (세대 {staging.generation})")
             except Exception as e:
-                logger.warning(f"⚠️ 캐시 로드 실패, 새로 구축: {e}")
-        
-        # 새로 구축
-        papers_df = self.load_papers_from_db(limit=3000)  # 성능과 품질의 균형
+                logger.warning(f"⚠️ 캐시 저장 실패: {e}")
+            
+            self._swap_snapshot(staging)
+            logger.info("🎉 현대적 추천 시스템 초기화 완료!")
+
+    def rebuild_in_background(self) -> bool:
+        """백그라운드 스레드에서 재구축. 이미 진행 중이면 False"""
+        if self._build_lock.locked():
+            return False
         
-        if papers_df.empty:
-            logger.error("❌ 논문 데이터가 없습니다")
-            return
+        def run():
+            try:
+                self.initialize_system(force_rebuild=True)
+            except Exception as e:
+                logger.error(f"추천 인덱스 백그라운드 재구축 실패: {e}", exc_info=True)
         
-        self.papers_df = papers_df
+        threading.Thread(target=run, name="recommendation-rebuild", daemon=True).start()
+        return True
+
+    def reload_if_stale(self) -> bool:
+        """다른 프로세스가 더 새로운 세대를 게시했으면 로드해서 교체"""
+        generation = self.cache_store.current_generation()
+        if generation is None or generation <= self.generation or self._build_lock.locked():
+            return False
+        with self._build_lock:
+            if generation <= self.generation:
+                return False
+            try:
+                self._swap_snapshot(self._load_generation(generation))
+            except Exception as e:
+                logger.warning(f"⚠️ 추천 인덱스 세대 {generation} 로드 실패, 세대 {self.generation} 유지: {e}")
+                return False
+        logger.info(f"🔄 추천 인덱스 세대 {generation}로 교체")
+        return True
+
+    def _new_staging(self) -> 'ModernRecommendationEngine':
+        # 모델은 공유하고 상태 필드만 새로 채울 사본
+        staging = copy.copy(self)
+        staging._snapshot = None
+        return staging
+
+    def _swap_snapshot(self, staging: 'ModernRecommendationEngine'):
+        # 진행 중인 요청은 이전 _snapshot 참조로 끝까지 처리됨
+        self._snapshot = staging
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, getattr(staging, field))
+
+    def _write_cache_files(self, cache_dir: str):
+        np.save(os.path.join(cache_dir, 'paper_clusters.npy'), self.paper_clusters)
+        
+        metadata = {
+            'paper_ids': self.paper_ids,
+            'created_at': datetime.now().isoformat(),
+            'paper_count': len(self.paper_ids),
+            'model_type': 'SPECTER2',
+            'vector_collection': self.collection.index_path
+        }
         
-        # SPECTER2 임베딩 생성
-        embeddings = self.generate_paper_embeddings(papers_df)
+        with open(os.path.join(cache_dir, 'metadata.json'), 'w') as f:
+            json.dump(metadata, f)
+
+    def _load_generation(self, generation: int) -> 'ModernRecommendationEngine':
+        cache_dir = self.cache_store.path(generation)
+        staging = self._new_staging()
         
-        # Faiss 인덱스 구축
-        self.build_faiss_index(embeddings)
+        # 메타데이터 로드 (벡터와 인덱스는 벡터 스토어가 보유)
+        with open(os.path.join(cache_dir, 'metadata.json'), 'r') as f:
+            metadata = json.load(f)
+            staging.paper_ids = metadata['paper_ids']
         
-        # 클러스터링 수행
-        self.create_paper_clusters(embeddings)
+        # papers_df 로드
+        staging.papers_df = staging.load_papers_from_db()
         
-        # 캐시 저장
-        try:
-            np.save(embeddings_cache, self.paper_embeddings)
-            faiss.write_index(self.faiss_index, index_cache)
-            np.save(clusters_cache, self.paper_clusters)
-            
-            metadata = {
-                'paper_ids': self.paper_ids,
-                'created_at': datetime.now().isoformat(),
-                'paper_count': len(self.paper_ids),
-                'model_type': 'SPECTER2'
-            }
-            
-            with open(metadata_cache, 'w') as f:
-                json.dump(metadata, f)
-            
-            logger.info("💾 모델 캐시 저장 완료")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ 캐시 저장 실패: {e}")
+        # 클러스터 로드
+        staging.paper_clusters = np.load(os.path.join(cache_dir, 'paper_clusters.npy'))
+        staging._calculate_cluster_popularity()
         
-        logger.info("🎉 현대적 추천 시스템 초기화 완료!")
+        staging.generation = generation
+        return staging
 
     def get_recommendations_for_paper(self, paper_id: str, recommendation_type: str = 'hybrid', n_recommendations: int = 10) -> Dict:
         """논문에 대한 추천 생성"""
-        if self.paper_embeddings is None:
+        self.reload_if_stale()
+        engine = self._snapshot or self  # 요청 도중 세대가 바뀌어도 같은 스냅샷으로 처리
+        if not engine.is_initialized:
             logger.error("❌ 추천 시스템이 초기화되지 않았습니다")
             return {'error': '추천 시스템이 초기화되지 않았습니다'}
         
         if recommendation_type == 'content':
-            recommendations = self.get_content_based_recommendations(paper_id, n_recommendations)
+            recommendations = engine.get_content_based_recommendations(paper_id, n_recommendations)
         elif recommendation_type == 'hybrid':
-            recommendations = self.get_hybrid_recommendations(paper_id, n_recommendations)
+            recommendations = engine.get_hybrid_recommendations(paper_id, n_recommendations)
         else:
-            recommendations = self.get_content_based_recommendations(paper_id, n_recommendations)
+            recommendations = engine.get_content_based_recommendations(paper_id, n_recommendations)
         
         if not recommendations:
             return {'error': '추천을 생성할 수 없습니다'}
         
         # 추천된 논문들의 상세 정보 조회
         recommended_paper_ids = [rec['paper_id'] for rec in recommendations]
-        paper_details = self.get_paper_details(recommended_paper_ids)
+        paper_details = engine.get_paper_details(recommended_paper_ids)
         
         # 추천 점수와 논문 정보 결합
         result = []
@@ -486,7 +525,6 @@ def get_recommendation_engine():
     """추천 엔진 싱글톤 인스턴스 반환"""
     global recommendation_engine
     if recommendation_engine is None:
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'papers.db')
         model_cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models')
-        recommendation_engine = ModernRecommendationEngine(db_path, model_cache_dir)
+        recommendation_engine = ModernRecommendationEngine(Config.DATABASE_PATH, model_cache_dir)
     return recommendation_engine
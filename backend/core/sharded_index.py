@@ -0,0 +1,171 @@
+import heapq
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import Config
+from .embedding_manager import EmbeddingManager
+from .faiss_manager import FAISSManager, VectorSearchMixin, _paper_field, shard_key
+from .model_registry import get_embedding_manager
+from .index_filters import _as_list
+from .paper_database import PaperDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedFAISSManager(VectorSearchMixin):
+    """One FAISSManager per platform, searched as a single collection.
+
+    Each shard has its own bundle (``<stem>.<platform>.faiss``), checksum and
+    generation, so it is built, loaded and rebuilt on its own: re-crawling
+    bioRxiv republishes only the biorxiv shard. A query fans out to the shards
+    (to just one for a platform-restricted query), in a thread pool when
+    parallel=True since faiss releases the GIL, and per-shard top-k lists are
+    heap-merged by distance. Only platforms with rows get a shard up front;
+    the other configured ``platforms`` get theirs on first add.
+    """
+
+    def __init__(self, index_path: str = "arxiv_papers.faiss", platforms: Iterable[str] = Config.VECTOR_SHARD_PLATFORMS,
+                 parallel: bool = Config.VECTOR_SHARD_PARALLEL, embedding_manager: Optional[EmbeddingManager] = None,
+                 **manager_kwargs):
+        self.index_path = index_path
+        self.parallel = parallel
+        self.paper_db = PaperDatabase()
+        self.embedding_manager = embedding_manager or get_embedding_manager(pin=True)
+        self.dimension = self.embedding_manager.dimension
+        self._manager_kwargs = manager_kwargs
+        self.shards: Dict[str, FAISSManager] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pool_size = 0
+        # Configured platforms plus any other platform already in the DB; only those with rows are opened
+        # now, the rest get their shard on first add (see shard())
+        populated = set(self.paper_db.get_platforms())
+        self.platforms = sorted(set(shard_key(p) for p in platforms) | populated)
+        for platform in sorted(populated):
+            self.shard(platform)
+
+    def shard(self, platform: str) -> FAISSManager:
+        """The shard for platform, loaded or built on first use."""
+        key = shard_key(platform)
+        with self._lock:
+            if key not in self.shards:
+                stem, ext = os.path.splitext(self.index_path)
+                self.shards[key] = FAISSManager(index_path=f"{stem}.{key}{ext}", platform=key,
+                                                embedding_manager=self.embedding_manager, **self._manager_kwargs)
+            return self.shards[key]
+
+    @property
+    def ntotal(self) -> int:
+        return sum(shard.ntotal for shard in self.shards.values())
+
+    @property
+    def generation(self) -> Dict[str, int]:
+        return {platform: shard.generation for platform, shard in self.shards.items()}
+
+    def _targets(self, platform=None) -> List[FAISSManager]:
+        platforms = _as_list(platform)
+        if not platforms:
+            return list(self.shards.values())
+        return [self.shards[key] for key in dict.fromkeys(shard_key(p) for p in platforms) if key in self.shards]
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Thread pool sized to the shards that exist, regrown when a new shard is created."""
+        with self._lock:
+            if self._pool_size < len(self.shards):
+                previous = self._executor
+                self._pool_size = len(self.shards)
+                self._executor = ThreadPoolExecutor(max_workers=self._pool_size, thread_name_prefix="faiss-shard")
+                if previous is not None:
+                    previous.shutdown(wait=False)
+            return self._executor
+
+    def _map(self, fn, shards: List[FAISSManager]) -> list:
+        if not self.parallel or len(shards) < 2:
+            return [fn(shard) for shard in shards]
+        return list(self._pool().map(fn, shards))
+
+    def contains(self, paper_id: str) -> bool:
+        return any(shard.contains(paper_id) for shard in self.shards.values())
+
+    def embed_texts(self, texts: List[str], use_cache: bool = True) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimension), dtype='float32')
+        return np.asarray(self.embedding_manager.get_embeddings(texts, use_cache=use_cache), dtype='float32')
+
+    def get_vectors(self, paper_ids: Iterable[str], fallback_db: bool = True) -> Dict[str, np.ndarray]:
+        paper_ids = list(paper_ids)
+        vectors = {}
+        for shard in self.shards.values():
+            vectors.update(shard.get_vectors([pid for pid in paper_ids if pid not in vectors and shard.contains(pid)],
+                                             fallback_db=False))
+        missing = [pid for pid in paper_ids if pid not in vectors]
+        if missing and fallback_db:
+            # Any shard reads DB embeddings the same way
+            vectors.update(next(iter(self.shards.values())).get_vectors(missing) if self.shards else {})
+        return vectors
+
+    def search_vectors(self, vectors: np.ndarray, k: int = 10, within: Optional[Iterable[str]] = None,
+                       platform=None, **filters) -> List[List[Tuple[str, float]]]:
+        """Per-row top-k (paper_id, distance) merged across the shards the platform filter selects."""
+        vectors = np.ascontiguousarray(vectors, dtype='float32')
+        within = list(within) if within is not None else None
+        shards = [shard for shard in self._targets(platform) if shard.ntotal]
+        per_shard = self._map(lambda shard: shard.search_vectors(vectors, k, within=within, **filters), shards)
+
+        rows = []
+        for i in range(len(vectors)):
+            # Shards hold disjoint papers and share one metric, so distances compare directly
+            rows.append(heapq.nsmallest(k, (hit for shard_rows in per_shard for hit in shard_rows[i]),
+                                        key=lambda hit: hit[1]))
+        return rows
+
+    def add_papers(self, papers: Iterable[Any], persist: bool = True) -> int:
+        """Route papers to their platform shard; only touched shards are republished.
+
+        A paper whose platform changed is dropped from the shard that held it, so it is never indexed twice.
+        """
+        by_shard: Dict[str, List[Any]] = {}
+        for paper in papers:
+            by_shard.setdefault(shard_key(_paper_field(paper, 'platform')), []).append(paper)
+        for key, group in by_shard.items():
+            # Only papers that carry a vector move; a metadata-only update leaves the old vector where it is
+            moving = [_paper_field(paper, 'paper_id') for paper in group if _paper_field(paper, 'embedding') is not None]
+            for other_key, shard in list(self.shards.items()):
+                owned = [pid for pid in moving if other_key != key and shard.contains(pid)]
+                if owned:
+                    shard.remove_papers(owned, persist=persist)
+        return sum(self.shard(key).add_papers(group, persist=persist) for key, group in by_shard.items())
+
+    def remove_papers(self, paper_ids: Iterable[str], persist: bool = True) -> int:
+        paper_ids = list(paper_ids)
+        removed = 0
+        for shard in list(self.shards.values()):
+            owned = [pid for pid in paper_ids if shard.contains(pid)]
+            if owned:
+                removed += shard.remove_papers(owned, persist=persist)
+        return removed
+
+    def flush(self) -> bool:
+        """Publish pending incremental updates of every shard."""
+        return any([shard.flush() for shard in list(self.shards.values())])
+
+    # PaperDatabase listener hooks (see paper_database.add_paper_listener)
+    def on_papers_saved(self, papers: List[Any]):
+        self.add_papers(papers)
+
+    def on_papers_deleted(self, paper_ids: List[str]):
+        self.remove_papers(paper_ids)
+
+    def refresh_if_stale(self) -> bool:
+        return any([shard.refresh_if_stale() for shard in list(self.shards.values())])
+
+    def rebuild_index(self, platform=None, background: bool = False) -> bool:
+        """Rebuild the given platform shard(s), or all shards; the others keep serving untouched."""
+        platforms = _as_list(platform) or list(self.shards)
+        started = [self.shard(p).rebuild_index(background=background) for p in platforms]
+        return any(started)
@@ -0,0 +1,82 @@
+import os
+import logging
+import threading
+from typing import Dict, List, Optional, Union
+
+from .config import Config
+from .embedding_manager import EmbeddingManager
+from .faiss_manager import FAISSManager
+from .model_registry import get_embedding_manager, process_singleton
+from .sharded_index import ShardedFAISSManager
+
+logger = logging.getLogger(__name__)
+
+
+def document_text(title: Optional[str], abstract: Optional[str]) -> str:
+    """Text a paper is embedded from; ingest and on-demand embedding must agree on it."""
+    return f"{title or ''}. {abstract or ''}"
+
+
+class VectorStore:
+    """Process-wide owner of embedding models and named vector collections.
+
+    A collection is a FAISSManager (index, id map, facets, published bundle), or a
+    ShardedFAISSManager with one per platform, bound to one embedding model/version
+    from Config.VECTOR_COLLECTIONS. Collections
+    using the same model share one EmbeddingManager, so the search endpoints,
+    the recommendation engine and the discovery agent hold one copy of the
+    model and the vectors, and one ingest listener keeps them all current.
+    Embedding models come from the process-wide model registry, so crawlers
+    and other callers outside the store share the same instance.
+    """
+
+    def __init__(self, root_dir: str = Config.VECTOR_STORE_DIR, collections: Dict[str, dict] = None):
+        self.root_dir = root_dir
+        self.specs = collections if collections is not None else Config.VECTOR_COLLECTIONS
+        self._collections: Dict[str, Union[FAISSManager, ShardedFAISSManager]] = {}
+        self._lock = threading.RLock()
+
+    def embedder(self, model: str, base_model: str) -> EmbeddingManager:
+        # Collections keep their embedder for good, so it is pinned in the registry
+        return get_embedding_manager(model_name=model, base_model_name=base_model, pin=True)
+
+    def index_path(self, name: str) -> str:
+        return os.path.join(self.root_dir, f"{name}-v{self.specs[name]['version']}.faiss")
+
+    def collection(self, name: str = Config.DEFAULT_VECTOR_COLLECTION) -> Union[FAISSManager, ShardedFAISSManager]:
+        """The named collection, loaded (or built) on first use."""
+        with self._lock:
+            if name not in self._collections:
+                if name not in self.specs:
+                    raise KeyError(f"Unknown vector collection '{name}', expected one of {list(self.specs)}")
+                spec = self.specs[name]
+                os.makedirs(self.root_dir, exist_ok=True)
+                logger.info(f"Opening vector collection '{name}' ({spec['model']} v{spec['version']})")
+                manager_class = ShardedFAISSManager if Config.VECTOR_SHARD_BY_PLATFORM else FAISSManager
+                self._collections[name] = manager_class(
+                    index_path=self.index_path(name),
+                    embedding_manager=self.embedder(spec['model'], spec['base_model']),
+                )
+            return self._collections[name]
+
+    def loaded_collections(self) -> List[str]:
+        return list(self._collections)
+
+    def flush(self):
+        """Publish pending incremental index updates of every loaded collection (e.g. on shutdown)."""
+        for collection in list(self._collections.values()):
+            collection.flush()
+
+    # PaperDatabase listener hooks: one ingest updates every loaded collection
+    def on_papers_saved(self, papers):
+        for collection in list(self._collections.values()):
+            collection.on_papers_saved(papers)
+
+    def on_papers_deleted(self, paper_ids):
+        for collection in list(self._collections.values()):
+            collection.on_papers_deleted(paper_ids)
+
+
+def get_vector_store() -> VectorStore:
+    """Shared VectorStore singleton."""
+    return process_singleton('vector_store', VectorStore)
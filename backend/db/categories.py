@@ -0,0 +1,93 @@
+import argparse
+import logging
+from sqlalchemy import text
+
+from backend.core.models import PaperCategory
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_TABLE = PaperCategory.__tablename__
+
+
+# papers.categories JSON -> 배열 식. 일부 크롤러는 "cs.AI,cs.LG" 문자열을 저장하므로 배열로 바꿔서 펼친다.
+# json_quote로 따옴표/역슬래시/제어문자를 이스케이프한 뒤 쉼표에서 나누므로 (이스케이프 시퀀스에는 쉼표가 없음)
+# 어떤 문자열이든 올바른 JSON 배열이 되어 트리거의 json_each가 papers 쓰기를 중단시키지 않는다
+def _categories_array(ref: str) -> str:
+    return f"""CASE
+        WHEN json_valid({ref}.categories) AND json_type({ref}.categories) = 'array' THEN {ref}.categories
+        WHEN json_valid({ref}.categories) AND json_type({ref}.categories) = 'text'
+            THEN '[' || replace(json_quote(json_extract({ref}.categories, '$')), ',', '","') || ']'
+        ELSE '[]' END"""
+
+
+def _insert_categories(ref: str) -> str:
+    return f"""INSERT OR IGNORE INTO {CATEGORY_TABLE}(paper_id, category)
+        SELECT {ref}.paper_id, trim(value) FROM json_each({_categories_array(ref)})
+        WHERE trim(value) != ''"""
+
+
+# papers 변경 시 paper_categories 동기화
+CATEGORY_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS paper_categories_ai AFTER INSERT ON papers BEGIN
+        {_insert_categories('new')};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS paper_categories_ad AFTER DELETE ON papers BEGIN
+        DELETE FROM {CATEGORY_TABLE} WHERE paper_id = old.paper_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS paper_categories_au AFTER UPDATE OF paper_id, categories ON papers BEGIN
+        DELETE FROM {CATEGORY_TABLE} WHERE paper_id = old.paper_id;
+        {_insert_categories('new')};
+    END""",
+]
+
+CATEGORY_TRIGGER_NAMES = ("paper_categories_ai", "paper_categories_ad", "paper_categories_au")
+
+# 기존 논문 전체에서 채우기
+POPULATE_SQL = f"""INSERT OR IGNORE INTO {CATEGORY_TABLE}(paper_id, category)
+    SELECT papers.paper_id, trim(value) FROM papers, json_each({_categories_array('papers')})
+    WHERE trim(value) != ''"""
+
+# 목록/필터 쿼리용 papers 인덱스. 플랫폼 키는 PaperDatabase._platform_key()와 같은 식이어야 인덱스를 탄다
+PAPER_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_papers_platform_updated ON papers(lower(coalesce(platform, 'arxiv')), updated_date, paper_id)",
+    "CREATE INDEX IF NOT EXISTS ix_papers_updated_date ON papers(updated_date, paper_id)",  # 키셋 페이지네이션 순서
+    "CREATE INDEX IF NOT EXISTS ix_papers_published_date ON papers(published_date)",
+]
+
+
+def create_category_index(engine):
+    """paper_categories 테이블, 동기화 트리거, papers 목록 인덱스 생성. 새로 만든 경우 기존 논문으로 채움"""
+    with engine.begin() as conn:
+        # 테이블은 create_all()이 먼저 만들 수 있으므로 트리거 유무로 최초 생성 여부 판단
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='paper_categories_ai'")
+        ).first() is not None
+        PaperCategory.__table__.create(conn, checkfirst=True)
+        # 트리거 본문이 바뀌어도 기존 DB에 반영되도록 매번 다시 만듦 (IF NOT EXISTS는 옛 정의를 유지)
+        for trigger in CATEGORY_TRIGGER_NAMES:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        for ddl in CATEGORY_TRIGGERS + PAPER_INDEXES:
+            conn.execute(text(ddl))
+        if not existed:
+            conn.execute(text(POPULATE_SQL))
+            logger.info(f"Category index {CATEGORY_TABLE} created and populated from papers.")
+
+
+def rebuild_category_index(engine) -> int:
+    """paper_categories를 papers.categories에서 다시 채움 (트리거 도입 전에 들어온 행이나 어긋난 경우)"""
+    create_category_index(engine)
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {CATEGORY_TABLE}"))
+        conn.execute(text(POPULATE_SQL))
+        count = conn.execute(text(f"SELECT count(*) FROM {CATEGORY_TABLE}")).scalar()
+    logger.info(f"Category index {CATEGORY_TABLE} rebuilt with {count} rows.")
+    return count
+
+
+if __name__ == "__main__":
+    # python -m backend.db.categories  (기존 DB의 paper_categories 재구축)
+    from backend.db.connection import engine
+
+    argparse.ArgumentParser(description=f"{CATEGORY_TABLE} 카테고리 인덱스를 papers 테이블에서 재구축").parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(f"Rebuilt {CATEGORY_TABLE} with {rebuild_category_index(engine)} rows.")
@@ -3,6 +3,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from backend.core.config import Config
 from backend.core.models import Base
+from backend.db.categories import create_category_index
+from backend.db.embedding_storage import migrate_embeddings
+from backend.db.fulltext import create_fulltext_index
 
 # 데이터베이스 연결 설정
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{Config.DATABASE_PATH}"
@@ -19,4 +22,7 @@ def get_db_session():
         db.close()
 
 def create_tables():
-    Base.metadata.create_all(engine) 
\ No newline at end of file
+    Base.metadata.create_all(engine)
+    create_fulltext_index(engine)
+    create_category_index(engine)  # paper_categories + 목록 인덱스 (없을 때만 생성/채움)
+    migrate_embeddings(engine)  # 남아 있는 JSON 임베딩 행을 BLOB으로 변환 (없으면 no-op) 
\ No newline at end of file
@@ -0,0 +1,65 @@
+import argparse
+import json
+import logging
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from backend.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_embeddings(engine, from_dtype: Optional[str] = None, batch_size: int = 500) -> int:
+    """papers.embedding 의 JSON 텍스트 행을 Config.EMBEDDING_STORAGE_DTYPE 바이트 BLOB으로 변환
+
+    from_dtype 을 주면 그 dtype으로 저장된 BLOB 행도 현재 dtype으로 다시 저장한다
+    (예: float32 -> float16 전환). 변환한 행 수를 반환하며, 변환할 행이 없으면 아무것도 쓰지 않는다.
+    """
+    target = np.dtype(Config.EMBEDDING_STORAGE_DTYPE)
+    source = np.dtype(from_dtype) if from_dtype else None
+    kinds = ["'text'"] + (["'blob'"] if source is not None and source != target else [])
+    where = f"typeof(embedding) IN ({', '.join(kinds)})"
+
+    converted = 0
+    last_rowid = 0
+    while True:
+        # rowid 키셋으로 배치 처리해 쓰기 트랜잭션을 짧게 유지
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(f"SELECT rowid, embedding FROM papers WHERE {where} AND rowid > :last ORDER BY rowid LIMIT :n"),
+                {"last": last_rowid, "n": batch_size},
+            ).fetchall()
+            if not rows:
+                break
+            updates = []
+            for rowid, value in rows:
+                if isinstance(value, str):
+                    # 기존 JSON 컬럼은 None을 'null' 텍스트로 저장했으므로 SQL NULL로 되돌림
+                    parsed = json.loads(value)
+                    blob = np.asarray(parsed, dtype=target).tobytes() if parsed is not None else None
+                else:
+                    blob = np.frombuffer(value, dtype=source).astype(target).tobytes()
+                updates.append({"rowid": rowid, "blob": blob})
+            conn.execute(text("UPDATE papers SET embedding = :blob WHERE rowid = :rowid"), updates)
+        converted += len(rows)
+        last_rowid = rows[-1][0]
+
+    if converted:
+        logger.info(f"Migrated {converted} paper embeddings to {target.name} BLOBs.")
+    return converted
+
+
+if __name__ == "__main__":
+    # python -m backend.db.embedding_storage [--from-dtype float32]
+    from backend.db.connection import engine
+
+    parser = argparse.ArgumentParser(description="papers.embedding 을 바이너리 BLOB으로 마이그레이션")
+    parser.add_argument("--from-dtype", default=None, help="기존 BLOB 행의 dtype (저장 dtype을 바꿀 때)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = migrate_embeddings(engine, from_dtype=args.from_dtype, batch_size=args.batch_size)
+    print(f"Converted {count} rows to {Config.EMBEDDING_STORAGE_DTYPE}.")
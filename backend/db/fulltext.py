@@ -0,0 +1,123 @@
+import argparse
+import logging
+import re
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# papers 테이블을 content로 쓰는 FTS5 인덱스 (본문은 중복 저장하지 않고 rowid로 연결)
+FTS_TABLE = "papers_fts"
+# papers는 문자열 PK라 암묵적 rowid가 VACUUM 때 바뀔 수 있으므로, paper_id -> 고정 정수 키(INTEGER PRIMARY KEY)를
+# 별도 테이블에 두고 FTS rowid로 쓴다. content는 이 키로 papers를 읽는 뷰
+FTS_ROWID_TABLE = "papers_fts_rowids"
+FTS_SOURCE_VIEW = "papers_fts_source"
+
+_FTS_ROWID = f"(SELECT fts_rowid FROM {FTS_ROWID_TABLE} WHERE paper_id = {{ref}}.paper_id)"
+
+FTS_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {FTS_ROWID_TABLE} (
+        fts_rowid INTEGER PRIMARY KEY, paper_id TEXT NOT NULL UNIQUE
+    )""",
+    f"""CREATE VIEW IF NOT EXISTS {FTS_SOURCE_VIEW} AS
+        SELECT r.fts_rowid, p.title, p.abstract, p.authors
+        FROM {FTS_ROWID_TABLE} r JOIN papers p ON p.paper_id = r.paper_id""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, abstract, authors,
+        content='{FTS_SOURCE_VIEW}', content_rowid='fts_rowid', tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )""",
+    # papers 변경 시 FTS 동기화 (external content 테이블은 삭제 시 이전 값을 그대로 넘겨야 함)
+    f"""CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+        INSERT OR IGNORE INTO {FTS_ROWID_TABLE}(paper_id) VALUES (new.paper_id);
+        INSERT INTO {FTS_TABLE}(rowid, title, abstract, authors)
+        VALUES ({_FTS_ROWID.format(ref='new')}, new.title, new.abstract, new.authors);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, abstract, authors)
+        VALUES ('delete', {_FTS_ROWID.format(ref='old')}, old.title, old.abstract, old.authors);
+        DELETE FROM {FTS_ROWID_TABLE} WHERE paper_id = old.paper_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS papers_fts_au AFTER UPDATE OF title, abstract, authors ON papers BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, abstract, authors)
+        VALUES ('delete', {_FTS_ROWID.format(ref='old')}, old.title, old.abstract, old.authors);
+        INSERT INTO {FTS_TABLE}(rowid, title, abstract, authors)
+        VALUES ({_FTS_ROWID.format(ref='new')}, new.title, new.abstract, new.authors);
+    END""",
+]
+
+FTS_TRIGGERS = ("papers_fts_ai", "papers_fts_ad", "papers_fts_au")
+
+# 기존 논문에 고정 키 부여 (rebuild 전에 실행)
+POPULATE_ROWIDS_SQL = f"INSERT OR IGNORE INTO {FTS_ROWID_TABLE}(paper_id) SELECT paper_id FROM papers"
+
+# bm25() 컬럼 가중치: title, abstract, authors
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+# snippet(): 일치 토큰 강조 표시와 발췌 길이(토큰 수), 컬럼 -1은 가장 잘 맞는 컬럼을 자동 선택
+SNIPPET_MARKERS = ("<mark>", "</mark>")
+SNIPPET_TOKENS = 24
+
+_TOKEN_RE = re.compile(r"(\w+)(\*?)", re.UNICODE)
+
+
+def create_fulltext_index(engine):
+    """FTS5 테이블과 동기화 트리거 생성. 새로 만든 경우 기존 논문으로 채움
+
+    papers의 암묵적 rowid에 연결된 이전 버전 인덱스는 고정 키 기반으로 다시 만든다.
+    """
+    with engine.begin() as conn:
+        existing = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"), {"name": FTS_TABLE}
+        ).scalar()
+    if existing is not None and FTS_SOURCE_VIEW not in existing:
+        logger.info(f"Full-text index {FTS_TABLE} is keyed on papers.rowid; rebuilding on stable keys.")
+        rebuild_fulltext_index(engine)
+        return
+    with engine.begin() as conn:
+        for ddl in FTS_DDL:
+            conn.execute(text(ddl))
+        if existing is None:
+            conn.execute(text(POPULATE_ROWIDS_SQL))
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            logger.info(f"Full-text index {FTS_TABLE} created and populated from papers.")
+
+
+def rebuild_fulltext_index(engine):
+    """FTS5 테이블과 트리거를 현재 FTS_DDL로 다시 만들고 papers에서 다시 채움
+
+    DDL(토크나이저, prefix 인덱스 등)이 바뀌었거나 인덱스가 papers와 어긋난 기존 DB에 사용.
+    """
+    with engine.begin() as conn:
+        for trigger in FTS_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+        conn.execute(text(f"DROP VIEW IF EXISTS {FTS_SOURCE_VIEW}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_ROWID_TABLE}"))
+        for ddl in FTS_DDL:
+            conn.execute(text(ddl))
+        conn.execute(text(POPULATE_ROWIDS_SQL))
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+        count = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+    logger.info(f"Full-text index {FTS_TABLE} rebuilt with {count} papers.")
+    return count
+
+
+def to_match_query(query: str, prefix: bool = False, any_token: bool = False) -> str:
+    """사용자 입력을 FTS5 MATCH 식으로 변환: 토큰별 따옴표 처리 (연산자/특수문자 주입 방지)
+
+    기본은 모든 토큰이 있어야 일치(암묵적 AND)하고, any_token=True면 토큰 중 하나만 있어도 일치(OR)한다
+    (하이브리드 검색의 BM25 후보 단계처럼 재순위화 전 넓게 모을 때).
+    prefix=True면 모든 토큰을 접두어 검색("token"*)으로, 아니면 사용자가 * 를 붙인 토큰만 접두어로 검색한다.
+    """
+    tokens = _TOKEN_RE.findall(query or "")
+    terms = [f'"{token}"*' if prefix or star else f'"{token}"' for token, star in tokens]
+    return (" OR " if any_token else " ").join(terms)
+
+if __name__ == "__main__":
+    # python -m backend.db.fulltext  (기존 DB의 FTS5 인덱스 재구축)
+    from backend.db.connection import engine
+
+    argparse.ArgumentParser(description=f"{FTS_TABLE} 전문 검색 인덱스를 papers 테이블에서 재구축").parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(f"Rebuilt {FTS_TABLE} with {rebuild_fulltext_index(engine)} papers.")
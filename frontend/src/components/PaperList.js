@@ -6,7 +6,9 @@ import './PaperList.css';
 
 const PaperList = () => {
   const [papers, setPapers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null); // 목록 다음 페이지 커서 (검색 결과/마지막 페이지면 null)
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [filters, setFilters] = useState({
     domain: 'all',
@@ -80,17 +82,27 @@ const PaperList = () => {
     return 'all';
   };
 
+  const fetchPapersPage = (cursor = null) =>
+    paperAPI.getPapersPage(
+      computeDomainParam(),
+      filters.daysBack,
+      filters.maxResults,
+      filters.category === 'all' ? null : filters.category,
+      cursor
+    );
+
   const loadInitialPapers = async () => {
     safeSetState(setLoading, true);
     try {
       // Initial load uses default filters or general parameters
-      const response = await paperAPI.getPapers(computeDomainParam(), filters.daysBack, filters.maxResults, filters.category === 'all' ? null : filters.category);
-      const papersData = Array.isArray(response?.data) ? response.data : [];
-      safeSetState(setPapers, papersData);
+      const { papers: papersData, nextCursor: cursor } = await fetchPapersPage();
+      safeSetState(setPapers, Array.isArray(papersData) ? papersData : []);
+      safeSetState(setNextCursor, cursor);
       safeSetState(setError, '');
     } catch (err) {
       console.error('Failed to load initial papers:', err);
       safeSetState(setPapers, []);
+      safeSetState(setNextCursor, null);
     } finally {
       safeSetState(setLoading, false);
     }
@@ -113,6 +125,7 @@ const PaperList = () => {
       ); 
       const items = Array.isArray(response?.data?.results) ? response.data.results : []; // Changed to .results
       safeSetState(setPapers, items);
+      safeSetState(setNextCursor, null); // 유사도 검색 결과는 페이지가 없음
       safeSetState(setError, '');
     } catch (err) {
       const msg = err?.message || '검색 실패';
@@ -125,24 +138,42 @@ const PaperList = () => {
   const handleDomainSearch = async () => {
     safeSetState(setLoading, true);
     try {
-      const response = await paperAPI.getPapers(
-        computeDomainParam(), // Use computeDomainParam() here
-        filters.daysBack,
-        filters.maxResults,
-        filters.category === 'all' ? null : filters.category
-      );
-      const papersData = Array.isArray(response?.data) ? response.data : [];
-      safeSetState(setPapers, papersData);
+      const { papers: papersData, nextCursor: cursor } = await fetchPapersPage();
+      safeSetState(setPapers, Array.isArray(papersData) ? papersData : []);
+      safeSetState(setNextCursor, cursor);
       safeSetState(setError, '');
     } catch (err) {
       const msg = err?.response?.data?.detail || err?.message || '논문 검색 실패';
       safeSetState(setError, '논문 검색 실패: ' + msg);
       safeSetState(setPapers, []);
+      safeSetState(setNextCursor, null);
     } finally {
       safeSetState(setLoading, false);
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    safeSetState(setLoadingMore, true);
+    try {
+      const { papers: papersData, nextCursor: cursor } = await fetchPapersPage(nextCursor);
+      const page = Array.isArray(papersData) ? papersData : [];
+      if (mountedRef.current) {
+        // 커서 페이지는 겹치지 않지만, 그 사이 재크롤링된 논문이 중복 표시되지 않도록 paper_id로 거름
+        setPapers(prev => {
+          const seen = new Set(prev.map(p => p?.paper_id));
+          return [...prev, ...page.filter(p => !seen.has(p?.paper_id))];
+        });
+      }
+      safeSetState(setNextCursor, cursor);
+    } catch (err) {
+      const msg = err?.response?.data?.detail || err?.message || '다음 페이지 조회 실패';
+      safeSetState(setError, '다음 페이지 조회 실패: ' + msg);
+    } finally {
+      safeSetState(setLoadingMore, false);
+    }
+  };
+
   const handlePaperAnalysis = async (paperId, analysisResult) => { // Changed arxivId to paperId
     try {
       const paper = papers.find(p => p?.paper_id === paperId); // Changed arxivId to paper_id
@@ -501,6 +532,14 @@ const PaperList = () => {
           })}
         </div>
       )}
+
+      {safeArray.length > 0 && nextCursor && !loading && (
+        <div className="load-more">
+          <button className="btn-enhanced secondary" onClick={handleLoadMore} disabled={loadingMore}>
+            {loadingMore ? '⏳ Loading...' : 'Load More'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
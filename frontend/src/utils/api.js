@@ -19,6 +19,12 @@ export const paperAPI = {
     }
   },
   
+  // 커서 페이지네이션: nextCursor를 다음 호출에 넘기면 이어지는 페이지 (마지막 페이지면 null)
+  getPapersPage: async (domain = 'all', daysBack = 7, limit = 50, category = null, cursor = null) => {
+    const response = await apiClient.get('/crawling/papers', { params: { domain, days_back: daysBack, limit, category, cursor } });
+    return { papers: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+  },
+  
   analyzePaper: (externalId) =>
     apiClient.post('/papers/analyze', { external_id: externalId }),
     
@@ -0,0 +1,105 @@
+"""
+Shared pytest fixtures: a throwaway SQLite papers DB and a small deterministic
+embedding model, so index/DB behaviour is tested without SPECTER2 or the real DB.
+
+    python -m pytest -q test
+"""
+import os
+import sys
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_path = os.path.dirname(current_dir)
+sys.path.insert(0, root_path)
+sys.path.insert(0, os.path.join(root_path, 'backend'))
+
+DIMENSION = 16
+
+
+class FakeEmbeddingManager:
+    """Text -> fixed random unit vector (seeded by the text), with EmbeddingManager's interface."""
+    dimension = DIMENSION
+    model_name = "test-adapter"
+    base_model_name = "test-base"
+
+    def __init__(self):
+        self.calls = 0
+        self.cached_calls = 0  # calls allowed to use the persistent embedding cache
+
+    def get_embedding(self, text: str, use_cache: bool = True) -> np.ndarray:
+        return self.get_embeddings([text], use_cache=use_cache)[0]
+
+    def get_embeddings(self, texts, use_cache: bool = True):
+        self.calls += 1
+        self.cached_calls += use_cache
+        return np.stack([_unit_vector(text) for text in texts]) if texts else np.empty((0, DIMENSION), dtype='float32')
+
+
+def _unit_vector(seed_text: str) -> np.ndarray:
+    vector = np.random.default_rng(zlib.crc32(seed_text.encode('utf-8'))).standard_normal(DIMENSION)
+    return (vector / np.linalg.norm(vector)).astype('float32')
+
+
+def _make_paper(i: int, platform: str = "arxiv", categories=("cs.AI",), embedding=True, **fields) -> dict:
+    paper = {
+        "paper_id": f"p{i}",
+        "external_id": f"2401.{i:05d}",
+        "platform": platform,
+        "title": f"Paper {i} on graph learning",
+        "abstract": f"Abstract of paper {i}.",
+        "authors": [f"Author {i}"],
+        "categories": list(categories),
+        "pdf_url": f"https://example.org/{i}.pdf",
+        "published_date": datetime(2024, 1, 1) + timedelta(days=i),
+        "updated_date": datetime(2024, 1, 1) + timedelta(days=i),
+    }
+    if embedding is True:
+        paper["embedding"] = _unit_vector(paper["paper_id"])
+    elif embedding is not False:
+        paper["embedding"] = embedding
+    paper.update(fields)
+    return paper
+
+
+@pytest.fixture
+def db_engine(tmp_path, monkeypatch):
+    """Point PaperDatabase (and everything importing the shared engine) at an empty temp DB."""
+    from backend.core import paper_database, passage_store
+    from backend.db import connection
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'papers.db'}", connect_args={"check_same_thread": False})
+    for module in (connection, paper_database, passage_store):
+        monkeypatch.setattr(module, 'engine', engine)
+    monkeypatch.setattr(paper_database, '_paper_listeners', [])
+    monkeypatch.setattr(paper_database, '_fulltext_ready', False)
+    monkeypatch.setattr(paper_database, '_category_ready', False)
+    connection.create_tables()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def paper_db(db_engine):
+    from backend.core.paper_database import PaperDatabase
+    return PaperDatabase()
+
+
+@pytest.fixture
+def embedding_manager():
+    return FakeEmbeddingManager()
+
+
+@pytest.fixture
+def make_paper():
+    """make_paper(i, platform=..., categories=..., embedding=True|False|vector, **fields) -> crawler-style paper dict"""
+    return _make_paper
+
+
+@pytest.fixture
+def unit_vector():
+    return _unit_vector
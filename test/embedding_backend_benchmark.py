@@ -0,0 +1,89 @@
+"""
+Embedding backend benchmark and parity check: papers/s per inference backend
+(eager / int8 / onnx) and cosine agreement of each backend's vectors with the
+eager PyTorch output on the same synthetic corpus.
+
+    python test/embedding_backend_benchmark.py                        # all backends, 256 papers
+    python test/embedding_backend_benchmark.py --backends eager int8 --papers 1000 --min-cosine 0.99
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_path = os.path.dirname(current_dir)
+sys.path.insert(0, root_path)
+
+from backend.core.config import Config
+
+# Measure the encoder, not the persistent embedding cache
+Config.EMBEDDING_CACHE_ENABLED = False
+
+from backend.core.embedding_manager import EmbeddingManager
+from backend.core.inference_backends import BACKENDS
+from test.embedding_batching_benchmark import make_corpus
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def row_cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return (a * b).sum(axis=1)
+
+
+def top1_agreement(a: np.ndarray, b: np.ndarray) -> float:
+    """Share of papers whose nearest neighbour (cosine, excluding itself) is the same under both backends."""
+    def nearest(x):
+        x = x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+        sims = x @ x.T
+        np.fill_diagonal(sims, -np.inf)
+        return sims.argmax(axis=1)
+    return float((nearest(a) == nearest(b)).mean())
+
+
+def run(backends, n_papers, min_cosine):
+    texts = make_corpus(n_papers)
+    print(f"{'backend':>8} {'load_s':>7} {'papers/s':>9} {'cos_mean':>9} {'cos_min':>8} {'top1_agree':>10}")
+
+    reference = None
+    failed = []
+    # Eager first: it is the parity reference
+    for name in ["eager"] + [b for b in backends if b != "eager"]:
+        start = time.perf_counter()
+        manager = EmbeddingManager(backend=name)
+        load_s = time.perf_counter() - start
+
+        manager.get_embeddings(texts[:8])  # warm-up
+        start = time.perf_counter()
+        embeddings = manager.get_embeddings(texts)
+        rate = n_papers / (time.perf_counter() - start)
+        del manager
+
+        if reference is None:
+            reference = embeddings
+        cosines = row_cosine(embeddings, reference)
+        agree = top1_agreement(embeddings, reference)
+        if name in backends:
+            print(f"{name:>8} {load_s:7.1f} {rate:9.1f} {cosines.mean():9.5f} {cosines.min():8.5f} {agree:10.1%}")
+        if cosines.min() < min_cosine:
+            failed.append(name)
+
+    if failed:
+        print(f"Parity check FAILED (min cosine < {min_cosine}): {', '.join(failed)}")
+        return 1
+    print(f"Parity check passed: every vector within cosine {min_cosine} of eager")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--papers', type=int, default=256)
+    parser.add_argument('--min-cosine', type=float, default=0.98)
+    args = parser.parse_args()
+    sys.exit(run(args.backends, args.papers, args.min_cosine))
@@ -0,0 +1,92 @@
+"""
+SPECTER2 batching benchmark: papers/s and padding overhead for fixed-size
+(naive) batches vs. length-bucketed batches on a synthetic corpus whose
+abstract lengths follow a long-tailed distribution like real arXiv abstracts.
+
+    python test/embedding_batching_benchmark.py                       # 512 papers
+    python test/embedding_batching_benchmark.py --papers 2000 --token-budget 16384
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_path = os.path.dirname(current_dir)
+sys.path.insert(0, root_path)
+
+from backend.core.config import Config
+
+# Measure the encoder, not the persistent embedding cache
+Config.EMBEDDING_CACHE_ENABLED = False
+
+from backend.core.embedding_manager import EmbeddingManager, length_buckets
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+VOCAB = ("graph neural network transformer attention protein folding sequence model training data "
+         "benchmark evaluation results method approach quantum circuit optimization gradient loss "
+         "representation learning language retrieval embedding inference sampling variational").split()
+
+
+def make_corpus(n: int, seed: int = 0) -> list:
+    """Title + abstract texts with log-normal word counts (median ~150 words, long tail past 512 tokens)."""
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(rng.lognormal(mean=5.0, sigma=0.6, size=n).astype(int), 10, 900)
+    texts = []
+    for length in lengths:
+        title = " ".join(rng.choice(VOCAB, size=8))
+        abstract = " ".join(rng.choice(VOCAB, size=length))
+        texts.append(f"{title}. {abstract}")
+    return texts
+
+
+def padded_tokens(lengths, batches) -> int:
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+
+
+def run(n_papers, token_budget, naive_batch_sizes, bucket_max_batch):
+    texts = make_corpus(n_papers)
+    manager = EmbeddingManager(token_budget=token_budget)  # one model, batching switched per mode
+    modes = [(f"naive/{size}", "naive", size) for size in naive_batch_sizes]
+    modes.append((f"bucketed/{token_budget}", "bucketed", bucket_max_batch))
+
+    lengths = [len(ids) for ids in manager.tokenizer(texts, truncation=True, max_length=Config.EMBEDDING_MAX_LENGTH)['input_ids']]
+    real_tokens = sum(lengths)
+    print(f"{n_papers} papers, {real_tokens} real tokens (median {int(np.median(lengths))}, max {max(lengths)})")
+    print(f"{'mode':>16} {'papers/s':>9} {'seconds':>8} {'padded_tok':>11} {'pad_waste':>9} {'max_diff':>9}")
+
+    reference = None
+    for name, batching, batch_size in modes:
+        manager.batching, manager.max_batch_size = batching, batch_size
+        if batching == "naive":
+            batches = [list(range(i, min(i + manager.max_batch_size, n_papers)))
+                       for i in range(0, n_papers, manager.max_batch_size)]
+        else:
+            batches = length_buckets(lengths, manager.token_budget, manager.max_batch_size)
+        padded = padded_tokens(lengths, batches)
+
+        manager.get_embeddings(texts[:8])  # warm-up
+        start = time.perf_counter()
+        embeddings = manager.get_embeddings(texts)
+        elapsed = time.perf_counter() - start
+
+        # Same vectors regardless of batching, up to padding-induced float noise
+        if reference is None:
+            reference = embeddings
+        max_diff = float(np.abs(embeddings - reference).max())
+        print(f"{name:>16} {n_papers / elapsed:9.1f} {elapsed:8.2f} {padded:11d} "
+              f"{1 - real_tokens / padded:9.1%} {max_diff:9.2e}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--papers', type=int, default=512)
+    parser.add_argument('--token-budget', type=int, default=Config.EMBEDDING_TOKEN_BUDGET)
+    parser.add_argument('--naive-batch-sizes', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--bucket-max-batch', type=int, default=Config.EMBEDDING_MAX_BATCH_SIZE)
+    args = parser.parse_args()
+    run(args.papers, args.token_budget, args.naive_batch_sizes, args.bucket_max_batch)
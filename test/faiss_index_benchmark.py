@@ -0,0 +1,92 @@
+"""
+FAISS index tier benchmark: recall@k against the exact flat baseline and
+p50/p99 single-query latency for flat / HNSW / IVF-PQ on synthetic vectors.
+
+    python test/faiss_index_benchmark.py                         # 10k, 100k, 1M x 768
+    python test/faiss_index_benchmark.py --sizes 10000 100000 --dim 256 --types hnsw ivfpq
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+
+import numpy as np
+import faiss
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_path = os.path.dirname(current_dir)
+sys.path.insert(0, root_path)
+
+from backend.core.index_factory import INDEX_TYPES, build_index, select_index_spec
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def make_corpus(n: int, dim: int, n_clusters: int = 256, seed: int = 0, chunk: int = 100_000) -> np.ndarray:
+    """Clustered gaussian vectors; closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype('float32')
+    corpus = np.empty((n, dim), dtype='float32')
+    for start in range(0, n, chunk):
+        end = min(start + chunk, n)
+        labels = rng.integers(0, n_clusters, end - start)
+        corpus[start:end] = centers[labels] + 0.5 * rng.standard_normal((end - start, dim), dtype='float32')
+    return corpus
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray, k: int) -> float:
+    hits = sum(len(set(t[:k]) & set(f[:k]) - {-1}) for t, f in zip(truth, found))
+    return hits / (len(truth) * k)
+
+
+def time_queries(index: faiss.Index, queries: np.ndarray, k: int):
+    latencies = []
+    found = np.empty((len(queries), k), dtype='int64')
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found[i] = ids[0]
+    return found, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def run(sizes, dim, n_queries, k, target_recall, types):
+    faiss.omp_set_num_threads(max(1, os.cpu_count() or 1))
+    print(f"{'n':>9} {'type':>7} {'auto':>5} {'build_s':>8} {'recall@' + str(k):>9} {'p50_ms':>8} {'p99_ms':>8}")
+    for n in sizes:
+        corpus = make_corpus(n, dim)
+        queries = make_corpus(n_queries, dim, seed=1)
+
+        # Ground truth from an exact batch search
+        flat = faiss.IndexFlatL2(dim)
+        flat.add(corpus)
+        _, truth = flat.search(queries, k)
+        del flat
+
+        auto_type = select_index_spec(n, dim, target_recall)["type"]
+        for index_type in types:
+            start = time.perf_counter()
+            index, spec = build_index(corpus, metric="l2", target_recall=target_recall, index_type=index_type)
+            build_s = time.perf_counter() - start
+            found, p50, p99 = time_queries(index, queries, k)
+            marker = "*" if index_type == auto_type else ""
+            print(f"{n:>9} {index_type:>7} {marker:>5} {build_s:>8.2f} {recall_at_k(truth, found, k):>9.3f} {p50:>8.3f} {p99:>8.3f}")
+            del index
+        del corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS index tier benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--target-recall', type=float, default=0.95)
+    parser.add_argument('--types', nargs='+', default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    args = parser.parse_args()
+    run(args.sizes, args.dim, args.queries, args.k, args.target_recall, args.types)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Reduced vector tier benchmark: index memory, p50/p99 single-query latency
+(first-stage search + exact float32 re-score) and recall@k against exact
+full-precision search, for PCA-projected and/or 8-bit scalar-quantized
+indexes on synthetic vectors.
+
+    python test/faiss_reduced_tier_benchmark.py                          # 100k x 768, flat
+    python test/faiss_reduced_tier_benchmark.py --n 1000000 --type hnsw --pca 128 256
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+
+import numpy as np
+import faiss
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_path = os.path.dirname(current_dir)
+sys.path.insert(0, root_path)
+sys.path.insert(0, current_dir)
+
+from backend.core.index_factory import INDEX_TYPES, RESCORE_FACTOR, build_index, is_reduced
+from faiss_index_benchmark import make_corpus, recall_at_k
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def index_bytes(index: faiss.Index) -> int:
+    return faiss.serialize_index(index).nbytes
+
+
+def time_rescored_queries(index: faiss.Index, spec: dict, corpus: np.ndarray, queries: np.ndarray, k: int,
+                          rescore_factor: int):
+    """Per-query latency of the full search path: first stage, then exact L2 over the candidates."""
+    fetch = k * rescore_factor if is_reduced(spec) else k
+    latencies = []
+    found = np.empty((len(queries), k), dtype='int64')
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], fetch)
+        candidates = ids[0][ids[0] >= 0]
+        if is_reduced(spec):
+            distances = ((corpus[candidates] - queries[i]) ** 2).sum(axis=1)
+            candidates = candidates[np.argsort(distances)[:k]]
+        latencies.append((time.perf_counter() - start) * 1000)
+        found[i] = np.pad(candidates[:k], (0, k - min(len(candidates), k)), constant_values=-1)
+    return found, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def run(n, dim, n_queries, k, index_type, pca_dims, target_recall, rescore_factor):
+    faiss.omp_set_num_threads(1)  # single-query latency, like one API request
+    corpus = make_corpus(n, dim)
+    queries = make_corpus(n_queries, dim, seed=1)
+
+    flat = faiss.IndexFlatL2(dim)
+    flat.add(corpus)
+    _, truth = flat.search(queries, k)
+    del flat
+
+    configs = [(None, False), (None, True)] + [(p, False) for p in pca_dims] + [(p, True) for p in pca_dims]
+    print(f"{n} x {dim} float32 vectors = {corpus.nbytes / 2**20:.0f} MB, {index_type} index, "
+          f"re-score {rescore_factor}x{k} candidates")
+    print(f"{'tier':>12} {'index_MB':>9} {'vs_full':>8} {'build_s':>8} {'recall@' + str(k):>9} {'p50_ms':>8} {'p99_ms':>8}")
+    full_bytes = None
+    for pca_dim, sq8 in configs:
+        start = time.perf_counter()
+        index, spec = build_index(corpus, metric="l2", target_recall=target_recall, index_type=index_type,
+                                  pca_dim=pca_dim, sq8=sq8)
+        build_s = time.perf_counter() - start
+        size = index_bytes(index)
+        full_bytes = full_bytes or size
+        found, p50, p99 = time_rescored_queries(index, spec, corpus, queries, k, rescore_factor)
+        name = "+".join(filter(None, [f"pca{pca_dim}" if pca_dim else None, "sq8" if sq8 else None])) or "full"
+        print(f"{name:>12} {size / 2**20:9.1f} {size / full_bytes:8.1%} {build_s:8.2f} "
+              f"{recall_at_k(truth, found, k):9.3f} {p50:8.3f} {p99:8.3f}")
+        del index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reduced (PCA / SQ8) vector tier benchmark")
+    parser.add_argument('--n', type=int, default=100_000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--type', default="flat", choices=INDEX_TYPES)
+    parser.add_argument('--pca', type=int, nargs='+', default=[128, 256])
+    parser.add_argument('--target-recall', type=float, default=0.95)
+    parser.add_argument('--rescore-factor', type=int, default=RESCORE_FACTOR)
+    args = parser.parse_args()
+    run(args.n, args.dim, args.queries, args.k, args.type, args.pca, args.target_recall, args.rescore_factor)
+
+
+if __name__ == "__main__":
+    main()
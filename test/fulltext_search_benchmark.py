@@ -0,0 +1,109 @@
+"""
+Full-text search benchmark: p50/p99 latency of the old LIKE '%q%' scan versus
+the FTS5 bm25 query (with snippet) as the synthetic corpus grows.
+
+    python test/fulltext_search_benchmark.py                       # 10k, 100k papers
+    python test/fulltext_search_benchmark.py --sizes 10000 100000 1000000 --queries 100
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+import tempfile
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_path = os.path.dirname(current_dir)
+sys.path.insert(0, root_path)
+
+from backend.db.fulltext import (BM25_WEIGHTS, FTS_ROWID_TABLE, FTS_TABLE, SNIPPET_TOKENS, create_fulltext_index,
+                                  to_match_query)
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+VOCABULARY_SIZE = 20_000
+
+
+def make_vocabulary(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return ["".join(rng.choice(letters, rng.integers(4, 11))) for _ in range(VOCABULARY_SIZE)]
+
+
+def make_papers(n: int, vocabulary, seed: int = 0, chunk: int = 10_000):
+    """Zipf-distributed words so a few terms are common and most are rare, like real abstracts."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk):
+        rows = []
+        for i in range(start, min(start + chunk, n)):
+            words = [vocabulary[(w - 1) % VOCABULARY_SIZE] for w in rng.zipf(1.2, 160)]
+            rows.append({"paper_id": f"p{i}", "title": " ".join(words[:10]), "abstract": " ".join(words[10:]),
+                         "authors": f"author{rng.integers(0, n // 3 + 1)}"})
+        yield rows
+
+
+def build_database(path: str, n: int, vocabulary):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE papers (paper_id TEXT PRIMARY KEY, title TEXT, abstract TEXT, authors TEXT)"))
+    create_fulltext_index(engine)  # triggers keep the index current while rows are inserted
+    for rows in make_papers(n, vocabulary):
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO papers VALUES (:paper_id, :title, :abstract, :authors)"), rows)
+    return engine
+
+
+def time_queries(engine, sql, params_list):
+    latencies = []
+    with engine.connect() as conn:
+        for params in params_list:
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def run(sizes, n_queries, limit):
+    vocabulary = make_vocabulary()
+    rng = np.random.default_rng(1)
+    # Mid-frequency query terms: common enough to match, rare enough to be selective
+    terms = [vocabulary[i] for i in rng.integers(50, 2000, (n_queries, 2)).ravel()]
+    queries = [" ".join(terms[i:i + 2]) for i in range(0, len(terms), 2)]
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    like_sql = text("SELECT paper_id FROM papers WHERE title LIKE :q OR abstract LIKE :q LIMIT :limit")
+    fts_sql = text(f"""
+        SELECT p.paper_id, bm25({FTS_TABLE}, {weights}) AS score,
+               snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS})
+        FROM {FTS_TABLE}
+        JOIN {FTS_ROWID_TABLE} r ON r.fts_rowid = {FTS_TABLE}.rowid
+        JOIN papers p ON p.paper_id = r.paper_id
+        WHERE {FTS_TABLE} MATCH :match ORDER BY score LIMIT :limit
+    """)
+
+    print(f"{'papers':>9} {'build_s':>8} {'like_p50':>9} {'like_p99':>9} {'fts_p50':>8} {'fts_p99':>8} "
+          f"{'prefix_p50':>10} {'prefix_p99':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            engine = build_database(os.path.join(tmp, "papers.db"), n, vocabulary)
+            build_s = time.perf_counter() - start
+            like = time_queries(engine, like_sql, [{"q": f"%{q}%", "limit": limit} for q in queries])
+            fts = time_queries(engine, fts_sql, [{"match": to_match_query(q), "limit": limit} for q in queries])
+            prefix = time_queries(engine, fts_sql, [{"match": to_match_query(q[:4], prefix=True), "limit": limit}
+                                                    for q in queries])
+            engine.dispose()
+        print(f"{n:>9} {build_s:8.1f} {like[0]:9.2f} {like[1]:9.2f} {fts[0]:8.2f} {fts[1]:8.2f} "
+              f"{prefix[0]:10.2f} {prefix[1]:10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.limit)
@@ -0,0 +1,41 @@
+"""Content-addressed EmbeddingCache keys and SQLite persistence."""
+import numpy as np
+
+from backend.core.embedding_cache import EmbeddingCache, cache_key, get_embedding_cache, normalize_text
+
+
+def test_keys_normalize_text_and_separate_models():
+    assert normalize_text("  Graph\n neural\tnets ") == "Graph neural nets"
+    assert normalize_text("café") == normalize_text("café")
+    assert cache_key("specter2", "proximity", "Graph  nets") == cache_key("specter2", "proximity", " Graph nets")
+    assert cache_key("specter2", "proximity", "x") != cache_key("specter2", "adhoc_query", "x")
+    assert cache_key("specter2", None, "x") == cache_key("specter2", "", "x")
+    assert cache_key("specter2", None, "x") != cache_key("scibert", None, "x")
+
+
+def test_vectors_persist_across_instances_and_first_writer_wins(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.db")
+    cache = EmbeddingCache(path)
+    first, second = np.arange(4, dtype='float32'), np.ones(4, dtype='float32')
+    cache.put_many({"a": first})
+    cache.put_many({"a": second, "b": second})
+
+    reopened = EmbeddingCache(path)
+    found = reopened.get_many(["a", "b", "missing", "a"])
+
+    np.testing.assert_array_equal(found["a"], first)
+    assert set(found) == {"a", "b"} and len(reopened) == 2
+    assert reopened.stats()["hits"] == 3 and reopened.stats()["misses"] == 1
+
+
+def test_lookups_larger_than_the_parameter_chunk(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+    cache.put_many({str(i): np.full(2, i, dtype='float32') for i in range(1200)})
+
+    found = cache.get_many([str(i) for i in range(1300)])
+    assert len(found) == 1200 and found["1199"][0] == 1199
+
+
+def test_one_cache_per_file(tmp_path):
+    path = str(tmp_path / "shared.db")
+    assert get_embedding_cache(path) is get_embedding_cache(path)
@@ -0,0 +1,119 @@
+"""FAISSManager incremental updates against a temp DB and index bundle."""
+import numpy as np
+import pytest
+
+from backend.core.faiss_manager import FAISSManager
+from backend.core.index_factory import INDEX_TYPES
+
+
+def build_manager(tmp_path, paper_db, embedding_manager, make_paper, index_type, n=300, **kwargs):
+    paper_db.save_papers([make_paper(i) for i in range(n)])
+    return FAISSManager(index_path=str(tmp_path / "papers.faiss"), index_type=index_type,
+                        embedding_manager=embedding_manager, pca_dim=None, sq8=False, **kwargs)
+
+
+@pytest.mark.parametrize("index_type", INDEX_TYPES)
+def test_reembed_replaces_old_vector(tmp_path, paper_db, embedding_manager, make_paper, unit_vector, index_type):
+    manager = build_manager(tmp_path, paper_db, embedding_manager, make_paper, index_type)
+    old, new = unit_vector("p5"), unit_vector("p5 re-embedded")
+
+    manager.add_papers([make_paper(5, embedding=new)])
+
+    assert manager.ntotal == 300
+    assert manager.search_vectors(new[None], k=1)[0][0][0] == "p5"
+    assert "p5" not in [pid for pid, _ in manager.search_vectors(old[None], k=3)[0]]
+
+
+def test_hnsw_readd_after_remove_does_not_resurrect(tmp_path, paper_db, embedding_manager, make_paper, unit_vector):
+    manager = build_manager(tmp_path, paper_db, embedding_manager, make_paper, "hnsw")
+    manager.remove_papers(["p7"])
+    assert not manager.contains("p7")
+    assert "p7" not in [pid for pid, _ in manager.search_vectors(unit_vector("p7")[None], k=3)[0]]
+
+    new = unit_vector("p7 again")
+    manager.add_papers([make_paper(7, embedding=new)])
+    assert manager.search_vectors(new[None], k=1)[0][0][0] == "p7"
+    assert "p7" not in [pid for pid, _ in manager.search_vectors(unit_vector("p7")[None], k=3)[0]]
+    np.testing.assert_allclose(manager.get_vectors(["p7"])["p7"], new, atol=1e-6)
+
+
+def test_incremental_updates_are_published_in_one_debounced_write(tmp_path, paper_db, embedding_manager, make_paper):
+    manager = build_manager(tmp_path, paper_db, embedding_manager, make_paper, "flat", persist_interval=3600)
+    built = manager.bundle.current_generation()
+
+    manager.add_papers([make_paper(i) for i in range(300, 350)])
+    manager.add_papers([make_paper(i) for i in range(350, 400)])
+    manager.remove_papers(["p0"])
+    assert manager.bundle.current_generation() == built
+
+    assert manager.flush()
+    assert manager.bundle.current_generation() == built + 1
+    assert not manager.flush()
+
+    reader = FAISSManager(index_path=str(tmp_path / "papers.faiss"), embedding_manager=embedding_manager,
+                          pca_dim=None, sq8=False, read_only=True)
+    assert reader.ntotal == 399 and reader.contains("p399") and not reader.contains("p0")
+
+
+def test_zero_persist_interval_publishes_every_update(tmp_path, paper_db, embedding_manager, make_paper):
+    manager = build_manager(tmp_path, paper_db, embedding_manager, make_paper, "flat", persist_interval=0)
+    built = manager.bundle.current_generation()
+    manager.add_papers([make_paper(300)])
+    assert manager.bundle.current_generation() == built + 1
+
+
+def test_searches_share_the_snapshot_read_lock(tmp_path, paper_db, embedding_manager, make_paper, unit_vector):
+    import threading
+
+    manager = build_manager(tmp_path, paper_db, embedding_manager, make_paper, "flat")
+    snapshot = manager.snapshot
+    inside = threading.Barrier(2, timeout=5)
+    original_search = snapshot.index.search
+
+    def search_meeting_another_search(*args, **kwargs):
+        inside.wait()  # only returns once a second search is inside index.search at the same time
+        return original_search(*args, **kwargs)
+
+    snapshot.index.search = search_meeting_another_search
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(
+        manager.search_vectors(unit_vector(f"p{i}")[None], k=1)[0][0][0])) for i in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == ["p1", "p2"]
+
+    # An add waits for the writer lock and still lands
+    snapshot.index.search = original_search
+    manager.add_papers([make_paper(300)])
+    assert manager.search_vectors(unit_vector("p300")[None], k=1)[0][0][0] == "p300"
+
+
+def test_hnsw_tombstone_overfetch_is_capped_and_retried(tmp_path, paper_db, embedding_manager, make_paper,
+                                                         unit_vector):
+    from backend.core.faiss_manager import MAX_OVERFETCH
+
+    manager = build_manager(tmp_path, paper_db, embedding_manager, make_paper, "hnsw")
+    query = unit_vector("query")
+    vectors = {f"p{i}": unit_vector(f"p{i}") for i in range(300)}
+    by_distance = sorted(vectors, key=lambda pid: float(((vectors[pid] - query) ** 2).sum()))
+    manager.remove_papers(by_distance[:40]) # the 40 nearest papers become dead vectors ranked first
+    manager.remove_papers(by_distance[-100:]) # far tombstones only inflate the count
+
+    snapshot = manager.snapshot
+    calls = []
+    original_search = snapshot.index.search
+
+    def recording_search(x, k, **kwargs):
+        calls.append((len(x), k))
+        return original_search(x, k, **kwargs)
+
+    snapshot.index.search = recording_search
+    live = by_distance[150]
+    hits = manager.search_vectors(np.stack([query, vectors[live]]), k=1)
+
+    assert [row[0][0] for row in hits] == [by_distance[40], live]
+    assert calls[0] == (2, MAX_OVERFETCH)
+    assert [rows for rows, _ in calls[1:]] == [1] * (len(calls) - 1) # only the crowded-out row is searched again
+    assert max(k for _, k in calls) <= 1 + snapshot.tombstones
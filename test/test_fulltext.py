@@ -0,0 +1,85 @@
+"""FTS5 MATCH query building and PaperDatabase full-text search semantics."""
+from backend.db.fulltext import to_match_query
+
+
+def test_match_query_quotes_tokens_and_requires_all_by_default():
+    assert to_match_query('graph "neural" OR net*') == '"graph" "neural" "OR" "net"*'
+    assert to_match_query("graph neural", prefix=True) == '"graph"* "neural"*'
+    assert to_match_query("graph neural", any_token=True) == '"graph" OR "neural"'
+    assert to_match_query(" -- ") == ""
+
+
+def seed(paper_db, make_paper):
+    paper_db.save_papers([
+        make_paper(1, title="Graph neural networks for molecules", abstract="Message passing."),
+        make_paper(2, title="Graph sampling at scale", abstract="Random walks."),
+        make_paper(3, title="Neural radiance fields", abstract="Learning scenes.", platform=None),
+        make_paper(4, title="Protein folding", abstract="Graph of residues.", platform="biorxiv"),
+    ])
+
+
+def test_search_papers_matches_all_terms_with_prefix(paper_db, make_paper):
+    seed(paper_db, make_paper)
+
+    assert [p.paper_id for p in paper_db.search_papers("graph neural")] == ["p1"]
+    assert {p.paper_id for p in paper_db.search_papers("neur")} == {"p1", "p3"}
+    assert paper_db.search_papers("neur", prefix=False) == []
+    hit = paper_db.search_papers("molecules")[0]
+    assert hit.search_score > 0 and "molecules" in hit.search_snippet
+
+
+def test_any_token_is_used_for_candidate_stages(paper_db, make_paper):
+    seed(paper_db, make_paper)
+
+    assert {p.paper_id for p in paper_db.search_papers("graph neural", any_token=True)} == {"p1", "p2", "p3", "p4"}
+    ranked = paper_db.search_papers_bm25("graph neural")
+    assert ranked[0][0] == "p1" and {paper_id for paper_id, _ in ranked} == {"p1", "p2", "p3", "p4"}
+
+
+def test_platform_filter_treats_null_platform_as_arxiv(paper_db, make_paper):
+    seed(paper_db, make_paper)
+
+    assert {h["paper_id"] for h in paper_db.search_fulltext("neural", platform="arxiv")} == {"p1", "p3"}
+    assert [h["paper_id"] for h in paper_db.search_fulltext("graph", platform=["BioRxiv"])] == ["p4"]
+
+
+def test_search_survives_vacuum_after_deletes(paper_db, make_paper, db_engine):
+    from sqlalchemy import text
+
+    paper_db.save_papers([make_paper(i, title=f"Topic{i} survey") for i in range(30)])
+    for i in range(0, 30, 2):
+        paper_db.delete_paper(f"p{i}")
+    paper_db.save_papers([make_paper(1, title="Topic1 revisited")], on_conflict="update")
+    with db_engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+    with db_engine.begin() as conn:
+        # VACUUM may renumber implicit rowids of tables without an INTEGER PRIMARY KEY; force that case
+        conn.execute(text("UPDATE papers SET rowid = rowid + 1000"))
+        conn.execute(text("UPDATE papers SET rowid = 2000 - rowid"))
+
+    for i in (1, 15, 29):
+        hits = paper_db.search_fulltext(f"topic{i}")
+        assert [h["paper_id"] for h in hits] == [f"p{i}"]
+        assert f"<mark>Topic{i}</mark>" in hits[0]["snippet"]
+    assert paper_db.search_fulltext("topic4") == []
+    assert [h["paper_id"] for h in paper_db.search_fulltext("revisited")] == ["p1"]
+
+
+def test_date_filters_match_the_facet_day_window(paper_db, make_paper):
+    from datetime import datetime
+
+    from backend.core.index_filters import PaperFacets
+
+    dates = [datetime(2024, 4, 30, 23, 59), datetime(2024, 5, 1), datetime(2024, 5, 1, 13),
+             datetime(2024, 5, 31, 23, 59, 59, 500000), datetime(2024, 6, 1)]
+    paper_db.save_papers([make_paper(i, title="Window paper", updated_date=d) for i, d in enumerate(dates)])
+    facets = PaperFacets()
+    for i, d in enumerate(dates):
+        facets.add(i, "arxiv", [], d)
+
+    for start, end in [(datetime(2024, 5, 1, 12), datetime(2024, 5, 31)), ("2024-05-01T12:00:00", "2024-05-31"),
+                       (None, "2024-05-01"), ("2024-06-01", None)]:
+        hits = {int(h["paper_id"][1:]) for h in paper_db.search_fulltext("window", start_date=start, end_date=end)}
+        assert hits == set(facets.select(start_date=start, end_date=end).tolist())
+    assert {h["paper_id"] for h in paper_db.search_fulltext("window", start_date="2024-05-01T12:00:00",
+                                                            end_date="2024-05-31")} == {"p1", "p2", "p3"}
@@ -0,0 +1,88 @@
+"""GenerationStore publish/prune and IndexBundle round trips, mmap-loaded on every index tier."""
+import os
+
+import numpy as np
+import pytest
+
+from backend.core.faiss_manager import FAISSManager
+from backend.core.index_bundle import GenerationStore, IndexBundle
+from backend.core.index_factory import build_index
+
+TIERS = [
+    ("flat", {}),
+    ("hnsw", {}),
+    ("ivfpq", {}),
+    ("flat", {"sq8": True}),
+    ("hnsw", {"sq8": True}),
+    ("flat", {"pca_dim": 8}),
+    ("ivfpq", {"pca_dim": 8}),
+]
+TIER_IDS = [index_type + "".join(f"-{k}" for k in kwargs) for index_type, kwargs in TIERS]
+
+
+def write_marker(text):
+    def write_files(gen_dir):
+        with open(os.path.join(gen_dir, "marker"), "w") as f:
+            f.write(text)
+    return write_files
+
+
+def test_generation_store_publishes_in_order_and_prunes(tmp_path):
+    store = GenerationStore(str(tmp_path / "store"), keep=2)
+    assert store.current_generation() is None
+
+    generations = [store.publish(write_marker(str(i))) for i in range(4)]
+
+    assert generations == [1, 2, 3, 4]
+    assert store.current_generation() == 4
+    with open(os.path.join(store.path(4), "marker")) as f:
+        assert f.read() == "3"
+    assert sorted(os.listdir(store.root_dir)) == ["CURRENT", "gen-000003", "gen-000004"]
+
+
+def test_generation_store_failed_write_publishes_nothing(tmp_path):
+    store = GenerationStore(str(tmp_path / "store"))
+    store.publish(write_marker("ok"))
+
+    def fail(gen_dir):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        store.publish(fail)
+    assert store.current_generation() == 1
+    assert sorted(os.listdir(store.root_dir)) == ["CURRENT", "gen-000001"]
+
+
+@pytest.mark.parametrize("index_type,kwargs", TIERS, ids=TIER_IDS)
+@pytest.mark.parametrize("mmap", [False, True])
+def test_bundle_round_trip(tmp_path, index_type, kwargs, mmap):
+    vectors = np.random.default_rng(0).standard_normal((1000, 16)).astype('float32')
+    ids = np.arange(1000, dtype='int64') * 7
+    index, spec = build_index(vectors, ids, index_type=index_type, **kwargs)
+    bundle = IndexBundle(str(tmp_path / "papers.faiss"))
+    id_map = {f"p{i}": int(fid) for i, fid in enumerate(ids)}
+    bundle.save(index, id_map, {"platform": {"arxiv": ids.tolist()}}, {"count": 1000}, index_spec=spec)
+
+    loaded, loaded_ids, facets, manifest = bundle.load(mmap=mmap)
+
+    assert bundle.matches({"count": 1000})
+    assert loaded.ntotal == 1000 and loaded_ids == id_map and manifest["index_spec"] == spec
+    assert facets["platform"]["arxiv"] == ids.tolist()
+    np.testing.assert_array_equal(loaded.search(vectors[:5], 3)[1], index.search(vectors[:5], 3)[1])
+
+
+@pytest.mark.parametrize("index_type,kwargs", TIERS, ids=TIER_IDS)
+def test_read_only_manager_loads_every_tier(tmp_path, paper_db, embedding_manager, make_paper, unit_vector,
+                                            index_type, kwargs):
+    paper_db.save_papers([make_paper(i) for i in range(300)])
+    options = dict(index_path=str(tmp_path / "papers.faiss"), index_type=index_type,
+                   embedding_manager=embedding_manager, pca_dim=kwargs.get("pca_dim"), sq8=kwargs.get("sq8", False))
+
+    # A read-only worker that finds no bundle builds one, then serves the mmap of what it wrote
+    builder = FAISSManager(read_only=True, **options)
+    reader = FAISSManager(read_only=True, **options)
+
+    for manager in (builder, reader):
+        assert manager.ntotal == 300
+        assert manager.generation == builder.bundle.current_generation()
+        assert manager.search_vectors(unit_vector("p42")[None], k=1)[0][0][0] == "p42"
@@ -0,0 +1,67 @@
+"""PaperFacets id selection and filtered FAISS search."""
+from datetime import datetime
+
+import numpy as np
+
+from backend.core.faiss_manager import FAISSManager
+from backend.core.index_filters import PaperFacets
+
+
+def build_facets():
+    facets = PaperFacets()
+    facets.add(1, "arXiv", ["cs.AI", "cs.LG"], datetime(2024, 1, 31))
+    facets.add(2, "arxiv", "cs.LG", "2024-02-10T12:00:00Z")
+    facets.add(3, "biorxiv", ["q-bio.NC"], datetime(2024, 2, 29))
+    facets.add(4, "pmc", ["cs.AI"], datetime(2024, 3, 1))
+    facets.add(5, None, [], None)
+    return facets
+
+
+def ids(array):
+    return sorted(array.tolist())
+
+
+def test_values_are_ored_and_facets_anded():
+    facets = build_facets()
+
+    assert facets.select() is None
+    assert ids(facets.select(platform="ARXIV")) == [1, 2]
+    assert ids(facets.select(platform=["arxiv", "pmc"])) == [1, 2, 4]
+    assert ids(facets.select(category=["cs.AI", "q-bio.NC"])) == [1, 3, 4]
+    assert ids(facets.select(platform="arxiv", category="cs.AI")) == [1]
+    assert ids(facets.select(platform="unknown")) == []
+
+
+def test_date_window_mixes_whole_months_and_edge_days():
+    facets = build_facets()
+
+    assert ids(facets.select(start_date="2024-01-31", end_date="2024-03-01")) == [1, 2, 3, 4]
+    assert ids(facets.select(start_date=datetime(2024, 2, 1), end_date=datetime(2024, 2, 29))) == [2, 3]
+    assert ids(facets.select(start_date="2024-02-11")) == [3, 4]
+    assert ids(facets.select(end_date="2024-02-10", platform="arxiv")) == [1, 2]
+
+
+def test_remove_and_round_trip():
+    facets = build_facets()
+    assert ids(facets.select(category="cs.LG")) == [1, 2]  # caches the id array
+
+    facets.remove([1])
+    assert ids(facets.select(category="cs.LG")) == [2]
+
+    restored = PaperFacets(facets.to_dict())
+    assert "cs.AI" in restored.to_dict()["category"] and ids(restored.select(category="cs.AI")) == [4]
+    assert ids(restored.select(start_date="2024-01-01", end_date="2024-01-31")) == []
+
+
+def test_filtered_search_returns_only_matching_papers(tmp_path, paper_db, embedding_manager, make_paper, unit_vector):
+    paper_db.save_papers([make_paper(i, platform="biorxiv" if i % 3 == 0 else "arxiv",
+                                     categories=("q-bio.NC",) if i % 2 else ("cs.AI",)) for i in range(60)])
+    manager = FAISSManager(index_path=str(tmp_path / "papers.faiss"), index_type="flat",
+                           embedding_manager=embedding_manager, pca_dim=None, sq8=False)
+    query = unit_vector("p9")[None]
+
+    hits = manager.search_vectors(query, k=10, platform="biorxiv", category="q-bio.NC")[0]
+    numbers = [int(pid[1:]) for pid, _ in hits]
+    assert numbers[0] == 9 and len(numbers) == 10
+    assert all(n % 3 == 0 and n % 2 for n in numbers)
+    assert np.all(np.diff([distance for _, distance in hits]) >= -1e-6)
@@ -0,0 +1,44 @@
+"""process_singleton sharing across the core.X / backend.core.X import paths."""
+import importlib
+import threading
+
+from backend.core import model_registry
+
+
+def test_both_import_paths_share_one_instance(monkeypatch):
+    twin = importlib.import_module("core.model_registry")
+    assert twin is not model_registry
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.delitem(model_registry._singletons, "test-singleton", raising=False)
+    first = twin.process_singleton("test-singleton", factory)
+    assert model_registry.process_singleton("test-singleton", factory) is first
+    assert len(created) == 1
+    assert twin.get_model_registry() is model_registry.get_model_registry()
+    model_registry._singletons.pop("test-singleton")
+
+
+def test_concurrent_first_use_creates_once():
+    barrier = threading.Barrier(8)
+    created = []
+    results = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    def use():
+        barrier.wait()
+        results.append(model_registry.process_singleton("test-concurrent", factory))
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    model_registry._singletons.pop("test-concurrent")
+    assert len(created) == 1 and all(result is created[0] for result in results)
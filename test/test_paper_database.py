@@ -0,0 +1,97 @@
+"""PaperDatabase bulk save semantics against a temp SQLite DB."""
+import pytest
+
+from backend.core.paper_database import add_paper_listener
+
+
+class RecordingListener:
+    def __init__(self):
+        self.saved = []
+
+    def on_papers_saved(self, papers):
+        self.saved.extend(papers)
+
+    def on_papers_deleted(self, paper_ids):
+        pass
+
+
+def test_save_papers_counts_inserts_updates_and_skips(paper_db, make_paper):
+    assert paper_db.save_papers([make_paper(i) for i in range(5)]) == {"inserted": 5, "updated": 0, "skipped": 0}
+
+    batch = [make_paper(i) for i in range(3, 8)] + [make_paper(7), {"title": "no id"}]
+    assert paper_db.save_papers(batch) == {"inserted": 3, "updated": 0, "skipped": 4}
+    assert paper_db.save_papers([make_paper(i) for i in range(6, 10)], on_conflict="update", chunk_size=3) == \
+        {"inserted": 2, "updated": 2, "skipped": 0}
+    assert paper_db.get_total_count() == 10
+
+    with pytest.raises(ValueError):
+        paper_db.save_papers([make_paper(0)], on_conflict="replace")
+
+
+def test_partial_update_keeps_stored_columns(paper_db, make_paper):
+    paper_db.save_papers([make_paper(1, platform="biorxiv", categories=("q-bio.NC",))])
+    listener = RecordingListener()
+    add_paper_listener(listener)
+
+    # Rows with different key sets in one chunk: a title-only update and a full new paper
+    counts = paper_db.save_papers([{"paper_id": "p1", "title": "Retitled", "abstract": None}, make_paper(2),
+                                   {"paper_id": "p1", "pdf_url": "https://example.org/new.pdf"}], on_conflict="update")
+
+    assert counts == {"inserted": 1, "updated": 1, "skipped": 1}
+    paper = paper_db.get_paper_by_id("p1")
+    assert paper.title == "Paper 1 on graph learning" and paper.abstract == "Abstract of paper 1."
+    assert paper.pdf_url == "https://example.org/new.pdf"
+    paper_db.save_papers([{"paper_id": "p1", "title": "Retitled", "abstract": None}], on_conflict="update")
+    paper = paper_db.get_paper_by_id("p1")
+    assert paper.title == "Retitled" and paper.abstract == "Abstract of paper 1."
+    assert paper.platform == "biorxiv" and paper.categories == ["q-bio.NC"]
+    notified = {p["paper_id"]: p for p in listener.saved}
+    assert notified["p1"]["platform"] == "biorxiv" and notified["p2"]["platform"] == "arxiv"
+
+
+def test_insert_without_platform_uses_column_default(paper_db, make_paper):
+    paper = make_paper(1)
+    del paper["platform"]
+    paper_db.save_papers([paper, make_paper(2, platform="biorxiv")])
+
+    assert paper_db.get_paper_by_id("p1").platform == "arxiv"
+    assert paper_db.get_paper_by_id("p2").platform == "biorxiv"
+
+
+def test_keyset_pages_cross_ties_and_undated_papers(paper_db, make_paper):
+    from datetime import datetime
+
+    tied = datetime(2024, 3, 1)
+    papers = [make_paper(i, updated_date=tied) for i in range(5)]
+    papers += [make_paper(i) for i in range(5, 8)] + [make_paper(i, updated_date=None) for i in range(8, 10)]
+    paper_db.save_papers(papers)
+    expected = [p.paper_id for p in paper_db.get_papers()]
+    assert expected[:5] == ["p4", "p3", "p2", "p1", "p0"] and expected[-2:] == ["p9", "p8"]
+
+    for page_of in (paper_db.get_papers_page, paper_db.get_paper_rows_page):
+        seen, cursor = [], None
+        while True:
+            page, cursor = page_of(3, cursor=cursor)
+            seen += [p.paper_id for p in page]
+            if cursor is None:
+                break
+        assert seen == expected
+
+    assert [p.paper_id for p in paper_db.get_papers_page(2, cursor=paper_db.get_papers_page(2)[1],
+                                                         platform="arxiv")[0]] == ["p2", "p1"]
+
+
+def test_category_strings_with_json_metacharacters(paper_db, make_paper):
+    from sqlalchemy import text
+
+    from backend.core import paper_database
+
+    odd = 'cs.AI, say "hi",back\\slash,line\nbreak'
+    counts = paper_db.save_papers([dict(make_paper(1), categories=odd), dict(make_paper(2), categories="cs.LG")])
+    paper_db.save_papers([dict(make_paper(2), categories='q"bio')], on_conflict="update")
+
+    assert counts["inserted"] == 2
+    with paper_database.engine.connect() as conn:
+        rows = conn.execute(text("SELECT paper_id, category FROM paper_categories ORDER BY paper_id, category")).all()
+    assert rows == [("p1", "back\\slash"), ("p1", "cs.AI"), ("p1", "line\nbreak"), ("p1", 'say "hi"'), ("p2", 'q"bio')]
+    assert [p.paper_id for p in paper_db.get_papers(categories="cs.AI")] == ["p1"]
@@ -0,0 +1,75 @@
+"""split_passages windowing, format_passages ordering and section filling for the analysis agents."""
+import asyncio
+
+from backend.core import passage_store
+from backend.core.config import Config
+from backend.core.passage_store import attach_section_passages, format_passages, split_passages
+
+
+def words(n):
+    return " ".join(f"w{i}" for i in range(n))
+
+
+def test_windows_overlap_and_cover_every_word():
+    passages = split_passages(words(24), chunk_words=10, overlap_words=3)
+
+    assert [p.split()[0] for p in passages] == ["w0", "w7", "w14"]
+    assert all(len(p.split()) == 10 for p in passages[:-1])
+    assert passages[-1].split()[-1] == "w23"
+    assert passages[0].split()[-3:] == passages[1].split()[:3]
+
+
+def test_short_text_is_one_passage_and_whitespace_is_collapsed():
+    assert split_passages("  a\n\nb\tc  ", chunk_words=10, overlap_words=3) == ["a b c"]
+    assert split_passages(words(10), chunk_words=10, overlap_words=3) == [words(10)]
+
+
+def test_empty_text_has_no_passages():
+    assert split_passages("") == [] and split_passages(None) == [] and split_passages(" \n ") == []
+
+
+def test_overlap_not_smaller_than_window_still_advances():
+    passages = split_passages(words(5), chunk_words=2, overlap_words=2)
+    assert [p.split()[0] for p in passages] == ["w0", "w1", "w2", "w3"]
+
+
+def test_format_passages_numbers_in_document_order():
+    block = format_passages([{"chunk_index": 2, "text": "later"}, {"chunk_index": 0, "text": "first"}])
+    assert block == "[1] first\n\n[3] later"
+
+
+class StubStore:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def section_passages(self, paper_id, content):
+        self.calls.append(paper_id)
+        if self.fail:
+            raise RuntimeError("embedding backend down")
+        return {"methodology": "retrieved method", "results": "retrieved results", "conclusion": ""}
+
+
+def test_attach_fills_only_missing_sections(monkeypatch):
+    store = StubStore()
+    monkeypatch.setattr(passage_store, "get_passage_store", lambda: store)
+    sections = {"methodology": "from heading", "results": ""}
+    content = "x" * Config.PASSAGE_MIN_TEXT_CHARS
+
+    asyncio.run(attach_section_passages(sections, content, "p1"))
+
+    assert sections == {"methodology": "from heading", "results": "retrieved results", "conclusion": ""}
+    assert store.calls == ["p1"]
+
+
+def test_attach_skips_short_text_and_survives_failures(monkeypatch):
+    store = StubStore(fail=True)
+    monkeypatch.setattr(passage_store, "get_passage_store", lambda: store)
+    sections = {"results": ""}
+
+    asyncio.run(attach_section_passages(sections, "short", "p1"))
+    asyncio.run(attach_section_passages(sections, "x" * Config.PASSAGE_MIN_TEXT_CHARS, None))
+    assert store.calls == []
+
+    asyncio.run(attach_section_passages(sections, "x" * Config.PASSAGE_MIN_TEXT_CHARS, "p1"))
+    assert store.calls == ["p1"] and sections == {"results": ""}
@@ -0,0 +1,67 @@
+"""QueryEmbeddingCache LRU/TTL behaviour and the search-path cache hit."""
+import numpy as np
+
+from backend.core import model_registry, query_cache
+from backend.core.faiss_manager import FAISSManager
+from backend.core.query_cache import QueryEmbeddingCache, query_model_key, warm_up
+
+MODEL = ("base", "adapter")
+
+
+def vector(value):
+    return np.full(4, value, dtype='float32')
+
+
+def test_lru_evicts_least_recently_used():
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+    cache.put_many(MODEL, {"a": vector(1), "b": vector(2)})
+    cache.get_many(MODEL, ["a"])
+    cache.put_many(MODEL, {"c": vector(3)})
+
+    assert set(cache.get_many(MODEL, ["a", "b", "c"])) == {"a", "c"}
+    assert cache.stats()["size"] == 2
+
+
+def test_entries_expire_and_keys_include_model_and_normalized_text(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: clock[0])
+    cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=5)
+    cache.put_many(MODEL, {"graph  neural nets": vector(1)})
+
+    assert list(cache.get_many(MODEL, [" graph neural nets"])) == [" graph neural nets"]
+    assert cache.get_many(("base", "other-adapter"), ["graph neural nets"]) == {}
+    clock[0] += 6
+    assert cache.get_many(MODEL, ["graph neural nets"]) == {}
+    assert cache.stats()["expired"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_frequent_queries_round_trip(tmp_path):
+    cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=60)
+    for query in ["gnn", "gnn", "llm", "gnn", "llm", "rl"]:
+        cache.get_many(MODEL, [query])
+    path = str(tmp_path / "cache" / "frequent.json")
+    cache.save_frequent(path, n=2)
+
+    restarted = QueryEmbeddingCache(max_entries=10, ttl_seconds=60)
+    assert restarted.load_frequent(path) == ["gnn", "llm"]
+    assert restarted.most_frequent(1) == ["gnn"]
+    assert restarted.load_frequent(str(tmp_path / "missing.json")) == []
+
+
+def test_repeated_search_skips_the_encoder(tmp_path, paper_db, embedding_manager, make_paper, monkeypatch):
+    cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setitem(model_registry._singletons, "query_cache", cache)
+    paper_db.save_papers([make_paper(i) for i in range(20)])
+    manager = FAISSManager(index_path=str(tmp_path / "papers.faiss"), index_type="flat",
+                           embedding_manager=embedding_manager, pca_dim=None, sq8=False)
+
+    assert warm_up(manager, ["graph learning", "graph learning", ""], cache=cache) == 1
+    calls = embedding_manager.calls
+    first = manager.embed_queries(["graph learning", "new query", "new query"])
+    second = manager.embed_queries(["new query", "graph  learning"])
+
+    assert embedding_manager.calls == calls + 1
+    assert embedding_manager.cached_calls == 0 # free-text queries never reach the persistent embedding cache
+    np.testing.assert_array_equal(first[1], second[0])
+    np.testing.assert_array_equal(first[0], second[1])
+    assert set(cache.get_many(query_model_key(embedding_manager), ["new query"])) == {"new query"}
@@ -0,0 +1,59 @@
+"""ShardedFAISSManager routing across platform shards."""
+from backend.core.paper_database import add_paper_listener
+from backend.core.sharded_index import ShardedFAISSManager
+
+
+def build_sharded(tmp_path, embedding_manager):
+    return ShardedFAISSManager(index_path=str(tmp_path / "papers.faiss"), platforms=("arxiv", "biorxiv"),
+                               parallel=False, embedding_manager=embedding_manager, pca_dim=None, sq8=False)
+
+
+def test_platform_change_moves_paper_between_shards(tmp_path, paper_db, embedding_manager, make_paper, unit_vector):
+    paper_db.save_papers([make_paper(i, platform="arxiv" if i % 2 else "biorxiv") for i in range(40)])
+    manager = build_sharded(tmp_path, embedding_manager)
+    assert manager.shards["arxiv"].contains("p1")
+
+    manager.add_papers([make_paper(1, platform="biorxiv")])
+
+    assert not manager.shards["arxiv"].contains("p1") and manager.shards["biorxiv"].contains("p1")
+    hits = [pid for pid, _ in manager.search_vectors(unit_vector("p1")[None], k=5)[0]]
+    assert hits.count("p1") == 1 and hits[0] == "p1"
+
+
+def test_metadata_only_update_keeps_the_vector(tmp_path, paper_db, embedding_manager, make_paper):
+    paper_db.save_papers([make_paper(i) for i in range(10)])
+    manager = build_sharded(tmp_path, embedding_manager)
+
+    manager.add_papers([make_paper(3, platform="biorxiv", embedding=False)])
+
+    assert manager.shards["arxiv"].contains("p3") and not manager.shard("biorxiv").contains("p3")
+
+
+def test_update_embeddings_routes_backfilled_vectors_by_platform(tmp_path, paper_db, embedding_manager, make_paper,
+                                                                 unit_vector):
+    paper_db.save_papers([make_paper(i, platform="biorxiv", embedding=False) for i in range(5)])
+    manager = build_sharded(tmp_path, embedding_manager)
+    add_paper_listener(manager)
+
+    saved = paper_db.update_embeddings({f"p{i}": unit_vector(f"p{i}") for i in range(5)} | {"missing": unit_vector("x")})
+
+    assert saved == 5
+    assert manager.shards["biorxiv"].ntotal == 5 and "arxiv" not in manager.shards
+    assert set(paper_db.get_embeddings(["p0", "p4"], 16)) == {"p0", "p4"}
+
+
+def test_empty_platforms_get_shards_lazily_and_the_pool_follows(tmp_path, paper_db, embedding_manager, make_paper,
+                                                                unit_vector):
+    paper_db.save_papers([make_paper(i, platform="arxiv") for i in range(6)] + [make_paper(6, platform="medrxiv")])
+    manager = ShardedFAISSManager(index_path=str(tmp_path / "papers.faiss"), platforms=("arxiv", "biorxiv", "pmc"),
+                                  parallel=True, embedding_manager=embedding_manager, pca_dim=None, sq8=False)
+
+    assert set(manager.shards) == {"arxiv", "medrxiv"} and "pmc" in manager.platforms
+    assert [pid for pid, _ in manager.search_vectors(unit_vector("p6")[None], k=1)[0]] == ["p6"]
+    assert manager._pool_size == 2
+
+    manager.add_papers([make_paper(7, platform="biorxiv")])
+
+    assert set(manager.shards) == {"arxiv", "biorxiv", "medrxiv"} and manager.shards["biorxiv"].contains("p7")
+    assert [pid for pid, _ in manager.search_vectors(unit_vector("p7")[None], k=1)[0]] == ["p7"]
+    assert manager._pool_size == 3